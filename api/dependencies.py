@@ -5,20 +5,31 @@ from asyncpg.pool import Pool
 
 from config import settings
 from services.job_manager import JobManager
+from services.job_store import SQLiteJobStore
 from services.websocket_manager import WebSocketManager
 from ingestion.storage.repositories.postgres_repository import PostgresRepository
 from ingestion.storage.repositories.sqlite_graph_repository import SQLiteGraphRepository
+from ingestion.storage.group_commit_writer import GroupCommitWriter
+from ingestion.embedder import EmbeddingGenerator, create_embedder
 
 # ======================= GESTION DU CYCLE DE VIE =======================
 # Ces objets seront créés une seule fois pour toute la durée de vie de l'application.
 pool: Pool | None = None
+storage_writer: GroupCommitWriter | None = None
+embedding_generator: EmbeddingGenerator | None = None
 
 
 async def get_db_pool() -> Pool:
     """Retourne le pool de connexion, le crée s'il n'existe pas."""
     global pool
     if pool is None:
-        pool = await asyncpg.create_pool(settings.DATABASE_URL, min_size=5, max_size=10)
+        # Chaque connexion enregistre les codecs pgvector et prépare les requêtes chaudes.
+        pool = await asyncpg.create_pool(
+            settings.DATABASE_URL,
+            min_size=5,
+            max_size=10,
+            init=PostgresRepository.init_connection,
+        )
     return pool
 
 
@@ -28,11 +39,53 @@ async def close_db_pool():
         await pool.close()
 
 
+async def get_storage_writer() -> GroupCommitWriter:
+    """
+    Retourne l'écrivain à commits groupés partagé par tous les pipelines,
+    le crée et le démarre s'il n'existe pas.
+    """
+    global storage_writer
+    if storage_writer is None:
+        db_pool = await get_db_pool()
+        await sqlite_repo_singleton.initialize()
+        storage_writer = GroupCommitWriter(
+            sqlite_repo_singleton,
+            PostgresRepository(db_pool),
+            max_batch_size=settings.STORAGE_GROUP_COMMIT_MAX_BATCH,
+            max_delay=settings.STORAGE_GROUP_COMMIT_MAX_DELAY_MS / 1000,
+        )
+    storage_writer.start()
+    return storage_writer
+
+
+async def close_storage_writer():
+    """Vide les écritures en attente et arrête l'écrivain à commits groupés."""
+    if storage_writer:
+        await storage_writer.close()
+
+
+def sqlite_pragmas() -> dict:
+    """PRAGMA du graphe SQLite issus de la configuration."""
+    return {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KB,
+        "mmap_size": settings.SQLITE_MMAP_SIZE_BYTES,
+        "temp_store": "MEMORY",
+    }
+
+
 # ======================= SINGLETONS =======================
 # Ces managers sont des singletons pour partager leur état à travers l'application.
 job_manager_singleton = JobManager()
+job_store_singleton = (
+    SQLiteJobStore(settings.JOB_STORE_PATH) if settings.JOB_STORE_ENABLED else None
+)
 websocket_manager_singleton = WebSocketManager()
-sqlite_repo_singleton = SQLiteGraphRepository()
+sqlite_repo_singleton = SQLiteGraphRepository(
+    pragmas=sqlite_pragmas(), read_pool_size=settings.SQLITE_READ_POOL_SIZE
+)
 
 # ======================= PROVIDERS DE DÉPENDANCES =======================
 # FastAPI appellera ces fonctions pour chaque requête qui en a besoin.
@@ -41,7 +94,17 @@ sqlite_repo_singleton = SQLiteGraphRepository()
 async def get_postgres_repo() -> AsyncGenerator[PostgresRepository, None]:
     """Provider pour le repository PostgreSQL."""
     db_pool = await get_db_pool()
-    yield PostgresRepository(db_pool)
+    yield PostgresRepository(
+        db_pool,
+        search_mode=settings.VECTOR_SEARCH_MODE,
+        rescore_factor=settings.VECTOR_RESCORE_FACTOR,
+        index_method=settings.VECTOR_INDEX_METHOD,
+        ef_search=settings.VECTOR_HNSW_EF_SEARCH,
+        ivfflat_probes=settings.VECTOR_IVFFLAT_PROBES,
+        fusion=settings.HYBRID_FUSION,
+        text_match_count=settings.HYBRID_TEXT_MATCH_COUNT,
+        iterative_scan=settings.VECTOR_ITERATIVE_SCAN,
+    )
 
 
 def get_sqlite_repo() -> SQLiteGraphRepository:
@@ -49,11 +112,24 @@ def get_sqlite_repo() -> SQLiteGraphRepository:
     return sqlite_repo_singleton
 
 
+def get_embedding_generator() -> EmbeddingGenerator:
+    """Provider du générateur d'embeddings de requêtes (cache partagé entre requêtes)."""
+    global embedding_generator
+    if embedding_generator is None:
+        embedding_generator = create_embedder()
+    return embedding_generator
+
+
 def get_job_manager() -> JobManager:
     """Provider pour le JobManager."""
     return job_manager_singleton
 
 
+def get_job_store() -> SQLiteJobStore | None:
+    """Provider du stockage des jobs (None si la reprise des jobs est désactivée)."""
+    return job_store_singleton
+
+
 def get_websocket_manager() -> WebSocketManager:
     """Provider pour le WebSocketManager."""
     return websocket_manager_singleton
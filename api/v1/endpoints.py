@@ -1,12 +1,17 @@
 # analyzer-engine/api/v1/endpoints.py
+import asyncio
 import os
 import logging
+import shutil
 import tempfile
-from typing import List
+from typing import List, Optional
 from fastapi import (
     APIRouter,
+    HTTPException,
+    Query,
     UploadFile,
     File,
+    Form,
     BackgroundTasks,
     WebSocket,
     WebSocketDisconnect,
@@ -14,9 +19,19 @@ from fastapi import (
     Depends,
     status,
 )
+from fastapi.responses import StreamingResponse
 
-from api.v1.models import HealthStatus, IngestionResponse
+from api.v1.models import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    HealthStatus,
+    IngestionResponse,
+)
+from core.models.db import DocumentPage
+from core.models.graph_models import EntityStats, GraphSearchPage, GraphTraversal
+from config import settings
 from services.job_manager import JobManager
+from services.job_store import SQLiteJobStore
 from services.websocket_manager import WebSocketManager
 from services.ingestion_service import IngestionService
 from ingestion.storage.repositories.postgres_repository import PostgresRepository
@@ -25,7 +40,15 @@ from api.dependencies import (
     get_postgres_repo,
     get_sqlite_repo,
     get_job_manager,
+    get_job_store,
     get_websocket_manager,
+    get_embedding_generator,
+)
+from ingestion.embedder import EmbeddingGenerator
+from ingestion.storage.corpus_export import (
+    MEDIA_TYPES,
+    export_stream,
+    validate_export,
 )
 
 logger = logging.getLogger(__name__)
@@ -38,6 +61,9 @@ ALLOWED_ORIGINS = {
     "http://127.0.0.1:5173",
 }
 
+# Jobs relancés au démarrage (référence conservée jusqu'à la fin de leur tâche).
+_resumed_jobs: set = set()
+
 
 # Cette fonction, supprimée par le linter, est le cœur de l'exécution asynchrone.
 async def run_ingestion_background(
@@ -45,8 +71,13 @@ async def run_ingestion_background(
     file_paths: List[str],
     job_manager: JobManager,
     websocket_manager: WebSocketManager,
+    source_root: str | None = None,
+    job_store: SQLiteJobStore | None = None,
 ):
-    """Wrapper pour lancer le service d'ingestion en arrière-plan."""
+    """
+    Wrapper pour lancer le service d'ingestion en arrière-plan. Une fois le job terminé,
+    le répertoire des fichiers uploadés (`source_root`) est supprimé.
+    """
 
     async def status_callback(message: dict):
         """Callback pour mettre à jour et diffuser le statut du job via WebSocket."""
@@ -59,8 +90,73 @@ async def run_ingestion_background(
         # Diffuse le message à tous les clients connectés pour ce job.
         await websocket_manager.broadcast_to_job(job_id, message)
 
-    ingestion_service = IngestionService(status_callback)
-    await ingestion_service.run_ingestion_for_job(job_id, file_paths)
+    ingestion_service = IngestionService(status_callback, job_store=job_store)
+    await ingestion_service.run_ingestion_for_job(job_id, file_paths, source_root)
+    if source_root:
+        shutil.rmtree(source_root, ignore_errors=True)
+
+
+async def resume_interrupted_jobs(
+    job_manager: JobManager,
+    websocket_manager: WebSocketManager,
+    job_store: SQLiteJobStore,
+) -> int:
+    """
+    Relance en arrière-plan les jobs interrompus par un arrêt du service ; chacun reprend
+    à partir de ses points de contrôle. Retourne le nombre de jobs relancés.
+    """
+    jobs = await job_store.interrupted_jobs()
+    for job in jobs:
+        job_manager.restore_job(
+            job["job_id"], [os.path.basename(path) for path in job["documents"]]
+        )
+        task = asyncio.create_task(
+            run_ingestion_background(
+                job["job_id"],
+                job["paths"],
+                job_manager,
+                websocket_manager,
+                job["source_root"],
+                job_store,
+            ),
+            name=f"resume-job-{job['job_id']}",
+        )
+        _resumed_jobs.add(task)
+        task.add_done_callback(_resumed_jobs.discard)
+        logger.info(f"[{job['job_id']}] Interrupted job resumed in the background.")
+    return len(jobs)
+
+
+def _relative_parts(name: Optional[str]) -> List[str]:
+    """Composants d'un chemin relatif fourni par le client ; refuse toute remontée (`..`)."""
+    parts = [
+        p for p in (name or "").replace("\\", "/").split("/") if p not in ("", ".")
+    ]
+    if not parts or ".." in parts:
+        raise ValueError(f"Invalid path: {name!r}")
+    return parts
+
+
+def document_names(project: Optional[str], filenames: List[Optional[str]]) -> List[str]:
+    """
+    Identifiants stables des documents d'un upload : `<project>/<chemin relatif>`.
+    Sans projet, le préfixe est `settings.INGEST_DEFAULT_PROJECT`.
+
+    Raises:
+        ValueError: chemin vide ou remontant, ou deux fichiers avec le même identifiant.
+    """
+    prefix = _relative_parts(
+        settings.INGEST_DEFAULT_PROJECT if project is None else project
+    )
+    names = ["/".join(prefix + _relative_parts(filename)) for filename in filenames]
+    seen, duplicates = set(), set()
+    for name in names:
+        (duplicates if name in seen else seen).add(name)
+    if duplicates:
+        raise ValueError(
+            f"Duplicate file paths in upload: {', '.join(sorted(duplicates))}"
+        )
+    return names
 
 
 # Cet endpoint complet, supprimé par le linter, est le point d'entrée de toute l'opération.
@@ -71,27 +167,54 @@ async def ingest_files(
     request: Request,
     background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
+    project: Optional[str] = Form(None),
     job_manager: JobManager = Depends(get_job_manager),
     websocket_manager: WebSocketManager = Depends(get_websocket_manager),
+    job_store: SQLiteJobStore | None = Depends(get_job_store),
 ):
-    """Endpoint pour démarrer un job d'ingestion avec un ou plusieurs fichiers."""
-    temp_dir = tempfile.mkdtemp()
+    """
+    Endpoint pour démarrer un job d'ingestion avec un ou plusieurs fichiers.
+
+    Chaque document est identifié par `<project>/<chemin de l'upload>` (le nom de fichier
+    envoyé par le client, répertoires compris) : deux `utils.py` de paquets différents
+    restent distincts, et un même fichier ré-uploadé est reconnu (idempotence). Le champ
+    `project` est facultatif (défaut : `settings.INGEST_DEFAULT_PROJECT`).
+    """
+    try:
+        file_names = document_names(project, [file.filename for file in files])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Répertoire durable (et non /tmp) : un job interrompu doit retrouver ses fichiers.
+    os.makedirs(settings.JOB_UPLOAD_DIR, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=settings.JOB_UPLOAD_DIR)
     file_paths = []
-    file_names = []
-    for file in files:
-        # Utilisation de os.path.basename pour la sécurité, évite les path traversal.
-        filename = os.path.basename(file.filename)
-        file_path = os.path.join(temp_dir, filename)
+    for file, name in zip(files, file_names):
+        # Le document est le chemin relatif à temp_dir : <project>/<chemin>.
+        file_path = os.path.join(temp_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, "wb") as buffer:
             buffer.write(await file.read())
         file_paths.append(file_path)
-        file_names.append(filename)
 
     job = job_manager.create_job(files=file_names)
+    if job_store is not None:
+        # Persisté avant la réponse : le job survit à un arrêt avant même son lancement.
+        await job_store.start_job(
+            job.job_id,
+            [(path, os.path.relpath(path, temp_dir)) for path in file_paths],
+            temp_dir,
+        )
 
     # La tâche est ajoutée à l'arrière-plan, permettant une réponse immédiate.
     background_tasks.add_task(
-        run_ingestion_background, job.job_id, file_paths, job_manager, websocket_manager
+        run_ingestion_background,
+        job.job_id,
+        file_paths,
+        job_manager,
+        websocket_manager,
+        temp_dir,
+        job_store,
     )
 
     # Génère l'URL WebSocket correcte que le client doit utiliser.
@@ -119,8 +242,10 @@ async def get_health_status(
 
     try:
         async with postgres_repo._get_connection() as conn:
-            doc_count = await conn.fetchval("SELECT COUNT(*) FROM documents")
-            chk_count = await conn.fetchval("SELECT COUNT(*) FROM chunks")
+            # chunk_count est maintenu par document : pas de parcours de la table chunks.
+            doc_count, chk_count = await conn.fetchrow(
+                "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM documents"
+            )
         pg_status = "OK"
     except Exception as e:
         logger.error(f"Health check failed for PostgreSQL: {e}")
@@ -141,6 +266,121 @@ async def get_health_status(
     )
 
 
+@router.get("/documents", response_model=DocumentPage)
+async def list_documents(
+    limit: int = Query(default=20, ge=1, le=200),
+    cursor: Optional[str] = None,
+    postgres_repo: PostgresRepository = Depends(get_postgres_repo),
+):
+    """Liste les documents par pages ; passer `next_cursor` pour obtenir la page suivante."""
+    try:
+        return await postgres_repo.list_documents_page(limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/graph/relationships", response_model=GraphSearchPage)
+async def search_graph_relationships(
+    name: str = Query(min_length=1),
+    match: str = Query(default="substring"),
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    sqlite_repo: SQLiteGraphRepository = Depends(get_sqlite_repo),
+):
+    """Relations directes des entités dont le nom correspond (exact, prefix ou substring)."""
+    try:
+        return await sqlite_repo.search_entity_relationships(name, match, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/graph/traverse", response_model=GraphTraversal)
+async def traverse_graph(
+    name: str = Query(min_length=1),
+    direction: str = Query(default="outgoing"),
+    rel_types: Optional[List[str]] = Query(default=None),
+    max_depth: int = Query(default=3, ge=1, le=10),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    mode: str = Query(default="frontier"),
+    file_path: Optional[str] = None,
+    sqlite_repo: SQLiteGraphRepository = Depends(get_sqlite_repo),
+):
+    """Parcours multi-sauts du graphe de code depuis une entité (frontière ou chemins)."""
+    try:
+        return await sqlite_repo.traverse(
+            name, direction, rel_types, max_depth, limit, mode, file_path
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/graph/stats", response_model=List[EntityStats])
+async def get_graph_stats(
+    order_by: str = Query(default="pagerank"),
+    limit: int = Query(default=50, ge=1, le=1000),
+    sqlite_repo: SQLiteGraphRepository = Depends(get_sqlite_repo),
+):
+    """Entités les plus centrales du graphe, d'après les métriques persistées."""
+    try:
+        return await sqlite_repo.get_entity_stats(order_by, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/graph/stats/refresh")
+async def refresh_graph_stats(
+    sqlite_repo: SQLiteGraphRepository = Depends(get_sqlite_repo),
+):
+    """Rafraîchit l'instantané CSR du graphe et recalcule degrés et PageRank."""
+    return await sqlite_repo.compute_entity_stats()
+
+
+@router.get("/export/{table}")
+async def export_corpus(
+    table: str,
+    format: str = Query(default="ndjson"),
+    batch_size: int = Query(default=1000, ge=1, le=10000),
+    postgres_repo: PostgresRepository = Depends(get_postgres_repo),
+):
+    """
+    Exporte `documents` ou `chunks` en flux (NDJSON ou Arrow IPC), en transfert
+    chunked : les lots sont lus par curseur serveur et envoyés au fil de l'eau.
+    """
+    try:
+        validate_export(table, format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return StreamingResponse(
+        export_stream(postgres_repo.stream_rows(table, batch_size), format),
+        media_type=MEDIA_TYPES[format],
+    )
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def batch_vector_search(
+    request: BatchSearchRequest,
+    postgres_repo: PostgresRepository = Depends(get_postgres_repo),
+    embedder: EmbeddingGenerator = Depends(get_embedding_generator),
+):
+    """
+    Recherche vectorielle pour plusieurs requêtes : embeddings générés par lots
+    (avec cache) puis une seule requête SQL pour toutes les recherches.
+    """
+    embeddings = await embedder.embed_queries(request.queries)
+    try:
+        results = await postgres_repo.vector_search_many(
+            embeddings,
+            limit=request.limit,
+            search_mode=request.search_mode,
+            ef_search=request.ef_search,
+            probes=request.probes,
+            filters=request.filters,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return BatchSearchResponse(results=results)
+
+
 @router.websocket("/ws/jobs/{job_id}/status", name="websocket_endpoint")
 async def websocket_endpoint(
     websocket: WebSocket,
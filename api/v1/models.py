@@ -1,5 +1,9 @@
 # FICHIER MODIFIÉ: api/v1/models.py
-from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from core.models.db import ChunkResult, SearchFilters
 
 
 class HealthStatus(BaseModel):
@@ -17,3 +21,20 @@ class IngestionResponse(BaseModel):
     job_id: str
     message: str
     websocket_url: str
+
+
+class BatchSearchRequest(BaseModel):
+    """Requête de recherche vectorielle groupée : plusieurs textes, un aller-retour base."""
+
+    queries: List[str] = Field(min_length=1, max_length=200)
+    limit: int = Field(default=10, ge=1, le=100)
+    search_mode: Optional[str] = None
+    ef_search: Optional[int] = Field(default=None, ge=1)
+    probes: Optional[int] = Field(default=None, ge=1)
+    filters: Optional[SearchFilters] = None
+
+
+class BatchSearchResponse(BaseModel):
+    """Résultats par requête, dans l'ordre de `queries`."""
+
+    results: List[List[ChunkResult]]
@@ -0,0 +1,71 @@
+# FICHIER: analyzer-engine/benchmarks/bench_graph_backends.py
+"""
+Benchmark des implémentations de ICodeRepository : SQLite ":memory:" contre
+`InMemoryCodeRepository`, sur l'ingestion par lots, la recherche et le parcours.
+
+Usage :
+    python -m benchmarks.bench_graph_backends --entities 100000 --per-file 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_sqlite_graph_writes import make_files
+from ingestion.storage.repositories.memory_graph_repository import (
+    InMemoryCodeRepository,
+)
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+async def run(repo, files, batch_size: int, queries: int):
+    await repo.initialize()
+    timings = {}
+    try:
+        start = time.perf_counter()
+        for i in range(0, len(files), batch_size):
+            await repo.add_code_structures_batch(files[i : i + batch_size])
+        timings["ingest"] = time.perf_counter() - start
+
+        names = [files[i % len(files)]["entities"][0]["name"] for i in range(queries)]
+        start = time.perf_counter()
+        for name in names:
+            await repo.search_entity_relationships(name, "exact")
+        timings["search"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            await repo.traverse(name, max_depth=5)
+        timings["traverse"] = time.perf_counter() - start
+    finally:
+        await repo.close()
+    return timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--per-file", type=int, default=100)
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="Fichiers par appel."
+    )
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    files = make_files(args.entities, args.per_file)
+    for label, repo in (
+        ("sqlite :memory:", SQLiteGraphRepository(db_path=":memory:")),
+        ("in-memory", InMemoryCodeRepository()),
+    ):
+        timings = await run(repo, files, args.batch_size, args.queries)
+        print(
+            f"{label:<16} ingest {args.entities / timings['ingest']:>10.0f} entities/s"
+            f"   search {args.queries / timings['search']:>8.0f} q/s"
+            f"   traverse {args.queries / timings['traverse']:>8.0f} q/s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+# FICHIER: analyzer-engine/benchmarks/bench_sqlite_graph_traversal.py
+"""
+Benchmark du parcours multi-sauts du graphe de code SQLite.
+
+Construit un graphe synthétique (par défaut 200 000 entités, 1 000 000 d'arêtes CALLS
+aléatoires) puis compare, pour plusieurs profondeurs :
+- le parcours côté appelant : un aller-retour par entité visitée (requête à un saut) ;
+- `traverse` : un seul CTE récursif (modes frontier et paths).
+
+Usage :
+    python -m benchmarks.bench_sqlite_graph_traversal --entities 200000 --edges 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+async def build_graph(repo, n_entities: int, n_edges: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    await repo.conn.executemany(
+        "INSERT INTO entities (id, name, type, file_path) VALUES (?, ?, 'FUNCTION', ?)",
+        (
+            (i, f"function_{i}", f"bench/module_{i // 100}.py")
+            for i in range(1, n_entities + 1)
+        ),
+    )
+    sources = rng.integers(1, n_entities + 1, n_edges)
+    targets = rng.integers(1, n_entities + 1, n_edges)
+    await repo.conn.executemany(
+        "INSERT OR IGNORE INTO relationships (source_id, target_id, type) VALUES (?, ?, 'CALLS')",
+        zip(sources.tolist(), targets.tolist()),
+    )
+    await repo.conn.commit()
+
+
+async def hop_by_hop(repo, entity_name: str, max_depth: int, limit: int) -> int:
+    """Parcours côté appelant : une requête « appelants directs » par entité de la frontière."""
+    async with repo.conn.execute(
+        "SELECT id FROM entities WHERE name = ?", (entity_name,)
+    ) as cursor:
+        frontier = [row[0] for row in await cursor.fetchall()]
+    visited = set(frontier)
+    for _ in range(max_depth):
+        next_frontier = []
+        for entity_id in frontier:
+            async with repo.conn.execute(
+                "SELECT source_id FROM relationships WHERE target_id = ?", (entity_id,)
+            ) as cursor:
+                for (source_id,) in await cursor.fetchall():
+                    if source_id not in visited:
+                        visited.add(source_id)
+                        next_frontier.append(source_id)
+        frontier = next_frontier
+        if len(visited) > limit:
+            break
+    return len(visited) - 1
+
+
+async def timed(label: str, run):
+    start = time.perf_counter()
+    count = await run()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {count:>8} results in {elapsed * 1000:9.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10_000)
+    parser.add_argument("--max-depth", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = SQLiteGraphRepository(os.path.join(tmp, "graph.sqlite"))
+        await repo.initialize()
+        try:
+            start = time.perf_counter()
+            await build_graph(repo, args.entities, args.edges)
+            print(
+                f"Graph: {args.entities} entities, {args.edges} edges "
+                f"built in {time.perf_counter() - start:.1f}s"
+            )
+            name = f"function_{args.entities // 2}"
+            for depth in range(1, args.max_depth + 1):
+                print(f"Callers of {name}, depth {depth} (limit {args.limit}):")
+                await timed(
+                    "hop by hop (1 query/node)",
+                    lambda: hop_by_hop(repo, name, depth, args.limit),
+                )
+                await timed(
+                    "traverse frontier",
+                    lambda: _count_nodes(repo, name, depth, args.limit, "frontier"),
+                )
+                await timed(
+                    "traverse paths",
+                    lambda: _count_nodes(repo, name, depth, args.limit, "paths"),
+                )
+        finally:
+            await repo.close()
+
+
+async def _count_nodes(repo, name, depth, limit, mode) -> int:
+    result = await repo.traverse(
+        name, direction="incoming", max_depth=depth, limit=limit, mode=mode
+    )
+    return len(result.paths) if mode == "paths" else len(result.nodes) - 1
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+# FICHIER: analyzer-engine/benchmarks/bench_sqlite_graph_writes.py
+"""
+Benchmark du débit d'insertion dans le graphe de code SQLite.
+
+Compare l'ancien chemin (un `execute` par entité et par relation, relecture des IDs,
+journal rollback par défaut) au chemin actuel (`add_code_structures_batch` : INSERT
+multi-lignes avec RETURNING, `executemany` des relations, WAL et PRAGMA configurés).
+
+Usage :
+    python -m benchmarks.bench_sqlite_graph_writes --entities 100000 --per-file 100
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import aiosqlite
+
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+def make_files(n_entities: int, per_file: int):
+    files = []
+    for f in range(0, n_entities, per_file):
+        names = [f"function_{f}_{i}" for i in range(min(per_file, n_entities - f))]
+        files.append(
+            {
+                "file_path": f"bench/module_{f // per_file}.py",
+                "entities": [
+                    {
+                        "name": name,
+                        "type": "FUNCTION",
+                        "source_code": f"def {name}(): pass",
+                    }
+                    for name in names
+                ],
+                "relationships": [
+                    {"source": a, "target": b, "type": "CALLS"}
+                    for a, b in zip(names, names[1:])
+                ],
+            }
+        )
+    return files
+
+
+async def legacy_insert(db_path: str, files, batch_size: int):
+    """Reproduit l'ancien chemin : une requête par ligne, sans PRAGMA de performance."""
+    repo = SQLiteGraphRepository(db_path, pragmas={})
+    await repo.initialize()
+    conn = repo.conn
+    try:
+        for i in range(0, len(files), batch_size):
+            for file_data in files[i : i + batch_size]:
+                file_path = file_data["file_path"]
+                for entity in file_data["entities"]:
+                    await conn.execute(
+                        "INSERT OR IGNORE INTO entities (name, type, file_path, source_code) VALUES (?, ?, ?, ?)",
+                        (
+                            entity["name"],
+                            entity["type"],
+                            file_path,
+                            entity["source_code"],
+                        ),
+                    )
+                async with conn.execute(
+                    "SELECT id, name FROM entities WHERE file_path = ?", (file_path,)
+                ) as cursor:
+                    ids = {row["name"]: row["id"] for row in await cursor.fetchall()}
+                for rel in file_data["relationships"]:
+                    await conn.execute(
+                        "INSERT OR IGNORE INTO relationships (source_id, target_id, type) VALUES (?, ?, ?)",
+                        (ids[rel["source"]], ids[rel["target"]], rel["type"]),
+                    )
+            await conn.commit()
+    finally:
+        await repo.close()
+
+
+async def bulk_insert(db_path: str, files, batch_size: int):
+    repo = SQLiteGraphRepository(db_path)
+    await repo.initialize()
+    try:
+        for i in range(0, len(files), batch_size):
+            results = await repo.add_code_structures_batch(files[i : i + batch_size])
+            failed = [r for r in results if "error" in r]
+            if failed:
+                raise RuntimeError(f"{len(failed)} files failed: {failed[0]['error']}")
+    finally:
+        await repo.close()
+
+
+async def count_entities(db_path: str) -> int:
+    async with aiosqlite.connect(db_path) as conn:
+        async with conn.execute("SELECT COUNT(*) FROM entities") as cursor:
+            return (await cursor.fetchone())[0]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--per-file", type=int, default=100)
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="Fichiers par transaction."
+    )
+    args = parser.parse_args()
+
+    files = make_files(args.entities, args.per_file)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (
+            ("execute per row (rollback)", legacy_insert),
+            ("RETURNING + executemany (WAL)", bulk_insert),
+        ):
+            db_path = os.path.join(tmp, f"{run.__name__}.sqlite")
+            start = time.perf_counter()
+            await run(db_path, files, args.batch_size)
+            elapsed = time.perf_counter() - start
+            rows = await count_entities(db_path)
+            print(
+                f"{name:<32} {rows:>9} entities in {elapsed:8.2f}s "
+                f"-> {rows / elapsed:>10.0f} entities/s"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,10 +3,35 @@ import asyncio
 import logging
 import argparse
 import os
+import uuid
+from typing import List, Optional
 
 # NOUVEAUX IMPORTS STRATÉGIQUES
 from plugins.loader import load_plugins
 from ingestion.orchestration.pipeline_director import PipelineDirector
+from ingestion.storage.repositories.postgres_repository import PostgresRepository
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    DB_FILE,
+    SQLiteGraphRepository,
+)
+from ingestion.storage.repositories.memory_graph_repository import (
+    InMemoryCodeRepository,
+)
+from ingestion.storage.vector_index import COMPACT_INDEXES, INDEX_METHODS
+from ingestion.storage.corpus_export import (
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    export_stream,
+    validate_export,
+)
+from api.dependencies import (
+    close_db_pool,
+    close_storage_writer,
+    get_db_pool,
+    sqlite_repo_singleton,
+)
+from config import settings
+from core.telemetry import configure_telemetry
 
 # Configuration du logging
 logging.basicConfig(
@@ -15,11 +40,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_ingestion(file_path: str):
+async def run_ingestion(
+    file_path: str, in_memory: bool = False, flush_db: Optional[str] = None
+):
     """
     Fonction principale pour lancer le pipeline d'ingestion sur un fichier spécifique.
+
+    Avec `in_memory`, le graphe de code est construit en mémoire (analyse éphémère) et,
+    si `flush_db` est fourni, persisté à la fin dans cette base SQLite, qui doit être vide.
     """
-    director = PipelineDirector()
+    code_repo = InMemoryCodeRepository() if in_memory else None
+    director = PipelineDirector(code_repo=code_repo)
 
     if not os.path.exists(file_path):
         logger.error(f"Fichier cible introuvable : {file_path}")
@@ -37,11 +68,97 @@ async def run_ingestion(file_path: str):
             f"Langage inconnu pour le fichier {file_path}, tentative avec 'python'"
         )
 
-    await director.process(
-        file_path=file_path, source_code=source_code, language=language
-    )
+    try:
+        await director.process(
+            file_path=file_path,
+            source_code=source_code,
+            language=language,
+            job_id=f"cli-{uuid.uuid4()}",
+        )
+        logger.info(f"Ingestion terminée pour le fichier {file_path}.")
+
+        if code_repo is not None and flush_db:
+            target = SQLiteGraphRepository(db_path=flush_db, read_pool_size=0)
+            await target.initialize()
+            try:
+                result = await code_repo.flush_to(target)
+            finally:
+                await target.close()
+            logger.info(
+                f"Graphe en mémoire persisté dans {flush_db} : "
+                f"{result['entities']} entités, {result['relationships']} relations."
+            )
+    finally:
+        # L'écrivain doit être vidé avant la fermeture des bases qu'il alimente.
+        await close_storage_writer()
+        await sqlite_repo_singleton.close()
+        await close_db_pool()
+
 
-    logger.info(f"Ingestion terminée pour le fichier {file_path}.")
+async def run_reindex(method: str, compact: Optional[List[str]] = None):
+    """
+    Reconstruit l'index ANN des chunks avec des paramètres dimensionnés sur le corpus.
+    Si `compact` est fourni, aligne aussi les index compacts sur cette liste (vide = aucun).
+    """
+    pool = await get_db_pool()
+    try:
+        repo = PostgresRepository(pool, index_method=method)
+        result = await repo.rebuild_vector_index()
+        logger.info(
+            f"Index vectoriel reconstruit : {result['method']} {result['options']} "
+            f"sur {result['rows']} chunks."
+        )
+        if compact is not None:
+            present = await repo.set_compact_indexes(compact)
+            logger.info(f"Index compacts présents : {present or 'aucun'}.")
+    finally:
+        await close_db_pool()
+
+
+async def run_export(table: str, fmt: str, output: str, batch_size: int):
+    """Exporte une table du corpus vers un fichier, lot par lot (mémoire bornée)."""
+    validate_export(table, fmt)
+    pool = await get_db_pool()
+    try:
+        repo = PostgresRepository(pool)
+        written = 0
+        with open(output, "wb") as f:
+            async for data in export_stream(repo.stream_rows(table, batch_size), fmt):
+                f.write(data)
+                written += len(data)
+        logger.info(
+            f"Export '{table}' ({fmt}) terminé : {written} octets dans {output}."
+        )
+    finally:
+        await close_db_pool()
+
+
+async def run_graph_export(db_path: str, output: str):
+    """Écrit le graphe de code dans une archive binaire compacte."""
+    repo = SQLiteGraphRepository(db_path=db_path, read_pool_size=0)
+    await repo.initialize()
+    try:
+        result = await repo.export_archive(output)
+        logger.info(
+            f"Graphe exporté : {result['entities']} entités, "
+            f"{result['relationships']} relations, {result['bytes']} octets dans {output}."
+        )
+    finally:
+        await repo.close()
+
+
+async def run_graph_import(db_path: str, source: str, replace: bool):
+    """Charge une archive de graphe (démarrage à chaud sans ré-ingestion)."""
+    repo = SQLiteGraphRepository(db_path=db_path, read_pool_size=0)
+    await repo.initialize()
+    try:
+        result = await repo.import_archive(source, replace=replace)
+        logger.info(
+            f"Graphe importé depuis {source} : {result['entities']} entités, "
+            f"{result['relationships']} relations."
+        )
+    finally:
+        await repo.close()
 
 
 async def main():
@@ -53,6 +170,10 @@ async def main():
     logger.info("=" * 50)
     logger.info("Phase de démarrage : Chargement des plugins externes...")
     load_plugins()
+    configure_telemetry(
+        tracing=settings.TELEMETRY_TRACING_ENABLED,
+        metrics_enabled=settings.TELEMETRY_METRICS_ENABLED,
+    )
     logger.info("Chargement des plugins terminé. L'application est prête.")
     logger.info("=" * 50)
     # =====================================================================
@@ -69,11 +190,89 @@ async def main():
     ingest_parser.add_argument(
         "file", type=str, help="Le chemin vers le fichier à analyser."
     )
+    ingest_parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="Construire le graphe de code en mémoire (analyse éphémère, sans SQLite).",
+    )
+    ingest_parser.add_argument(
+        "--flush-db",
+        type=str,
+        default=None,
+        help="Avec --in-memory : base SQLite où persister le graphe en fin d'analyse.",
+    )
+
+    # Création de la sous-commande 'reindex'
+    reindex_parser = subparsers.add_parser(
+        "reindex", help="Reconstruire l'index vectoriel selon la taille du corpus."
+    )
+    reindex_parser.add_argument(
+        "--method",
+        choices=INDEX_METHODS,
+        default=settings.VECTOR_INDEX_METHOD,
+        help="Méthode d'index ANN (défaut : VECTOR_INDEX_METHOD).",
+    )
+    reindex_parser.add_argument(
+        "--compact",
+        nargs="*",
+        choices=tuple(COMPACT_INDEXES),
+        default=None,
+        help=(
+            "Index compacts à maintenir pour VECTOR_SEARCH_MODE=halfvec|binary ; "
+            "les autres sont supprimés (sans valeur : tous). Omis : inchangés."
+        ),
+    )
+
+    # Création de la sous-commande 'export'
+    export_parser = subparsers.add_parser(
+        "export", help="Exporter les documents ou les chunks en flux (NDJSON ou Arrow)."
+    )
+    export_parser.add_argument("--table", choices=EXPORT_TABLES, default="chunks")
+    export_parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    export_parser.add_argument(
+        "--output", type=str, required=True, help="Fichier de destination."
+    )
+    export_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Nombre de lignes lues par aller-retour du curseur serveur.",
+    )
+
+    # Sous-commandes 'graph-export' / 'graph-import'
+    graph_export_parser = subparsers.add_parser(
+        "graph-export", help="Exporter le graphe de code dans une archive binaire."
+    )
+    graph_export_parser.add_argument(
+        "--output", type=str, required=True, help="Fichier d'archive à écrire."
+    )
+    graph_export_parser.add_argument("--db", type=str, default=DB_FILE)
+
+    graph_import_parser = subparsers.add_parser(
+        "graph-import", help="Charger une archive de graphe dans la base SQLite."
+    )
+    graph_import_parser.add_argument(
+        "--input", type=str, required=True, help="Fichier d'archive à charger."
+    )
+    graph_import_parser.add_argument("--db", type=str, default=DB_FILE)
+    graph_import_parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Écraser le graphe existant si la base n'est pas vide.",
+    )
 
     args = parser.parse_args()
 
     if args.command == "ingest":
-        await run_ingestion(args.file)
+        await run_ingestion(args.file, args.in_memory, args.flush_db)
+    elif args.command == "reindex":
+        await run_reindex(args.method, args.compact)
+    elif args.command == "export":
+        await run_export(args.table, args.format, args.output, args.batch_size)
+    elif args.command == "graph-export":
+        await run_graph_export(args.db, args.output)
+    elif args.command == "graph-import":
+        await run_graph_import(args.db, args.input, args.replace)
 
 
 if __name__ == "__main__":
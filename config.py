@@ -1,4 +1,6 @@
 # FICHIER MODIFIÉ: analyzer-engine/config.py
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -30,6 +32,16 @@ class Settings(BaseSettings):
 
     # 5. Configuration de l'Ingestion
     INGESTION_LLM_CHOICE: str = "gemini-1.5-flash"
+    # Fichiers d'un job traités simultanément ; en mode adaptatif, la limite évolue
+    # (AIMD selon les échecs et la latence) entre 1 et INGESTION_MAX_CONCURRENCY.
+    INGESTION_CONCURRENCY: int = 8
+    INGESTION_ADAPTIVE_CONCURRENCY: bool = False
+    INGESTION_MAX_CONCURRENCY: int = 32
+    # Pipeline en flux : chaque étape a ses workers (par nom de classe, défaut 1), reliés
+    # par des files bornées ; remplace le traitement fichier par fichier des jobs.
+    INGESTION_STREAMING_PIPELINE: bool = False
+    INGESTION_STAGE_WORKERS: Dict[str, int] = {"ChunkingEmbeddingStage": 4}
+    INGESTION_STAGE_QUEUE_SIZE: int = 8
 
     # 6. Configuration de l'Application
     APP_ENV: str = "development"
@@ -40,12 +52,62 @@ class Settings(BaseSettings):
     # 7. Configuration Vector Search
     VECTOR_DIMENSION: int = 768
     MAX_SEARCH_RESULTS: int = 10
+    # Mode de recherche par défaut : exact | halfvec | binary (deux phases avec re-scoring ;
+    # index compact créé via `python cli.py reindex --compact ...`, sinon repli sur exact)
+    VECTOR_SEARCH_MODE: str = "exact"
+    # Nombre de candidats présélectionnés = limit * VECTOR_RESCORE_FACTOR
+    VECTOR_RESCORE_FACTOR: int = 4
+    # Index ANN géré : hnsw | ivfflat (reconstruit via `python cli.py reindex`)
+    VECTOR_INDEX_METHOD: str = "hnsw"
+    # Réglages de requête par défaut (rappel vs latence) ; vides = défauts du serveur
+    VECTOR_HNSW_EF_SEARCH: Optional[int] = None
+    VECTOR_IVFFLAT_PROBES: Optional[int] = None
+    # Parcours itératif des recherches filtrées : off | relaxed_order | strict_order (pgvector >= 0.8)
+    VECTOR_ITERATIVE_SCAN: str = "relaxed_order"
+    # Recherche hybride : fusion linear | rrf, candidats de la branche texte (vide = limit * 2)
+    HYBRID_FUSION: str = "linear"
+    HYBRID_TEXT_MATCH_COUNT: Optional[int] = None
+
+    # 8. Cache des embeddings de requêtes (LRU + TTL)
+    QUERY_CACHE_ENABLED: bool = True
+    QUERY_CACHE_MAX_SIZE: int = 2048
+    QUERY_CACHE_TTL_SECONDS: float = 3600.0
+    # Normalisation du texte avant lookup : none | strip | whitespace | casefold
+    QUERY_CACHE_NORMALIZATION: str = "whitespace"
+
+    # 9. Écritures groupées (group commit) du stockage
+    STORAGE_GROUP_COMMIT_ENABLED: bool = True
+    STORAGE_GROUP_COMMIT_MAX_BATCH: int = 32
+    STORAGE_GROUP_COMMIT_MAX_DELAY_MS: float = 50.0
 
-    # 8. Autres configurations
+    # 10. Graphe de code (SQLite) : PRAGMA appliqués à l'ouverture de la connexion
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Connexions en lecture seule (WAL) servant les requêtes de graphe de l'API
+    SQLITE_READ_POOL_SIZE: int = 4
+
+    # 11. Autres configurations
     CHUNK_SIZE: int = 800
     CHUNK_OVERLAP: int = 150
     SESSION_TIMEOUT_MINUTES: int = 60
 
+    # 12. Télémétrie : spans OpenTelemetry (no-op sans SDK configuré) et métriques en
+    # mémoire (compteurs, histogrammes de latence) exposées par GET /metrics
+    TELEMETRY_TRACING_ENABLED: bool = True
+    TELEMETRY_METRICS_ENABLED: bool = True
+
+    # 13. Reprise des jobs d'ingestion : jobs et points de contrôle par fichier et par
+    # étape (SQLite local) ; les fichiers uploadés restent dans JOB_UPLOAD_DIR jusqu'à la
+    # fin du job et les jobs interrompus sont relancés au démarrage
+    JOB_STORE_ENABLED: bool = True
+    JOB_STORE_PATH: str = "ingestion_jobs.sqlite"
+    JOB_UPLOAD_DIR: str = "job_uploads"
+    # Projet des uploads envoyés sans champ `project` : préfixe stable de leurs documents
+    INGEST_DEFAULT_PROJECT: str = "default"
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
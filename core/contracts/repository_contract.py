@@ -1,6 +1,12 @@
 # FICHIER: analyzer-engine/core/contracts/repository_contract.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..models.graph_models import EntityStats, GraphSearchPage, GraphTraversal
+
+# Reçoit les résultats d'un lot avant son commit ; retourne {indice: erreur} des
+# fichiers à annuler (voir `ICodeRepository.add_code_structures_batch`).
+BatchConfirm = Callable[[List[Dict[str, Any]]], Awaitable[Dict[int, str]]]
 
 
 class ICodeRepository(ABC):
@@ -24,6 +30,23 @@ class ICodeRepository(ABC):
         """Ajoute les entités (nœuds) et relations (arêtes) d'un fichier au graphe."""
         pass
 
+    @abstractmethod
+    async def add_code_structures_batch(
+        self,
+        files_data: List[Dict[str, Any]],
+        confirm: Optional[BatchConfirm] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ajoute la structure de plusieurs fichiers avec un seul commit.
+        L'atomicité est garantie par fichier ; retourne un résultat par fichier
+        (clé `error` en cas d'échec).
+
+        `confirm`, s'il est fourni, est appelé avec ces résultats avant le commit : les
+        fichiers dont il retourne l'indice sont annulés et reçoivent l'erreur associée.
+        S'il lève une exception, aucun fichier du lot n'est écrit.
+        """
+        pass
+
     @abstractmethod
     async def find_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
         """
@@ -31,3 +54,46 @@ class ICodeRepository(ABC):
         C'est le remplaçant direct de la fonction `search_code_graph`.
         """
         pass
+
+    @abstractmethod
+    async def search_entity_relationships(
+        self,
+        entity_name: str,
+        match_mode: str = "substring",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> GraphSearchPage:
+        """
+        Relations directes des entités dont le nom correspond à `entity_name` selon
+        `match_mode` (`exact`, `prefix`, `substring`), paginées par `cursor`.
+        """
+        pass
+
+    @abstractmethod
+    async def traverse(
+        self,
+        entity_name: str,
+        direction: str = "outgoing",
+        rel_types: Optional[List[str]] = None,
+        max_depth: int = 3,
+        limit: int = 1000,
+        mode: str = "frontier",
+        file_path: Optional[str] = None,
+    ) -> GraphTraversal:
+        """
+        Parcours multi-sauts depuis une entité (ex. : tout ce qui appelle X, transitivement),
+        borné par `max_depth` et `limit`, en un seul aller-retour.
+        """
+        pass
+
+    @abstractmethod
+    async def compute_entity_stats(self, damping: float = 0.85) -> Dict[str, int]:
+        """Recalcule et persiste les degrés et le PageRank de toutes les entités."""
+        pass
+
+    @abstractmethod
+    async def get_entity_stats(
+        self, order_by: str = "pagerank", limit: int = 50
+    ) -> List[EntityStats]:
+        """Entités les plus centrales selon `order_by` (`pagerank`, `in_degree`, `out_degree`)."""
+        pass
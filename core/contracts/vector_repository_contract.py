@@ -1,7 +1,15 @@
 # FICHIER: analyzer-engine/core/contracts/vector_repository_contract.py
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
-from ..models.db import ChunkResult, DocumentMetadata
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    List,
+    Dict,
+    Any,
+    Optional,
+    Sequence,
+)
+from ..models.db import ChunkResult, DocumentMetadata, DocumentPage, SearchFilters
 
 
 class IVectorRepository(ABC):
@@ -22,16 +30,72 @@ class IVectorRepository(ABC):
 
     @abstractmethod
     async def vector_search(
-        self, embedding: List[float], limit: int
+        self,
+        embedding: List[float],
+        limit: int,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        filters: Optional[SearchFilters] = None,
     ) -> List[ChunkResult]:
-        """Effectue une recherche par similarité vectorielle."""
+        """
+        Effectue une recherche par similarité vectorielle.
+        `search_mode` sélectionne la recherche exacte ou en deux phases
+        (présélection sur représentation compacte puis re-scoring exact).
+        `ef_search` (HNSW) et `probes` (IVFFlat) arbitrent rappel et latence
+        pour cette seule requête.
+        `filters` restreint la recherche (type d'entité, préfixe de chemin, nom)
+        à l'intérieur même du parcours de l'index.
+        """
+        pass
+
+    @abstractmethod
+    async def vector_search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        limit: int,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[List[ChunkResult]]:
+        """
+        Effectue plusieurs recherches vectorielles en un seul aller-retour.
+        Retourne une liste de résultats par embedding, dans l'ordre d'entrée.
+        """
         pass
 
     @abstractmethod
     async def hybrid_search(
-        self, embedding: List[float], query_text: str, limit: int, text_weight: float
+        self,
+        embedding: List[float],
+        query_text: str,
+        limit: int,
+        text_weight: float,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        fusion: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
     ) -> List[ChunkResult]:
-        """Effectue une recherche hybride (vecteur + texte)."""
+        """
+        Effectue une recherche hybride (vecteur + texte).
+        `fusion` combine les deux branches : `linear` (scores normalisés pondérés
+        par `text_weight`) ou `rrf` (Reciprocal Rank Fusion pondérée).
+        `filters` s'applique aux deux branches.
+        """
+        pass
+
+    @abstractmethod
+    async def rebuild_vector_index(
+        self, method: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Reconstruit l'index ANN avec des paramètres dimensionnés sur le corpus."""
+        pass
+
+    @abstractmethod
+    async def set_compact_indexes(self, kinds: Sequence[str]) -> List[str]:
+        """Crée les index compacts demandés (recherche en deux phases) et supprime les autres."""
         pass
 
     @abstractmethod
@@ -44,18 +108,70 @@ class IVectorRepository(ABC):
         """Liste les documents disponibles avec leurs métadonnées."""
         pass
 
+    @abstractmethod
+    async def list_documents_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> DocumentPage:
+        """
+        Liste les documents par pagination keyset (du plus récent au plus ancien).
+        `cursor` est le `next_cursor` de la page précédente.
+        """
+        pass
+
+    @abstractmethod
+    def stream_rows(
+        self, table: str, batch_size: int = 1000
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Itère sur toutes les lignes de `documents` ou `chunks` par lots de `batch_size`,
+        sans charger la table en mémoire.
+        """
+        pass
+
     @abstractmethod
     async def get_document_chunks(self, document_id: str) -> List[Dict[str, Any]]:
         """Récupère tous les chunks pour un document donné."""
         pass
 
+    @abstractmethod
+    async def is_document_unchanged(self, source: str, content_hash: str) -> bool:
+        """Indique si un document de même source et de même empreinte est déjà stocké."""
+        pass
+
     @abstractmethod
     async def save_document_with_chunks(
         self,
         file_path: str,
         document_content: str,
-        chunks: List[Dict[str, Any]],
+        chunks: List[Any],
         document_metadata: Dict[str, Any],
-    ) -> int:
-        """Sauvegarde un document et tous ses chunks de manière atomique."""
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sauvegarde un document et tous ses chunks de manière atomique et idempotente.
+        Les chunks sont des `DocumentChunk` ou des dictionnaires de mêmes champs.
+        Retourne le statut (`created`, `replaced` ou `unchanged`) et le décompte des chunks
+        ajoutés, supprimés et conservés.
+        """
+        pass
+
+    @abstractmethod
+    async def save_documents_batch(
+        self, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sauvegarde un lot de documents avec leurs chunks en chargement groupé.
+        L'atomicité est garantie par document ; retourne un résultat par document.
+        """
+        pass
+
+    @abstractmethod
+    def pending_documents_batch(
+        self, documents: List[Dict[str, Any]]
+    ) -> AsyncContextManager[List[Dict[str, Any]]]:
+        """
+        Comme `save_documents_batch`, mais sous forme de gestionnaire de contexte : les
+        résultats sont fournis à l'entrée et le lot n'est validé qu'à la sortie du bloc
+        (annulé si le bloc lève une exception).
+        """
         pass
@@ -1,6 +1,6 @@
 # NOUVEAU FICHIER: analyzer-engine/core/models/db.py
 from pydantic import BaseModel, Field, field_validator
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Literal, Optional
 from datetime import datetime
 
 
@@ -12,6 +12,36 @@ class DocumentMetadata(BaseModel):
     created_at: datetime
     updated_at: datetime
     chunk_count: Optional[int] = None
+    total_tokens: Optional[int] = None
+
+
+class DocumentPage(BaseModel):
+    """Page de documents ; `next_cursor` est absent sur la dernière page."""
+
+    items: List[DocumentMetadata]
+    next_cursor: Optional[str] = None
+
+
+class SearchFilters(BaseModel):
+    """Filtres de recherche appliqués dans le parcours ANN (colonnes promues des chunks)."""
+
+    entity_types: Optional[List[Literal["FUNCTION", "CLASS", "FILE"]]] = None
+    file_path_prefix: Optional[str] = None
+    entity_name: Optional[str] = None
+
+    def is_empty(self) -> bool:
+        return not (self.entity_types or self.file_path_prefix or self.entity_name)
+
+    def path_pattern(self) -> Optional[str]:
+        """Motif LIKE du préfixe de chemin, caractères spéciaux échappés."""
+        if not self.file_path_prefix:
+            return None
+        escaped = (
+            self.file_path_prefix.replace("\\", "\\\\")
+            .replace("%", "\\%")
+            .replace("_", "\\_")
+        )
+        return escaped + "%"
 
 
 class ChunkResult(BaseModel):
@@ -1,6 +1,6 @@
 # FICHIER: analyzer-engine/core/models/graph_models.py
 from pydantic import BaseModel, Field
-from typing import Literal
+from typing import List, Literal, Optional
 
 
 class CodeEntity(BaseModel):
@@ -28,3 +28,44 @@ class GraphSearchResult(BaseModel):
     source: str
     relationship: str
     target: str
+
+
+class GraphSearchPage(BaseModel):
+    """Page de relations ; `next_cursor` est absent sur la dernière page."""
+
+    items: List[GraphSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class TraversalNode(BaseModel):
+    """Entité atteinte lors d'un parcours du graphe, à sa profondeur minimale."""
+
+    id: int
+    name: str
+    type: str
+    file_path: str
+    depth: int
+
+
+class GraphTraversal(BaseModel):
+    """
+    Résultat d'un parcours multi-sauts.
+    `nodes` contient les racines (profondeur 0) et les entités atteintes ; en mode `paths`,
+    chaque chemin est la suite des IDs d'entités depuis une racine.
+    """
+
+    nodes: List[TraversalNode]
+    paths: List[List[int]] = []
+    truncated: bool = False
+
+
+class EntityStats(BaseModel):
+    """Métriques structurelles d'une entité (table `entity_stats`)."""
+
+    id: int
+    name: str
+    type: str
+    file_path: str
+    in_degree: int
+    out_degree: int
+    pagerank: float
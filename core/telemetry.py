@@ -0,0 +1,239 @@
+# FICHIER: analyzer-engine/core/telemetry.py
+"""
+Traces et métriques de l'ingestion et de la recherche.
+
+- Traces : spans OpenTelemetry créés via `opentelemetry-api`. Tant qu'aucun SDK n'est
+  installé et configuré (ou après `configure_telemetry(tracing=False)`), le traceur est
+  un no-op et les spans ne coûtent presque rien.
+- Métriques : registre en mémoire de compteurs et d'histogrammes de latence, toujours
+  disponible (sans exportateur externe) et exposé au format texte Prometheus par
+  `GET /metrics`.
+
+`instrument` réunit les deux : un span par opération et une observation de sa durée dans
+l'histogramme `operation_duration_seconds`, étiquetée par opération et par issue
+(`ok`, `error`, `cancelled`).
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Tuple, TypeVar
+
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+# Bornes (secondes) des histogrammes de latence : de la requête SQLite à l'appel d'API.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+OPERATION_DURATION = "operation_duration_seconds"
+
+_Labels = Tuple[Tuple[str, str], ...]
+T = TypeVar("T")
+
+
+def _label_key(labels: Dict[str, Any]) -> _Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: _Labels, extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """
+    Registre en mémoire de compteurs et d'histogrammes, indexés par nom et étiquettes.
+    Désactivé, il ignore toutes les mesures.
+    """
+
+    def __init__(
+        self, enabled: bool = True, buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._counters: Dict[str, Dict[_Labels, float]] = {}
+        self._histograms: Dict[str, Dict[_Labels, _Histogram]] = {}
+        # Les mesures peuvent provenir de threads (to_thread, aiosqlite).
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Ajoute `value` au compteur `name` pour ces étiquettes."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Enregistre une valeur (ex. : une durée en secondes) dans l'histogramme `name`."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[bisect_left(self.buckets, value)] += 1
+            histogram.sum += value
+            histogram.count += 1
+
+    def reset(self) -> None:
+        """Efface toutes les séries."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Retourne l'état courant : `counters[nom][étiquettes] = valeur` et
+        `histograms[nom][étiquettes] = {"count", "sum", "buckets"}` (cumulatifs par borne).
+        Les étiquettes sont rendues sous la forme `clé=valeur,...`.
+        """
+        with self._lock:
+            counters = {
+                name: {self._label_text(key): value for key, value in series.items()}
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: {
+                    self._label_text(key): {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": dict(
+                            zip(
+                                [*map(str, self.buckets), "+Inf"],
+                                self._cumulative(histogram),
+                            )
+                        ),
+                    }
+                    for key, histogram in series.items()
+                }
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    def render_prometheus(self) -> str:
+        """Sérialise le registre au format d'exposition texte de Prometheus."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, self._cumulative(histogram)):
+                        labels = _format_labels(key, f'le="{bound}"')
+                        lines.append(f"{name}_bucket{labels} {count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _label_text(key: _Labels) -> str:
+        return ",".join(f"{label}={value}" for label, value in key)
+
+    @staticmethod
+    def _cumulative(histogram: _Histogram):
+        total = 0
+        for count in histogram.counts:
+            total += count
+            yield total
+
+
+# Registre et traceur partagés par toute l'application.
+metrics = MetricsRegistry()
+_tracer: trace.Tracer = trace.get_tracer("analyzer-engine")
+
+
+def configure_telemetry(tracing: bool = True, metrics_enabled: bool = True) -> None:
+    """
+    Active ou désactive les traces et les métriques.
+    Traces actives : les spans sont transmis au `TracerProvider` global d'OpenTelemetry
+    (no-op tant qu'aucun SDK n'en installe un).
+    """
+    global _tracer
+    _tracer = trace.get_tracer("analyzer-engine") if tracing else trace.NoOpTracer()
+    metrics.enabled = metrics_enabled
+    logger.info(f"Telemetry configured (tracing={tracing}, metrics={metrics_enabled}).")
+
+
+@contextmanager
+def instrument(operation: str, **attributes: Any) -> Iterator[trace.Span]:
+    """
+    Exécute le bloc dans un span `operation` et mesure sa durée.
+    Rend le span, pour y ajouter des attributs connus en cours de route.
+
+    Exemple : `with instrument("provider.embed_batch", **{"texts.count": 8}) as span:`
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        with _tracer.start_as_current_span(
+            operation,
+            attributes={k: v for k, v in attributes.items() if v is not None},
+        ) as span:
+            yield span
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        metrics.observe(
+            OPERATION_DURATION,
+            time.perf_counter() - start,
+            operation=operation,
+            outcome=outcome,
+        )
+
+
+def traced(
+    operation: str,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Décorateur : exécute une coroutine sous `instrument(operation)`."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            with instrument(operation):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
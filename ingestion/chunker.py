@@ -17,8 +17,10 @@ logger = logging.getLogger(__name__)
 # L'initialisation précoce au niveau du module a été supprimée. C'est correct.
 
 
-@dataclass
+@dataclass(slots=True)
 class DocumentChunk:
+    """Chunk typé qui circule tel quel jusqu'au stockage (aucune conversion en dict)."""
+
     content: str
     index: int
     start_char: int
@@ -5,13 +5,15 @@ This module is responsible for converting text chunks into vector embeddings.
 
 import asyncio
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 import os
 
 from dotenv import load_dotenv
 
+from core.telemetry import instrument, metrics
 from .chunker import DocumentChunk
+from .query_cache import QueryEmbeddingCache
 
 # Load environment variables
 load_dotenv()
@@ -24,7 +26,11 @@ class EmbeddingGenerator:
     """
 
     def __init__(
-        self, batch_size: int = 100, max_retries: int = 3, retry_delay: float = 1.0
+        self,
+        batch_size: int = 100,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        query_cache: Optional[QueryEmbeddingCache] = None,
     ):
         """
         Initialize embedding generator.
@@ -33,6 +39,7 @@ class EmbeddingGenerator:
             batch_size: Number of texts to process in parallel.
             max_retries: Maximum number of retry attempts for failed API calls.
             retry_delay: Delay between retries in seconds.
+            query_cache: Optional cache for query embeddings (see `embed_query`).
         """
 
         from .providers import get_embedder
@@ -41,6 +48,7 @@ class EmbeddingGenerator:
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.query_cache = query_cache
         self.dimension = self.provider.get_embedding_dimension()
 
         logger.info(
@@ -77,9 +85,13 @@ class EmbeddingGenerator:
 
             for attempt in range(self.max_retries):
                 try:
-                    embeddings = await self.provider.generate_embeddings_batch(
-                        batch_texts
-                    )
+                    with instrument(
+                        "provider.embed_batch",
+                        **{"texts.count": len(batch_texts), "attempt": attempt + 1},
+                    ):
+                        embeddings = await self.provider.generate_embeddings_batch(
+                            batch_texts
+                        )
 
                     # Attach embeddings to their corresponding chunks
                     for chunk, embedding in zip(batch_chunks, embeddings):
@@ -121,10 +133,75 @@ class EmbeddingGenerator:
         Args:
             query: The search query text.
 
+        When a query cache is configured, repeated queries are served from it and
+        concurrent identical queries share a single provider call.
+
         Returns:
             The embedding vector for the query.
         """
-        return await self.provider.generate_embedding(query)
+        with instrument("provider.embed_query") as span:
+            if self.query_cache is None:
+                return await self.provider.generate_embedding(query)
+            hits = self.query_cache.hits
+            embedding = await self.query_cache.get_or_compute(
+                query, self.provider.generate_embedding
+            )
+            hit = self.query_cache.hits > hits
+            span.set_attribute("cache.hit", hit)
+            metrics.increment(
+                "query_cache_lookups_total", result="hit" if hit else "miss"
+            )
+            return embedding
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for several search queries at once.
+
+        Cached queries are served from the query cache; the remaining distinct
+        queries are embedded with batched provider calls and then cached. With a
+        cache, queries are normalized by its normalizer first, exactly like
+        `embed_query`: variants of one query share a single embedding.
+
+        Args:
+            queries: The search query texts.
+
+        Returns:
+            One embedding per query, in input order.
+        """
+        results: List[Optional[List[float]]] = [None] * len(queries)
+        missing: Dict[str, List[int]] = {}
+        for i, query in enumerate(queries):
+            if self.query_cache is None:
+                key, cached = query, None
+            else:
+                key = self.query_cache.normalize(query)
+                cached = self.query_cache.get(key)
+            if cached is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                results[i] = cached
+
+        texts = list(missing)
+        hits = len(queries) - sum(len(indexes) for indexes in missing.values())
+        if self.query_cache is not None:
+            metrics.increment("query_cache_lookups_total", hits, result="hit")
+            metrics.increment(
+                "query_cache_lookups_total", len(queries) - hits, result="miss"
+            )
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start : start + self.batch_size]
+            with instrument(
+                "provider.embed_batch",
+                **{"texts.count": len(batch), "cache.hits": hits},
+            ):
+                embeddings = await self.provider.generate_embeddings_batch(batch)
+            for text, embedding in zip(batch, embeddings):
+                if self.query_cache is not None:
+                    self.query_cache.put(text, embedding)
+                # One list per position: duplicate queries must not share a list.
+                for i in missing[text]:
+                    results[i] = list(embedding)
+        return results
 
     def get_embedding_dimension(self) -> int:
         """
@@ -136,16 +213,39 @@ class EmbeddingGenerator:
         return self.dimension
 
 
+def create_query_cache() -> Optional[QueryEmbeddingCache]:
+    """
+    Build the query embedding cache from the application settings.
+
+    Returns:
+        A configured QueryEmbeddingCache, or None when caching is disabled.
+    """
+    from config import settings
+
+    if not settings.QUERY_CACHE_ENABLED:
+        return None
+    return QueryEmbeddingCache(
+        max_size=settings.QUERY_CACHE_MAX_SIZE,
+        ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+        normalizer=settings.QUERY_CACHE_NORMALIZATION,
+    )
+
+
 def create_embedder(**kwargs) -> EmbeddingGenerator:
     """
     Factory function to create an instance of the EmbeddingGenerator.
 
+    A query cache built from the settings is attached unless `query_cache`
+    is passed explicitly.
+
     Args:
         **kwargs: Arguments to pass to the EmbeddingGenerator constructor.
 
     Returns:
         An instance of EmbeddingGenerator.
     """
+    if "query_cache" not in kwargs:
+        kwargs["query_cache"] = create_query_cache()
     return EmbeddingGenerator(**kwargs)
 
 
@@ -0,0 +1,135 @@
+# FICHIER: analyzer-engine/ingestion/orchestration/concurrency_limiter.py
+"""
+Limiteur de concurrence pour l'ingestion multi-fichiers.
+
+En mode fixe, au plus `limit` fichiers sont traités simultanément. En mode adaptatif,
+la limite suit un contrôle AIMD (augmentation additive, diminution multiplicative) :
+- chaque succès rapide, obtenu alors que toutes les places sont occupées, ajoute
+  1 / limite (soit +1 par « fenêtre » de `limit` fichiers terminés) ;
+- un échec, ou une latence lissée dépassant `tolerance` fois la meilleure latence
+  observée (saturation de l'API d'embedding ou de la base), multiplie la limite par
+  `backoff`, au plus une fois par fenêtre.
+
+L'appelant qualifie l'issue via la place reçue de `slot()` : une exception ou `fail()`
+compte comme un échec ; `skip()` (fichier inchangé, illisible) exclut la latence de la
+référence, un traitement quasi instantané faussant la « meilleure latence ».
+"""
+
+import asyncio
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Slot:
+    """Place occupée dans le limiteur : l'appelant peut en qualifier l'issue."""
+
+    __slots__ = ("succeeded", "measured")
+
+    def __init__(self):
+        self.succeeded = True
+        self.measured = True
+
+    def fail(self) -> None:
+        """Le traitement a échoué sans lever d'exception."""
+        self.succeeded = False
+
+    def skip(self) -> None:
+        """Latence non représentative : ni succès mesuré, ni échec."""
+        self.measured = False
+
+
+class ConcurrencyLimiter:
+    """Sémaphore à limite fixe ou adaptative (voir le docstring du module)."""
+
+    def __init__(
+        self,
+        limit: int,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        tolerance: float = 2.0,
+        backoff: float = 0.7,
+        smoothing: float = 0.2,
+    ):
+        if limit < 1 or min_limit < 1:
+            raise ValueError("Concurrency limits must be positive.")
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit or limit, limit)
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self._limit = float(limit)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self._latency: Optional[float] = None
+        self._best_latency = math.inf
+        self._completed = 0
+        self._last_decrease = -self.max_limit
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[Slot]:
+        """Occupe une place pendant le traitement d'un fichier."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        saturated = self._in_flight >= self.limit
+        start = time.perf_counter()
+        outcome = Slot()
+        try:
+            yield outcome
+        except Exception:
+            outcome.fail()
+            raise
+        except BaseException:
+            # Annulation : aucune information sur la charge.
+            outcome.skip()
+            raise
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                if self.adaptive:
+                    self._record(time.perf_counter() - start, outcome, saturated)
+                self._condition.notify_all()
+
+    def _record(self, latency: float, outcome: Slot, saturated: bool) -> None:
+        self._completed += 1
+        if outcome.succeeded:
+            if not outcome.measured:
+                return
+            self._latency = (
+                latency
+                if self._latency is None
+                else (1 - self.smoothing) * self._latency + self.smoothing * latency
+            )
+            self._best_latency = min(self._best_latency, self._latency)
+            if self._latency <= self.tolerance * self._best_latency:
+                if saturated:
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                return
+
+        # Au plus une diminution par fenêtre : les fichiers déjà lancés avec l'ancienne
+        # limite ne doivent pas provoquer de nouvelles baisses en cascade.
+        if self._completed - self._last_decrease < self.limit:
+            return
+        self._last_decrease = self._completed
+        previous = self.limit
+        self._limit = max(self.min_limit, math.floor(self._limit * self.backoff))
+        if self.limit != previous:
+            logger.info(
+                f"Ingestion concurrency reduced from {previous} to {self.limit} "
+                f"({'failure' if not outcome.succeeded else 'latency increase'})."
+            )
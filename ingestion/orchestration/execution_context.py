@@ -1,29 +1,33 @@
-# FICHIER: analyzer-engine/ingestion/orchestration/execution_context.py (CORRIGÉ)
-from pydantic import BaseModel, ConfigDict  # <-- AJOUTER ConfigDict
+# FICHIER: analyzer-engine/ingestion/orchestration/execution_context.py
+from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
+
 from core.models.ast_models import NormalizedAST
+from ingestion.chunker import DocumentChunk
 
 
-class ExecutionContext(BaseModel):
-    """L'objet qui circule entre les étapes du pipeline, transportant l'état."""
+@dataclass(slots=True)
+class ExecutionContext:
+    """
+    L'objet qui circule entre les étapes du pipeline, transportant l'état.
 
-    # ======================= MODIFICATION ELITE =======================
-    # Remplacement de l'ancienne sous-classe `Config` par la syntaxe moderne `ConfigDict`
-    # pour éliminer l'avertissement de dépréciation de Pydantic V2.
-    model_config = ConfigDict(arbitrary_types_allowed=True)
-    # ==================================================================
+    Simple dataclass à slots : les étapes le modifient sur place, sans validation ni copie
+    des listes (contrairement à un modèle pydantic, qui revalide et recopie chaque champ
+    à la construction).
+    """
 
     # Données initiales
     file_path: str
     source_code: str
     language: str
+    # Empreinte du code source, clé d'idempotence de la ré-ingestion.
+    content_hash: Optional[str] = None
 
-    # Données enrichies par les étapes successives
+    # Données enrichies par les étapes successives.
+    # L'AST n'est conservé que jusqu'à la fin de l'AnalysisStage.
     normalized_ast: Optional[NormalizedAST] = None
-    entities: List[Dict[str, Any]] = []
-    relationships: List[Dict[str, Any]] = []
-    chunks: List[Dict[str, Any]] = []
-
-    # L'ancienne classe Config est supprimée.
-    # class Config:
-    #     arbitrary_types_allowed = True
+    entities: List[Dict[str, Any]] = field(default_factory=list)
+    relationships: List[Dict[str, Any]] = field(default_factory=list)
+    chunks: List[DocumentChunk] = field(default_factory=list)
+    # Issue du stockage : "created", "replaced" ou "unchanged" (fichier ignoré).
+    ingestion_status: Optional[str] = None
@@ -1,19 +1,38 @@
 # FICHIER MODIFIÉ: analyzer-engine/ingestion/orchestration/pipeline_director.py
+import asyncio
 import logging
-from typing import List, Optional, Callable, Awaitable
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Dict,
+    List,
+    Optional,
+    Callable,
+    Awaitable,
+    Tuple,
+)
 
-from .stages.base_stage import IPipelineStage
+from .stages.base_stage import IPipelineStage, run_stage
 from .execution_context import ExecutionContext
 from .stages.parsing_stage import ParsingStage
 from .stages.analysis_stage import AnalysisStage
 from .stages.chunking_embedding_stage import ChunkingEmbeddingStage
 from .stages.storage_stage import StorageStage
+from .streaming_pipeline import PipelineItem, StreamingPipeline
 
 # ======================= CORRECTION ELITE =======================
 # Le directeur a maintenant besoin des repositories pour les injecter dans la StorageStage.
 from ingestion.storage.repositories.postgres_repository import PostgresRepository
 from ingestion.storage.repositories.sqlite_graph_repository import SQLiteGraphRepository
+from core.contracts.repository_contract import ICodeRepository
 from api.dependencies import get_db_pool  # Pour créer le repo postgres
+from api.dependencies import get_storage_writer, sqlite_pragmas
+from config import settings
+from ingestion.storage.content_hash import compute_content_hash
+
+if TYPE_CHECKING:
+    from services.job_store import SQLiteJobStore
 
 logger = logging.getLogger(__name__)
 
@@ -22,22 +41,55 @@ class PipelineDirector:
     """Le chef d'orchestre : construit et exécute le pipeline."""
 
     def __init__(
-        self, status_callback: Optional[Callable[[dict], Awaitable[None]]] = None
+        self,
+        status_callback: Optional[Callable[[dict], Awaitable[None]]] = None,
+        code_repo: Optional[ICodeRepository] = None,
+        job_store: Optional["SQLiteJobStore"] = None,
     ):
+        """
+        Args:
+            code_repo: repository du graphe de code à utiliser (ex. : InMemoryCodeRepository
+                pour une analyse éphémère) ; défaut : la base SQLite configurée.
+            job_store: si fourni, chaque étape terminée est enregistrée comme point de
+                contrôle et un fichier repris repart de l'étape qui suit le sien.
+        """
         self.status_callback = status_callback
+        self.code_repo = code_repo
+        self.job_store = job_store
         # L'initialisation des étapes est déplacée dans une méthode async
         # car elle a maintenant besoin d'attendre la création du pool de BDD.
         self.pipeline: List[IPipelineStage] = []
+        self.vector_repo: Optional[PostgresRepository] = None
+        # Plusieurs fichiers peuvent être traités en parallèle : une seule initialisation.
+        self._init_lock = asyncio.Lock()
 
     async def initialize_pipeline(self):
         """Initialise le pipeline de manière asynchrone."""
         if self.pipeline:
             return
+        async with self._init_lock:
+            if not self.pipeline:
+                await self._build_pipeline()
 
+    async def _build_pipeline(self):
         # Crée les dépendances nécessaires pour les étapes
         db_pool = await get_db_pool()
         vector_repo = PostgresRepository(db_pool)
-        code_repo = SQLiteGraphRepository()
+        self.vector_repo = vector_repo
+        # Les écritures de tous les pipelines sont regroupées par un écrivain partagé,
+        # lié à la base SQLite de l'application : un repository injecté (ex. : graphe en
+        # mémoire) est donc écrit directement.
+        writer = None
+        if self.code_repo is not None:
+            code_repo = self.code_repo
+        elif settings.STORAGE_GROUP_COMMIT_ENABLED:
+            writer = await get_storage_writer()
+            code_repo = writer.code_repo
+        else:
+            # Le pipeline ne fait qu'écrire : pas de connexions de lecture.
+            code_repo = SQLiteGraphRepository(
+                pragmas=sqlite_pragmas(), read_pool_size=0
+            )
         await code_repo.initialize()  # SQLite a besoin d'une initialisation manuelle
 
         self.pipeline = [
@@ -45,28 +97,155 @@ class PipelineDirector:
             AnalysisStage(self.status_callback),
             ChunkingEmbeddingStage(self.status_callback),
             # Injecte les dépendances dans la StorageStage
-            StorageStage(code_repo, vector_repo, self.status_callback),
+            StorageStage(code_repo, vector_repo, self.status_callback, writer=writer),
         ]
         logger.info(f"PipelineDirector initialized with {len(self.pipeline)} stages.")
 
     async def process(
-        self, file_path: str, source_code: str, language: str, job_id: str
+        self,
+        file_path: str,
+        source_code: str,
+        language: str,
+        job_id: str,
+        force: bool = False,
     ):
-        """Démarre et exécute le pipeline complet pour un fichier donné."""
+        """
+        Démarre et exécute le pipeline complet pour un fichier donné.
+        Un fichier déjà stocké avec la même empreinte est ignoré avant tout travail
+        de parsing ou d'embedding, sauf si `force` est vrai.
+        """
         # S'assure que le pipeline est initialisé
         await self.initialize_pipeline()
 
-        context = ExecutionContext(
-            file_path=file_path, source_code=source_code, language=language
+        context, start = await self._start(
+            file_path, source_code, language, job_id, force
         )
+        if context.ingestion_status == "unchanged":
+            return context
 
         logger.info(f"PipelineDirector: Starting process for {context.file_path}...")
-        for i, stage in enumerate(self.pipeline):
+        for i, stage in enumerate(self.pipeline[start:], start):
             stage_name = stage.__class__.__name__
             logger.info(
                 f"--- [{job_id}] Executing Stage {i+1}/{len(self.pipeline)}: {stage_name} ---"
             )
-            context = await stage.execute(context, job_id)
+            context = await run_stage(stage, context, job_id)
+            await self._checkpoint(job_id, i, context)
 
         logger.info(f"PipelineDirector: Process finished for {context.file_path}.")
         return context
+
+    async def process_stream(
+        self,
+        files: AsyncIterable[Dict[str, str]],
+        job_id: str,
+        force: bool = False,
+    ) -> AsyncIterator[PipelineItem]:
+        """
+        Exécute le pipeline en flux (voir `StreamingPipeline`) : chaque étape a ses
+        workers (INGESTION_STAGE_WORKERS) et les étapes se chevauchent d'un fichier à
+        l'autre, avec contre-pression par des files de INGESTION_STAGE_QUEUE_SIZE.
+
+        Args:
+            files: fichiers à traiter (`file_path`, `source_code`, `language`).
+
+        Returns:
+            Un élément par fichier, dans l'ordre d'achèvement ; `error` est renseigné si
+            une étape a échoué sur ce fichier.
+        """
+        await self.initialize_pipeline()
+
+        async def items():
+            async for file in files:
+                context, start = await self._start(
+                    file["file_path"],
+                    file["source_code"],
+                    file["language"],
+                    job_id,
+                    force,
+                )
+                yield PipelineItem(
+                    context, done=context.ingestion_status == "unchanged", start=start
+                )
+
+        pipeline = StreamingPipeline(
+            self.pipeline,
+            workers=settings.INGESTION_STAGE_WORKERS,
+            queue_size=settings.INGESTION_STAGE_QUEUE_SIZE,
+            on_stage_done=self._checkpoint if self.job_store is not None else None,
+        )
+        async for item in pipeline.run(items(), job_id):
+            yield item
+
+    async def _start(
+        self,
+        file_path: str,
+        source_code: str,
+        language: str,
+        job_id: str,
+        force: bool,
+    ) -> Tuple[ExecutionContext, int]:
+        """
+        Retourne le contexte d'un fichier et l'indice de la première étape à exécuter :
+        après le point de contrôle du job s'il en existe un pour ce même contenu, sinon 0.
+        """
+        if self.job_store is not None:
+            checkpoint = await self.job_store.load_checkpoint(job_id, file_path)
+            stages = [stage.__class__.__name__ for stage in self.pipeline]
+            if (
+                checkpoint is not None
+                and checkpoint[0] in stages
+                and checkpoint[1].content_hash == compute_content_hash(source_code)
+            ):
+                stage, context = checkpoint
+                logger.info(
+                    f"[{job_id}] Resuming {file_path} after {stage} from checkpoint."
+                )
+                return context, stages.index(stage) + 1
+        context = await self._prepare_context(
+            file_path, source_code, language, job_id, force
+        )
+        return context, 0
+
+    async def _checkpoint(
+        self, job_id: str, index: int, context: ExecutionContext
+    ) -> None:
+        """Enregistre la fin de l'étape `index` (la dernière est notée par le service)."""
+        if self.job_store is not None and index < len(self.pipeline) - 1:
+            await self.job_store.save_stage(
+                job_id,
+                context.file_path,
+                self.pipeline[index].__class__.__name__,
+                context,
+            )
+
+    async def _prepare_context(
+        self,
+        file_path: str,
+        source_code: str,
+        language: str,
+        job_id: str,
+        force: bool,
+    ) -> ExecutionContext:
+        """
+        Crée le contexte d'un fichier. Un fichier déjà stocké avec la même empreinte est
+        marqué `unchanged` (sauf si `force`), avant tout travail de parsing ou d'embedding.
+        """
+        context = ExecutionContext(
+            file_path=file_path,
+            source_code=source_code,
+            language=language,
+            content_hash=compute_content_hash(source_code),
+        )
+        if (
+            not force
+            and self.vector_repo is not None
+            and await self.vector_repo.is_document_unchanged(
+                file_path, context.content_hash
+            )
+        ):
+            logger.info(
+                f"[{job_id}] {file_path} is unchanged since last ingestion. Skipping."
+            )
+            context.ingestion_status = "unchanged"
+        return context
@@ -27,6 +27,10 @@ class AnalysisStage(IPipelineStage):
         for analyzer in registered_analyzers:
             context = await analyzer.analyze(context)
 
+        # L'AST n'est plus utile aux étapes suivantes : le libérer dès maintenant réduit le
+        # pic mémoire par fichier (surtout en mode flux, où plusieurs fichiers sont en vol).
+        context.normalized_ast = None
+
         logger.info(
             f"Analysis complete. Total entities: {len(context.entities)}, Total relationships: {len(context.relationships)}."
         )
@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod
 from ..execution_context import ExecutionContext
 from typing import Optional, Callable, Awaitable
 
+from core.telemetry import instrument
+
 
 class IPipelineStage(ABC):
     def __init__(
@@ -13,3 +15,26 @@ class IPipelineStage(ABC):
     @abstractmethod
     async def execute(self, context: ExecutionContext, job_id: str) -> ExecutionContext:
         pass
+
+
+async def run_stage(
+    stage: IPipelineStage, context: ExecutionContext, job_id: str
+) -> ExecutionContext:
+    """
+    Exécute `stage.execute` dans un span `stage.<NomDeClasse>` (durée mesurée), annoté
+    de la taille du fichier et du volume produit (entités, relations, chunks).
+    """
+    with instrument(
+        f"stage.{stage.__class__.__name__}",
+        **{
+            "job.id": job_id,
+            "file.path": context.file_path,
+            "file.chars": len(context.source_code),
+        },
+    ) as span:
+        context = await stage.execute(context, job_id)
+        if span.is_recording():
+            span.set_attribute("entities.count", len(context.entities))
+            span.set_attribute("relationships.count", len(context.relationships))
+            span.set_attribute("chunks.count", len(context.chunks))
+    return context
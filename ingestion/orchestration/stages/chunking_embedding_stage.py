@@ -1,7 +1,6 @@
 # FICHIER MODIFIÉ: analyzer-engine/ingestion/orchestration/stages/chunking_embedding_stage.py
 
 import logging
-from dataclasses import asdict
 from typing import Optional, Callable, Awaitable  # <-- AJOUTER LES IMPORTS
 
 from .base_stage import IPipelineStage
@@ -42,7 +41,9 @@ class ChunkingEmbeddingStage(IPipelineStage):
         # par exemple en passant un callback à embed_chunks. Pour l'instant, on le garde simple.
         embedded_chunks = await self.embedder.embed_chunks(doc_chunks)
 
-        context.chunks = [asdict(chunk) for chunk in embedded_chunks]
+        # Les chunks restent des `DocumentChunk` : `asdict` recopierait en profondeur
+        # chaque embedding et chaque dictionnaire de métadonnées.
+        context.chunks = embedded_chunks
 
         logger.info(f"Generated {len(context.chunks)} embedded chunks.")
 
@@ -12,6 +12,8 @@ from ..execution_context import ExecutionContext
 # from ...storage.repositories.postgres_repository import PostgresRepository
 from core.contracts.repository_contract import ICodeRepository
 from core.contracts.vector_repository_contract import IVectorRepository
+from ingestion.storage.group_commit_writer import GroupCommitWriter
+from core.telemetry import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +26,14 @@ class StorageStage(IPipelineStage):
         code_repo: ICodeRepository,
         vector_repo: IVectorRepository,
         status_callback: Optional[Callable[[dict], Awaitable[None]]] = None,
+        writer: Optional[GroupCommitWriter] = None,
     ):
         super().__init__(status_callback)
         # Les dépendances sont maintenant injectées.
         self.code_repo = code_repo
         self.vector_repo = vector_repo
+        # Si fourni, les écritures passent par l'écrivain à commits groupés partagé.
+        self.writer = writer
 
     async def execute(self, context: ExecutionContext, job_id: str) -> ExecutionContext:
         # ... le reste de la méthode execute reste identique ...
@@ -58,6 +63,20 @@ class StorageStage(IPipelineStage):
             "entities": context.entities,
             "relationships": context.relationships,
         }
+        document = {
+            "file_path": context.file_path,
+            "document_content": f"Code container for {context.file_path}",
+            "chunks": context.chunks,
+            "document_metadata": document_metadata,
+            "content_hash": context.content_hash,
+        }
+
+        if self.writer is not None:
+            result = await self.writer.submit(file_data, document)
+            context.ingestion_status = result["vector"]["status"]
+            self._record_metrics(context)
+            return context
+
         await self.code_repo.add_code_structure(file_data)
 
         if self.status_callback:
@@ -70,9 +89,20 @@ class StorageStage(IPipelineStage):
                 }
             )
 
-        document_content = f"Code container for {context.file_path}"
-        await self.vector_repo.save_document_with_chunks(
-            context.file_path, document_content, context.chunks, document_metadata
+        result = await self.vector_repo.save_document_with_chunks(
+            document["file_path"],
+            document["document_content"],
+            document["chunks"],
+            document["document_metadata"],
+            content_hash=document["content_hash"],
         )
+        context.ingestion_status = result["status"]
+        self._record_metrics(context)
 
         return context
+
+    @staticmethod
+    def _record_metrics(context: ExecutionContext) -> None:
+        metrics.increment("ingestion_entities_total", len(context.entities))
+        metrics.increment("ingestion_relationships_total", len(context.relationships))
+        metrics.increment("ingestion_chunks_total", len(context.chunks))
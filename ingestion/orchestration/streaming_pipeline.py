@@ -0,0 +1,147 @@
+# FICHIER: analyzer-engine/ingestion/orchestration/streaming_pipeline.py
+"""
+Exécution en flux des étapes du pipeline.
+
+Chaque étape est servie par son propre groupe de workers ; les groupes sont reliés par des
+files asyncio bornées. Le fichier N+1 est ainsi analysé pendant que le fichier N attend ses
+embeddings et que le fichier N-1 est stocké. Une file pleine suspend l'étape amont
+(contre-pression) : le nombre de fichiers en vol est borné par la somme des tailles de
+file et des workers.
+
+Erreurs :
+- l'échec d'une étape sur un fichier est attaché à ce fichier, qui traverse les étapes
+  suivantes sans y être exécuté puis est rendu à l'appelant ;
+- toute autre interruption (source en erreur, consommateur qui s'arrête, annulation)
+  annule l'ensemble des workers avant de se propager.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+)
+
+from .execution_context import ExecutionContext
+from .stages.base_stage import IPipelineStage, run_stage
+
+logger = logging.getLogger(__name__)
+
+# Marque de fin de flux, transmise une fois par worker de l'étape suivante.
+_END = object()
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+@dataclass
+class PipelineItem:
+    """
+    Fichier en transit. `done` : plus aucune étape à exécuter (ex. : fichier inchangé) ;
+    `start` : indice de la première étape à exécuter (reprise sur point de contrôle).
+    """
+
+    context: ExecutionContext
+    error: Optional[BaseException] = None
+    done: bool = False
+    start: int = 0
+
+
+class StreamingPipeline:
+    """Exécute une suite d'étapes en flux sur une séquence de fichiers."""
+
+    def __init__(
+        self,
+        stages: List[IPipelineStage],
+        workers: Optional[Dict[str, int]] = None,
+        queue_size: int = 8,
+        on_stage_done: Optional[
+            Callable[[str, int, ExecutionContext], Awaitable[None]]
+        ] = None,
+    ):
+        """
+        Args:
+            stages: étapes, dans l'ordre d'exécution.
+            workers: nombre de workers par étape, indexé par nom de classe (défaut : 1).
+            queue_size: capacité de chaque file entre deux étapes.
+            on_stage_done: appelé avec (job_id, indice de l'étape, contexte) après chaque
+                étape réussie ; une erreur y est traitée comme un échec de l'étape.
+        """
+        if queue_size < 1:
+            raise ValueError("queue_size must be positive.")
+        self.stages = stages
+        self.workers = [
+            max(1, (workers or {}).get(stage.__class__.__name__, 1)) for stage in stages
+        ]
+        self.queue_size = queue_size
+        self.on_stage_done = on_stage_done
+
+    async def run(
+        self, items: AsyncIterable[PipelineItem], job_id: str
+    ) -> AsyncIterator[PipelineItem]:
+        """
+        Fait traverser les étapes à chaque élément et les rend dans l'ordre d'achèvement.
+        Fermer le générateur avant la fin arrête proprement tous les workers.
+        """
+        queues = [
+            asyncio.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+
+        async def feed():
+            async for item in items:
+                await queues[0].put(item)
+            for _ in range(self.workers[0]):
+                await queues[0].put(_END)
+
+        async def work(index: int):
+            stage, inbox = self.stages[index], queues[index]
+            while (item := await inbox.get()) is not _END:
+                if item.error is None and not item.done and index >= item.start:
+                    try:
+                        item.context = await run_stage(stage, item.context, job_id)
+                        if self.on_stage_done is not None:
+                            await self.on_stage_done(job_id, index, item.context)
+                    except Exception as e:
+                        logger.error(
+                            f"[{job_id}] {stage.__class__.__name__} failed for "
+                            f"{item.context.file_path}: {e}",
+                            exc_info=True,
+                        )
+                        item.error = e
+                await queues[index + 1].put(item)
+
+        async def stage_group(index: int):
+            await asyncio.gather(*(work(index) for _ in range(self.workers[index])))
+            downstream = self.workers[index + 1] if index + 1 < len(self.stages) else 1
+            for _ in range(downstream):
+                await queues[index + 1].put(_END)
+
+        async def supervise(tasks):
+            # Une tâche en échec (hors erreur par fichier) est signalée au consommateur.
+            try:
+                await asyncio.gather(*tasks)
+            except Exception as e:
+                await queues[-1].put(_Failure(e))
+
+        tasks = [asyncio.create_task(feed(), name="pipeline-feed")] + [
+            asyncio.create_task(stage_group(i), name=f"pipeline-stage-{i}")
+            for i in range(len(self.stages))
+        ]
+        tasks.append(asyncio.create_task(supervise(list(tasks))))
+        try:
+            while (item := await queues[-1].get()) is not _END:
+                if isinstance(item, _Failure):
+                    raise item.error
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
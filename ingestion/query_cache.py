@@ -0,0 +1,198 @@
+# FICHIER: analyzer-engine/ingestion/query_cache.py
+"""
+Cache en processus des embeddings de requêtes.
+
+Le trafic de recherche est très répétitif (tableaux de bord, relances d'agents,
+requêtes identiques de nombreux utilisateurs). Ce module fournit un cache LRU
+borné en taille, avec expiration (TTL), normalisation configurable du texte et
+regroupement (single-flight) des requêtes identiques concurrentes.
+
+Les embeddings sont conservés sous forme de tuples et chaque lecture retourne une
+nouvelle liste : un appelant qui modifie son résultat n'altère ni le cache ni les
+autres appelants.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _normalize_none(text: str) -> str:
+    return text
+
+
+def _normalize_strip(text: str) -> str:
+    return text.strip()
+
+
+def _normalize_whitespace(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _normalize_casefold(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+
+# Stratégies de normalisation disponibles, sélectionnables par nom via la configuration.
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "none": _normalize_none,
+    "strip": _normalize_strip,
+    "whitespace": _normalize_whitespace,
+    "casefold": _normalize_casefold,
+}
+
+
+def get_normalizer(name: str) -> Callable[[str], str]:
+    """Retourne la fonction de normalisation associée à `name`."""
+    try:
+        return NORMALIZERS[name.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown query normalization '{name}'. Expected one of: {sorted(NORMALIZERS)}"
+        )
+
+
+class QueryEmbeddingCache:
+    """
+    Cache LRU borné en taille, avec expiration (TTL), pour les embeddings de requêtes.
+
+    Les requêtes identiques (après normalisation) émises en parallèle sont
+    regroupées sur un unique appel au fournisseur (single-flight).
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 3600.0,
+        normalizer: Callable[[str], str] | str = "whitespace",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: Nombre maximal d'entrées conservées (0 désactive le stockage).
+            ttl_seconds: Durée de vie d'une entrée en secondes (<= 0 : pas d'expiration).
+            normalizer: Fonction de normalisation du texte, ou nom d'une stratégie de `NORMALIZERS`.
+            clock: Horloge monotone, injectable pour les tests.
+        """
+        if max_size < 0:
+            raise ValueError("max_size must be >= 0")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.normalize = (
+            get_normalizer(normalizer) if isinstance(normalizer, str) else normalizer
+        )
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Tuple[float, ...]]]" = (
+            OrderedDict()
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Retourne l'embedding en cache pour `text`, ou None. Met à jour les compteurs."""
+        key = self.normalize(text)
+        embedding = self._lookup(key)
+        if embedding is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return list(embedding)
+
+    def put(self, text: str, embedding: List[float]) -> None:
+        """Insère (ou rafraîchit) une entrée et applique la politique d'éviction LRU."""
+        self._store(self.normalize(text), tuple(embedding))
+
+    async def get_or_compute(
+        self, text: str, compute: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        """
+        Retourne l'embedding en cache ou le calcule via `compute`.
+
+        Si un calcul est déjà en cours pour la même clé normalisée, l'appelant
+        attend ce calcul au lieu d'en lancer un second.
+        """
+        key = self.normalize(text)
+        embedding = self._lookup(key)
+        if embedding is not None:
+            self.hits += 1
+            return list(embedding)
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            self.hits += 1
+            return list(await asyncio.shield(pending))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            embedding = await compute(key)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Évite l'avertissement "exception was never retrieved" sans attente.
+                future.exception()
+            raise
+        else:
+            frozen = tuple(embedding)
+            self._store(key, frozen)
+            future.set_result(frozen)
+            return embedding
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        """Vide le cache sans réinitialiser les compteurs."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les compteurs du cache (hits, misses, taille, taux de succès...)."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, ...]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, embedding = entry
+        if expires_at and self._clock() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return embedding
+
+    def _store(self, key: str, embedding: Tuple[float, ...]) -> None:
+        if self.max_size == 0:
+            return
+        expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds > 0 else 0.0
+        self._entries[key] = (expires_at, embedding)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,7 @@
+# FICHIER: analyzer-engine/ingestion/storage/content_hash.py
+import hashlib
+
+
+def compute_content_hash(content: str) -> str:
+    """Empreinte SHA-256 (hex) d'un contenu texte, utilisée pour détecter les changements."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
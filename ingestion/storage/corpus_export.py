@@ -0,0 +1,145 @@
+# FICHIER: analyzer-engine/ingestion/storage/corpus_export.py
+"""
+Sérialisation en flux de l'export du corpus (documents ou chunks).
+
+Les lignes arrivent par lots depuis un curseur serveur (`PostgresRepository.stream_rows`)
+et chaque lot est converti puis émis immédiatement : la mémoire utilisée est bornée par
+la taille d'un lot, quelle que soit la taille du corpus.
+
+Formats :
+- `ndjson` : un objet JSON par ligne ; l'embedding est encodé en base64 (float32
+  little-endian) dans `embedding_b64`.
+- `arrow` : flux Arrow IPC, un record batch par lot ; l'embedding est une liste de
+  float32. Nécessite la dépendance optionnelle `pyarrow`.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:  # Dépendance optionnelle, requise uniquement pour le format Arrow.
+    pa = None
+
+EXPORT_TABLES = ("documents", "chunks")
+EXPORT_FORMATS = ("ndjson", "arrow")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def validate_export(table: str, fmt: str) -> None:
+    """Valide la table et le format avant d'ouvrir le moindre curseur."""
+    if table not in EXPORT_TABLES:
+        raise ValueError(
+            f"Unsupported export table '{table}'. Expected one of: {EXPORT_TABLES}"
+        )
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported export format '{fmt}'. Expected one of: {EXPORT_FORMATS}"
+        )
+    if fmt == "arrow" and pa is None:
+        raise ValueError("The 'arrow' export format requires the pyarrow package.")
+
+
+def _embedding_bytes(embedding) -> Optional[bytes]:
+    if embedding is None:
+        return None
+    return np.asarray(embedding, dtype="<f4").tobytes()
+
+
+def _json_row(row) -> Dict[str, Any]:
+    data = dict(row)
+    if data.get("metadata") is not None:
+        data["metadata"] = json.loads(data["metadata"])
+    if "embedding" in data:
+        raw = _embedding_bytes(data.pop("embedding"))
+        data["embedding_b64"] = base64.b64encode(raw).decode() if raw else None
+    for key, value in data.items():
+        if isinstance(value, datetime):
+            data[key] = value.isoformat()
+    return data
+
+
+def encode_ndjson(rows: List[Any]) -> bytes:
+    """Encode un lot de lignes en NDJSON."""
+    return b"".join(
+        json.dumps(_json_row(row), ensure_ascii=False).encode() + b"\n" for row in rows
+    )
+
+
+class _ByteSink:
+    """Tampon d'écriture vidé après chaque record batch Arrow."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+def _arrow_batch(rows: List[Any]) -> "pa.RecordBatch":
+    columns: Dict[str, list] = {key: [] for key in rows[0].keys()}
+    for row in rows:
+        for key in columns:
+            columns[key].append(row[key])
+    arrays = {}
+    for key, values in columns.items():
+        if key == "embedding":
+            arrays[key] = pa.array(
+                [
+                    None if v is None else np.asarray(v, dtype=np.float32)
+                    for v in values
+                ],
+                type=pa.list_(pa.float32()),
+            )
+        else:
+            arrays[key] = pa.array(values)
+    return pa.RecordBatch.from_pydict(arrays)
+
+
+async def export_stream(
+    batches: AsyncIterator[List[Any]], fmt: str
+) -> AsyncIterator[bytes]:
+    """
+    Convertit un flux de lots de lignes en flux d'octets au format demandé.
+
+    Args:
+        batches: Lots de lignes (mappings) issus d'un curseur serveur.
+        fmt: `ndjson` ou `arrow`.
+    """
+    if fmt == "ndjson":
+        async for rows in batches:
+            yield encode_ndjson(rows)
+        return
+
+    sink = _ByteSink()
+    writer = None
+    async for rows in batches:
+        batch = _arrow_batch(rows)
+        if writer is None:
+            # Le schéma du flux est celui du premier lot (colonnes issues de la requête d'export).
+            writer = pa.ipc.new_stream(sink, batch.schema)
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,193 @@
+# FICHIER: analyzer-engine/ingestion/storage/graph_archive.py
+"""
+Archive binaire compacte du graphe de code, pour démarrer une réplique sans ré-ingestion.
+
+Format (little-endian) :
+    en-tête  : MAGIC (4 o) | version (u16) | réservé (u16) | taille du corps (u64) | SHA-256 du corps (32 o)
+    corps    : suite de sections `nom (4 o) | taille (u64) | données compressées zlib`
+
+Sections :
+- STRS : dictionnaire des chaînes (noms, chemins, types), longueurs u32 puis UTF-8 concaténé ;
+- ENTS : nombre d'entités (u32), puis colonnes u32 : delta des IDs triés, index du nom,
+         index du chemin, index du type ;
+- SRCS : longueurs u32 puis code source UTF-8 concaténé, dans l'ordre des entités ;
+- EDGE : nombre d'arêtes (u32), puis colonnes u32 : delta des sources triées, cible
+         (delta à l'intérieur d'une même source, valeur brute à chaque nouvelle source),
+         index du type.
+Les colonnes delta sont faites de petits entiers répétitifs, que zlib compresse fortement.
+"""
+
+import hashlib
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+MAGIC = b"AEGA"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHHQ32s")
+_SECTION = struct.Struct("<4sQ")
+_U32 = np.dtype("<u4")
+
+
+@dataclass
+class GraphArchive:
+    """Contenu d'une archive : entités triées par ID et arêtes (IDs d'entités)."""
+
+    entity_ids: np.ndarray
+    names: List[str]
+    file_paths: List[str]
+    types: List[str]
+    source_codes: List[str]
+    edge_sources: np.ndarray
+    edge_targets: np.ndarray
+    edge_types: List[str]
+
+
+def _delta(values: np.ndarray) -> np.ndarray:
+    return np.diff(values, prepend=0)
+
+
+def _strings(values: Sequence[str]) -> bytes:
+    encoded = [value.encode() for value in values]
+    lengths = np.array([len(value) for value in encoded], dtype=_U32)
+    return struct.pack("<I", len(encoded)) + lengths.tobytes() + b"".join(encoded)
+
+
+def _read_strings(data: bytes) -> List[str]:
+    (count,) = struct.unpack_from("<I", data)
+    lengths = np.frombuffer(data, dtype=_U32, count=count, offset=4)
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    offsets = (offsets + 4 + 4 * count).tolist()
+    return [data[start:end].decode() for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _columns(count: int, *columns: np.ndarray) -> bytes:
+    return struct.pack("<I", count) + b"".join(
+        np.asarray(column).astype(_U32).tobytes() for column in columns
+    )
+
+
+def _read_columns(data: bytes, n_columns: int) -> List[np.ndarray]:
+    (count,) = struct.unpack_from("<I", data)
+    return [
+        np.frombuffer(data, dtype=_U32, count=count, offset=4 + 4 * count * i).astype(
+            np.int64
+        )
+        for i in range(n_columns)
+    ]
+
+
+def encode_archive(archive: GraphArchive) -> bytes:
+    """Sérialise une archive (entités triées par ID, arêtes dans un ordre quelconque)."""
+    ids = np.asarray(archive.entity_ids, dtype=np.int64)
+    sources = np.asarray(archive.edge_sources, dtype=np.int64)
+    targets = np.asarray(archive.edge_targets, dtype=np.int64)
+    if ids.size and (ids.min() < 0 or ids.max() > np.iinfo(_U32).max):
+        raise ValueError("Entity ids must fit in an unsigned 32-bit integer.")
+    if ids.size > 1 and np.any(np.diff(ids) <= 0):
+        raise ValueError("Entities must be sorted by strictly increasing id.")
+
+    dictionary: Dict[str, int] = {}
+    for value in (
+        *archive.names,
+        *archive.file_paths,
+        *archive.types,
+        *archive.edge_types,
+    ):
+        dictionary.setdefault(value, len(dictionary))
+
+    def codes(values: Sequence[str]) -> np.ndarray:
+        return np.array([dictionary[value] for value in values], dtype=np.int64)
+
+    order = np.lexsort((targets, sources))
+    sources, targets = sources[order], targets[order]
+    edge_types = codes(archive.edge_types)[order]
+    new_source = np.ones(len(sources), dtype=bool)
+    new_source[1:] = sources[1:] != sources[:-1]
+    target_deltas = np.where(new_source, targets, _delta(targets))
+
+    sections = {
+        b"STRS": _strings(list(dictionary)),
+        b"ENTS": _columns(
+            len(ids),
+            _delta(ids),
+            codes(archive.names),
+            codes(archive.file_paths),
+            codes(archive.types),
+        ),
+        b"SRCS": _strings(archive.source_codes),
+        b"EDGE": _columns(len(sources), _delta(sources), target_deltas, edge_types),
+    }
+    body = b"".join(
+        _SECTION.pack(name, len(compressed)) + compressed
+        for name, compressed in (
+            (name, zlib.compress(data, 6)) for name, data in sections.items()
+        )
+    )
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, 0, len(body), hashlib.sha256(body).digest()
+    )
+    return header + body
+
+
+def decode_archive(data: bytes) -> GraphArchive:
+    """
+    Désérialise et vérifie une archive.
+
+    Raises:
+        ValueError: format, version, taille ou somme de contrôle invalide.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated graph archive header.")
+    magic, version, _, body_size, checksum = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a graph archive (bad magic number).")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported graph archive version {version} (expected {FORMAT_VERSION})."
+        )
+    body = data[_HEADER.size :]
+    if len(body) != body_size:
+        raise ValueError("Truncated graph archive body.")
+    if hashlib.sha256(body).digest() != checksum:
+        raise ValueError("Graph archive checksum mismatch.")
+
+    sections: Dict[bytes, bytes] = {}
+    offset = 0
+    while offset < len(body):
+        name, size = _SECTION.unpack_from(body, offset)
+        offset += _SECTION.size
+        sections[name] = zlib.decompress(body[offset : offset + size])
+        offset += size
+    missing = {b"STRS", b"ENTS", b"SRCS", b"EDGE"} - set(sections)
+    if missing:
+        raise ValueError(f"Graph archive is missing sections {sorted(missing)}.")
+
+    dictionary = _read_strings(sections[b"STRS"])
+    id_deltas, name_codes, path_codes, type_codes = _read_columns(sections[b"ENTS"], 4)
+    source_deltas, target_deltas, edge_type_codes = _read_columns(sections[b"EDGE"], 3)
+
+    sources = np.cumsum(source_deltas)
+    new_source = np.ones(len(sources), dtype=bool)
+    new_source[1:] = sources[1:] != sources[:-1]
+    # Cible = somme des deltas depuis le début du groupe de la source.
+    group_start = np.maximum.accumulate(
+        np.where(new_source, np.arange(len(sources)), 0)
+    )
+    running = np.cumsum(target_deltas)
+    targets = running - np.concatenate(([0], running))[group_start]
+
+    return GraphArchive(
+        entity_ids=np.cumsum(id_deltas),
+        names=[dictionary[code] for code in name_codes],
+        file_paths=[dictionary[code] for code in path_codes],
+        types=[dictionary[code] for code in type_codes],
+        source_codes=_read_strings(sections[b"SRCS"]),
+        edge_sources=sources,
+        edge_targets=targets,
+        edge_types=[dictionary[code] for code in edge_type_codes],
+    )
@@ -0,0 +1,224 @@
+# FICHIER: analyzer-engine/ingestion/storage/graph_snapshot.py
+"""
+Instantané en mémoire du graphe de code au format CSR (compressed sparse row).
+
+Les entités sont indexées par position dans `ids` (IDs SQLite triés) ; les arêtes sont
+conservées sous forme de clés int64 triées (source, cible, type), ce qui rend les mises
+à jour incrémentales ensemblistes (`np.union1d` / `np.setdiff1d`). Les tableaux CSR
+sortants et entrants sont dérivés de ces clés et permettent :
+- des parcours en largeur vectorisés (une opération NumPy par niveau) ;
+- les degrés entrants / sortants ;
+- le PageRank par itération de puissance.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+# Encodage d'une arête : source (30 bits) | cible (31 bits) | type (2 bits).
+_TYPE_BITS = 2
+_TARGET_BITS = 31
+_SOURCE_BITS = 63 - _TARGET_BITS - _TYPE_BITS
+BFS_DIRECTIONS = ("outgoing", "incoming", "both")
+
+
+def encode_edges(sources, targets, type_codes) -> np.ndarray:
+    """
+    Encode des arêtes (IDs d'entités et code de type) en clés int64 triées et uniques.
+
+    Raises:
+        ValueError: si un ID ou un code de type sort de son champ de bits (une clé
+            tronquée désignerait silencieusement une autre arête).
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    type_codes = np.asarray(type_codes, dtype=np.int64)
+    for name, values, bits in (
+        ("source", sources, _SOURCE_BITS),
+        ("target", targets, _TARGET_BITS),
+        ("type code", type_codes, _TYPE_BITS),
+    ):
+        if values.size and (values.min() < 0 or values.max() >= 1 << bits):
+            raise ValueError(
+                f"Edge {name} out of range for snapshot keys: "
+                f"[{values.min()}, {values.max()}] not within [0, {(1 << bits) - 1}]."
+            )
+    keys = (
+        (sources << (_TARGET_BITS + _TYPE_BITS)) | (targets << _TYPE_BITS) | type_codes
+    )
+    return np.unique(keys)
+
+
+def decode_edges(keys: np.ndarray):
+    """Inverse de `encode_edges` : retourne (sources, cibles, codes de type)."""
+    sources = keys >> (_TARGET_BITS + _TYPE_BITS)
+    targets = (keys >> _TYPE_BITS) & ((1 << _TARGET_BITS) - 1)
+    return sources, targets, keys & ((1 << _TYPE_BITS) - 1)
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n: int):
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+@dataclass
+class CSRGraph:
+    """
+    Graphe orienté en CSR. `watermark` est le dernier numéro du journal `graph_changes`
+    intégré : les changements postérieurs sont rejoués par `apply_changes`.
+    """
+
+    ids: np.ndarray
+    edge_keys: np.ndarray
+    watermark: int = 0
+
+    def __post_init__(self):
+        n = len(self.ids)
+        sources, targets, _ = decode_edges(self.edge_keys)
+        # Positions des extrémités dans `ids` ; les arêtes pendantes sont écartées.
+        src = np.searchsorted(self.ids, sources)
+        dst = np.searchsorted(self.ids, targets)
+        valid = (src < n) & (dst < n)
+        valid[valid] = (self.ids[src[valid]] == sources[valid]) & (
+            self.ids[dst[valid]] == targets[valid]
+        )
+        src, dst = src[valid], dst[valid]
+        self.indptr, self.indices = _csr(src, dst, n)
+        self.in_indptr, self.in_indices = _csr(dst, src, n)
+        # Source de chaque arête dans l'ordre CSR sortant (pour le PageRank).
+        self.edge_sources = np.repeat(np.arange(n), np.diff(self.indptr))
+
+    @classmethod
+    def empty(cls) -> "CSRGraph":
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+
+    @property
+    def node_count(self) -> int:
+        return len(self.ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.in_indptr)
+
+    def positions(self, entity_ids: Iterable[int]) -> np.ndarray:
+        """Positions des IDs d'entités présents dans l'instantané (les autres sont ignorés)."""
+        entity_ids = np.asarray(list(entity_ids), dtype=np.int64)
+        pos = np.searchsorted(self.ids, entity_ids)
+        found = pos < len(self.ids)
+        found[found] = self.ids[pos[found]] == entity_ids[found]
+        return pos[found]
+
+    def apply_changes(self, changes: Iterable[tuple]) -> "CSRGraph":
+        """
+        Rejoue les changements du journal `(seq, op, a, b, type_code)` et retourne un
+        nouvel instantané. Pour chaque entité ou arête, seule la dernière opération compte.
+        Opérations : `N+` / `N-` (entité a), `E+` / `E-` (arête a -> b de type type_code).
+        """
+        nodes: Dict[int, bool] = {}
+        edges: Dict[tuple, bool] = {}
+        watermark = self.watermark
+        for seq, op, a, b, type_code in changes:
+            watermark = max(watermark, seq)
+            if op in ("N+", "N-"):
+                nodes[a] = op == "N+"
+            else:
+                edges[(a, b, type_code)] = op == "E+"
+
+        ids = self.ids
+        added = [i for i, present in nodes.items() if present]
+        removed = [i for i, present in nodes.items() if not present]
+        if added:
+            ids = np.union1d(ids, np.asarray(added, dtype=np.int64))
+        if removed:
+            ids = np.setdiff1d(ids, np.asarray(removed, dtype=np.int64))
+
+        keys = self.edge_keys
+        for present in (True, False):
+            batch = [edge for edge, state in edges.items() if state is present]
+            if not batch:
+                continue
+            batch_keys = encode_edges(*zip(*batch))
+            keys = (
+                np.union1d(keys, batch_keys)
+                if present
+                else np.setdiff1d(keys, batch_keys)
+            )
+        return CSRGraph(ids, keys, watermark)
+
+    def bfs(
+        self,
+        seed_ids: Iterable[int],
+        max_depth: Optional[int] = None,
+        direction: str = "outgoing",
+    ) -> np.ndarray:
+        """
+        Parcours en largeur vectorisé depuis les entités `seed_ids`.
+
+        Returns:
+            La profondeur de chaque position (-1 si non atteinte).
+        """
+        if direction not in BFS_DIRECTIONS:
+            raise ValueError(
+                f"Unsupported direction '{direction}'. Expected one of: {BFS_DIRECTIONS}"
+            )
+        adjacency = []
+        if direction in ("outgoing", "both"):
+            adjacency.append((self.indptr, self.indices))
+        if direction in ("incoming", "both"):
+            adjacency.append((self.in_indptr, self.in_indices))
+
+        depth = np.full(self.node_count, -1, dtype=np.int32)
+        frontier = np.unique(self.positions(seed_ids))
+        depth[frontier] = 0
+        level = 0
+        while frontier.size and (max_depth is None or level < max_depth):
+            neighbours = [
+                _gather(indptr, indices, frontier) for indptr, indices in adjacency
+            ]
+            frontier = np.unique(np.concatenate(neighbours))
+            frontier = frontier[depth[frontier] < 0]
+            level += 1
+            depth[frontier] = level
+        return depth
+
+    def pagerank(
+        self, damping: float = 0.85, tol: float = 1e-6, max_iter: int = 100
+    ) -> np.ndarray:
+        """PageRank par itération de puissance ; la masse des nœuds sans arête sortante est redistribuée uniformément."""
+        n = self.node_count
+        if n == 0:
+            return np.empty(0)
+        out_degree = self.out_degree().astype(np.float64)
+        dangling = out_degree == 0
+        weights = 1.0 / out_degree[self.edge_sources]
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = np.bincount(
+                self.indices, weights=rank[self.edge_sources] * weights, minlength=n
+            )
+            new_rank = (1 - damping) / n + damping * (spread + rank[dangling].sum() / n)
+            converged = np.abs(new_rank - rank).sum() < tol
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatène les voisins des lignes `rows` sans boucle Python."""
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return indices[offsets + np.arange(total)]
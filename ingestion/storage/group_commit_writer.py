@@ -0,0 +1,215 @@
+# FICHIER: analyzer-engine/ingestion/storage/group_commit_writer.py
+"""
+Écrivain de stockage à commits groupés.
+
+Les pipelines soumettent une requête d'écriture par fichier ; l'écrivain les
+regroupe en lots bornés en taille et en temps, puis écrit chaque lot avec un
+seul commit par base. Chaque fichier est atomique sur les deux bases et reçoit
+son propre résultat, succès ou échec :
+- la structure du lot est écrite dans une transaction SQLite (un SAVEPOINT par
+  fichier), laissée ouverte ;
+- les documents des fichiers écrits sans erreur sont écrits dans une transaction
+  PostgreSQL (un SAVEPOINT par document en cas d'échec du lot), laissée ouverte ;
+- les fichiers refusés par PostgreSQL sont retirés de la transaction SQLite, qui
+  est validée, puis la transaction PostgreSQL est validée en dernier : un fichier
+  refusé par l'une des bases n'est écrit dans aucune.
+
+L'ordre des commits est délibéré : le document PostgreSQL, dont l'empreinte permet
+d'ignorer un fichier inchangé, n'est jamais validé sans son graphe. Après un arrêt
+brutal entre les deux commits, le graphe est en avance sur le document : le fichier
+est simplement ré-ingéré au prochain passage.
+"""
+
+import asyncio
+import logging
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from core.contracts.repository_contract import ICodeRepository
+from core.contracts.vector_repository_contract import IVectorRepository
+from core.exceptions.base_exceptions import RepositoryError
+from core.telemetry import instrument, metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteRequest:
+    """Requête d'écriture pour un fichier : structure du graphe + document vectoriel."""
+
+    file_data: Dict[str, Any]
+    document: Dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class GroupCommitWriter:
+    """Regroupe les écritures de plusieurs pipelines en commits groupés."""
+
+    def __init__(
+        self,
+        code_repo: ICodeRepository,
+        vector_repo: IVectorRepository,
+        max_batch_size: int = 32,
+        max_delay: float = 0.05,
+    ):
+        """
+        Args:
+            code_repo: Repository du graphe de code.
+            vector_repo: Repository des documents et chunks.
+            max_batch_size: Nombre maximal de fichiers par commit.
+            max_delay: Attente maximale (secondes) pour compléter un lot après
+                l'arrivée de sa première requête.
+        """
+        self.code_repo = code_repo
+        self.vector_repo = vector_repo
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue[Optional[WriteRequest]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Démarre la boucle d'écriture (idempotent)."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run(), name="group-commit-writer")
+            logger.info(
+                f"GroupCommitWriter started (max_batch_size={self.max_batch_size}, "
+                f"max_delay={self.max_delay * 1000:.0f}ms)."
+            )
+
+    async def close(self) -> None:
+        """Écrit les requêtes en attente puis arrête la boucle."""
+        if self.is_running:
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+        logger.info("GroupCommitWriter stopped.")
+
+    async def submit(
+        self, file_data: Dict[str, Any], document: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Soumet l'écriture d'un fichier et attend le commit du lot qui la contient.
+
+        Args:
+            file_data: Argument de `ICodeRepository.add_code_structure`.
+            document: Élément de `IVectorRepository.save_documents_batch`.
+
+        Returns:
+            `{"graph": <résultat SQLite>, "vector": <résultat PostgreSQL>}`.
+
+        Raises:
+            RepositoryError: si l'écriture de ce fichier a échoué (rien n'a été écrit
+                pour lui dans la base concernée).
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(WriteRequest(file_data, document, future))
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = asyncio.get_running_loop().time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    request = (
+                        self._queue.get_nowait()
+                        if timeout <= 0
+                        else await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            try:
+                with instrument("storage.group_commit", **{"files.count": len(batch)}):
+                    await self._flush(batch)
+            except Exception as e:
+                logger.error(
+                    f"Group commit of {len(batch)} files failed: {e}", exc_info=True
+                )
+                for request in batch:
+                    self._fail(request, f"Group commit failed: {e}")
+
+    async def _flush(self, batch: List[WriteRequest]) -> None:
+        vector_results: Dict[int, Dict[str, Any]] = {}
+
+        async with AsyncExitStack() as pending:
+
+            async def save_documents(
+                graph_results: List[Dict[str, Any]],
+            ) -> Dict[int, str]:
+                # Appelé avant le commit SQLite : les fichiers refusés ici y sont annulés.
+                # La transaction PostgreSQL reste ouverte jusqu'à la sortie de `pending`.
+                written = [
+                    i for i, result in enumerate(graph_results) if "error" not in result
+                ]
+                if not written:
+                    return {}
+                results = await pending.enter_async_context(
+                    self.vector_repo.pending_documents_batch(
+                        [batch[i].document for i in written]
+                    )
+                )
+                vector_results.update(zip(written, results))
+                return {
+                    i: result["error"]
+                    for i, result in zip(written, results)
+                    if "error" in result
+                }
+
+            graph_results = await self.code_repo.add_code_structures_batch(
+                [request.file_data for request in batch], confirm=save_documents
+            )
+            orphans = [
+                request.document["file_path"]
+                for i, (request, graph_result) in enumerate(zip(batch, graph_results))
+                if "error" in graph_result
+                and i in vector_results
+                and "error" not in vector_results[i]
+            ]
+            if orphans:
+                # Graphe annulé au rejeu SQLite après l'écriture de son document : le lot
+                # PostgreSQL entier est annulé plutôt que de valider un document orphelin.
+                raise RepositoryError(
+                    f"Graph write failed after vector write for {', '.join(orphans)}"
+                )
+
+        for i, (request, graph_result) in enumerate(zip(batch, graph_results)):
+            path = request.document["file_path"]
+            if i in vector_results and "error" in vector_results[i]:
+                self._fail(
+                    request,
+                    f"Vector write failed for {path}: {vector_results[i]['error']}",
+                )
+            elif "error" in graph_result:
+                self._fail(
+                    request, f"Graph write failed for {path}: {graph_result['error']}"
+                )
+            elif not request.future.done():
+                request.future.set_result(
+                    {"graph": graph_result, "vector": vector_results[i]}
+                )
+        # Taille moyenne des lots = files_total / batches_total.
+        metrics.increment("group_commit_batches_total")
+        metrics.increment("group_commit_files_total", len(batch))
+        logger.info(f"Group commit: {len(batch)} files written in one batch.")
+
+    @staticmethod
+    def _fail(request: WriteRequest, message: str) -> None:
+        # L'appelant a pu être annulé entre-temps : son futur est alors déjà résolu.
+        if not request.future.done():
+            request.future.set_exception(RepositoryError(message))
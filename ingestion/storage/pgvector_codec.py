@@ -0,0 +1,81 @@
+# FICHIER: analyzer-engine/ingestion/storage/pgvector_codec.py
+"""
+Codecs binaires pour les types pgvector (`vector`, `halfvec`).
+
+Format binaire pgvector (send/recv) :
+    int16 dim | int16 unused | dim * float (float32 pour vector, float16 pour halfvec)
+en big-endian. Encoder directement ce format évite de formater chaque embedding
+en texte côté Python puis de le re-parser côté serveur.
+"""
+
+import logging
+import struct
+from typing import Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">HH")
+
+
+def _encode(value: Sequence[float], dtype: str) -> bytes:
+    # Déjà encodé : c'est la forme attendue dans un tableau `vector[]`, où asyncpg
+    # interpréterait un embedding itérable comme une dimension supplémentaire.
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    array = np.asarray(value, dtype=dtype)
+    if array.ndim != 1:
+        raise ValueError(f"Expected a 1-D embedding, got shape {array.shape}")
+    return _HEADER.pack(array.shape[0], 0) + array.tobytes()
+
+
+def _decode(data: bytes, dtype: str) -> np.ndarray:
+    dim, _ = _HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=dtype, count=dim, offset=_HEADER.size).astype(
+        np.float32
+    )
+
+
+def encode_vector(value: Sequence[float]) -> bytes:
+    """Encode une séquence de floats (liste ou tableau NumPy) au format binaire `vector`."""
+    return _encode(value, ">f4")
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Décode le format binaire `vector` en tableau NumPy float32."""
+    return _decode(data, ">f4")
+
+
+def encode_halfvec(value: Sequence[float]) -> bytes:
+    """Encode une séquence de floats au format binaire `halfvec` (float16)."""
+    return _encode(value, ">f2")
+
+
+def decode_halfvec(data: bytes) -> np.ndarray:
+    """Décode le format binaire `halfvec` en tableau NumPy float32."""
+    return _decode(data, ">f2")
+
+
+async def register_vector_codecs(conn, schema: str = "public") -> None:
+    """
+    Enregistre les codecs binaires `vector` et `halfvec` sur une connexion asyncpg.
+    `halfvec` n'existe qu'à partir de pgvector 0.7 : son absence n'est pas bloquante.
+    """
+    await conn.set_type_codec(
+        "vector",
+        schema=schema,
+        encoder=encode_vector,
+        decoder=decode_vector,
+        format="binary",
+    )
+    try:
+        await conn.set_type_codec(
+            "halfvec",
+            schema=schema,
+            encoder=encode_halfvec,
+            decoder=decode_halfvec,
+            format="binary",
+        )
+    except ValueError:
+        logger.debug("Type 'halfvec' not available, skipping its codec.")
@@ -0,0 +1,520 @@
+# FICHIER: analyzer-engine/ingestion/storage/repositories/memory_graph_repository.py
+
+import copy
+import logging
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.contracts.repository_contract import BatchConfirm, ICodeRepository
+from core.exceptions.base_exceptions import RepositoryError
+from core.models.graph_models import (
+    EntityStats,
+    GraphSearchPage,
+    GraphSearchResult,
+    GraphTraversal,
+    TraversalNode,
+)
+from ingestion.storage.graph_archive import GraphArchive
+from ingestion.storage.graph_snapshot import CSRGraph, encode_edges
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    ENTITY_MATCH_MODES,
+    ENTITY_STATS_ORDERS,
+    ENTITY_TYPES,
+    FACT_COLUMNS,
+    RELATIONSHIP_TYPES,
+    SQLiteGraphRepository,
+    _decode_cursor,
+    _encode_cursor,
+    _validate_traversal,
+)
+
+logger = logging.getLogger(__name__)
+
+# Arête indexée depuis l'une de ses extrémités : (autre extrémité, type).
+Edge = Tuple[int, str]
+
+
+class InMemoryCodeRepository(ICodeRepository):
+    """
+    Implémentation du contrat ICodeRepository entièrement en mémoire, sans SQL ni thread
+    aiosqlite : pour les tests, les benchmarks du pipeline et les analyses ponctuelles.
+
+    Le comportement observable est celui de `SQLiteGraphRepository` (remplacement par
+    fichier, contraintes de type, tri et pagination des recherches, parcours, métriques),
+    vérifié par la suite de conformité commune aux deux implémentations. Le graphe peut
+    être persisté à la fin par `flush_to`.
+
+    Index :
+    - `_entities` : ID -> entité ; `_files` : chemin -> nom -> ID ; `_names` : nom -> IDs ;
+    - `_out` / `_in` : listes d'adjacence (dict ordonnés, dans l'ordre d'insertion) ;
+    - métriques : instantané CSR (tableaux NumPy) construit à la demande.
+    """
+
+    def __init__(self):
+        self._entities: Dict[int, Dict[str, Any]] = {}
+        self._files: Dict[str, Dict[str, int]] = {}
+        self._names: Dict[str, Dict[int, None]] = {}
+        self._out: Dict[int, Dict[Edge, None]] = {}
+        self._in: Dict[int, Dict[Edge, None]] = {}
+        self._stats: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+
+    async def initialize(self) -> None:
+        """Rien à ouvrir : le graphe vit dans l'instance."""
+        logger.debug("InMemoryCodeRepository ready.")
+
+    async def close(self) -> None:
+        """Rien à fermer ; le graphe reste disponible (voir `flush_to`)."""
+        logger.debug("InMemoryCodeRepository closed.")
+
+    async def clean_db(self) -> None:
+        """Supprime toutes les entités, relations et métriques."""
+        self.__init__()
+
+    # ------------------------------------------------------------------
+    # Écriture
+    # ------------------------------------------------------------------
+
+    async def add_code_structure(self, file_data: Dict[str, Any]) -> Dict[str, int]:
+        """Remplace les entités et relations d'un fichier par celles reçues."""
+        try:
+            return self._replace_file(file_data)
+        except Exception as e:
+            logger.error(
+                f"Failed to add code structure for {file_data.get('file_path')}: {e}",
+                exc_info=True,
+            )
+            raise RepositoryError(f"Failed to add code structure: {e}")
+
+    async def add_code_structures_batch(
+        self,
+        files_data: List[Dict[str, Any]],
+        confirm: Optional[BatchConfirm] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Remplace la structure de plusieurs fichiers. Un fichier en échec est écarté sans
+        écriture partielle (sa structure est validée avant toute modification).
+
+        Avec `confirm`, l'état est copié avant le lot et restauré si des fichiers sont
+        rejetés (ou si `confirm` lève), puis le lot est rejoué sans eux.
+        """
+        snapshot = copy.deepcopy(vars(self)) if confirm is not None else None
+        results = [self._replace_or_fail(file_data) for file_data in files_data]
+        if confirm is None:
+            return results
+        try:
+            rejected = await confirm(results)
+        except Exception:
+            self.__dict__.update(snapshot)
+            raise
+        if rejected:
+            self.__dict__.update(snapshot)
+            for i, file_data in enumerate(files_data):
+                if i in rejected:
+                    results[i] = self._failed_result(file_data, rejected[i])
+                elif "error" not in results[i]:
+                    results[i] = self._replace_or_fail(file_data)
+        return results
+
+    def _replace_or_fail(self, file_data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            stats = self._replace_file(file_data)
+            return {"file_path": file_data.get("file_path"), **stats}
+        except Exception as e:
+            logger.error(
+                f"Failed to add code structure for {file_data.get('file_path')}: {e}"
+            )
+            return self._failed_result(file_data, str(e))
+
+    @staticmethod
+    def _failed_result(file_data: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            "file_path": file_data.get("file_path"),
+            "entities_added": 0,
+            "relations_added": 0,
+            "error": error,
+        }
+
+    def _replace_file(self, file_data: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Même sémantique que `SQLiteGraphRepository._insert_code_structure` : la première
+        occurrence d'un nom l'emporte, les entités et relations de type inconnu sont
+        ignorées, et seules les relations entre entités du fichier sont retenues.
+        """
+        file_path = file_data.get("file_path")
+        if not file_path:
+            logger.warning("No file_path provided in file_data. Skipping.")
+            return {"entities_added": 0, "relations_added": 0}
+
+        # Validation complète avant toute modification (atomicité par fichier).
+        incoming: Dict[str, Tuple[str, Any]] = {}
+        for entity in file_data.get("entities", []):
+            incoming.setdefault(
+                entity["name"], (entity["type"], entity.get("source_code", ""))
+            )
+        relation_rows = []
+        for rel in file_data.get("relationships", []):
+            if rel["source"] in incoming and rel["target"] in incoming:
+                relation_rows.append((rel["source"], rel["target"], rel["type"]))
+            else:
+                logger.warning(f"Could not find IDs for relationship: {rel}. Skipping.")
+
+        current = self._files.setdefault(file_path, {})
+        removed = [name for name in current if name not in incoming]
+        for name in removed:
+            self._delete_entity(current[name])
+
+        added = updated = 0
+        for name, (entity_type, source_code) in incoming.items():
+            if entity_type not in ENTITY_TYPES:
+                continue
+            entity_id = current.get(name)
+            if entity_id is None:
+                self._create_entity(name, entity_type, file_path, source_code)
+                added += 1
+                continue
+            entity = self._entities[entity_id]
+            if (entity["type"], entity["source_code"]) != (entity_type, source_code):
+                entity["type"], entity["source_code"] = entity_type, source_code
+                updated += 1
+
+        incoming_edges: Dict[Tuple[int, int, str], None] = {}
+        for source, target, rel_type in relation_rows:
+            if source in current and target in current:
+                incoming_edges[(current[source], current[target], rel_type)] = None
+
+        relations_removed = 0
+        for entity_id in current.values():
+            for target, rel_type in list(self._out[entity_id]):
+                if (entity_id, target, rel_type) not in incoming_edges:
+                    self._remove_edge(entity_id, target, rel_type)
+                    relations_removed += 1
+        relations_added = 0
+        for source, target, rel_type in incoming_edges:
+            if (
+                rel_type in RELATIONSHIP_TYPES
+                and (target, rel_type) not in self._out[source]
+            ):
+                self._out[source][(target, rel_type)] = None
+                self._in[target][(source, rel_type)] = None
+                relations_added += 1
+        if not current:
+            del self._files[file_path]
+
+        logger.info(
+            f"Replaced structure of {file_path}: +{added} ~{updated} -{len(removed)} "
+            f"entities, +{relations_added} -{relations_removed} relationships."
+        )
+        return {
+            "entities_added": added,
+            "entities_updated": updated,
+            "entities_removed": len(removed),
+            "relations_added": relations_added,
+            "relations_removed": relations_removed,
+        }
+
+    def _create_entity(
+        self, name: str, entity_type: str, file_path: str, source_code: Any
+    ) -> int:
+        entity_id = self._next_id
+        self._next_id += 1
+        self._entities[entity_id] = {
+            "id": entity_id,
+            "name": name,
+            "type": entity_type,
+            "file_path": file_path,
+            "source_code": source_code,
+        }
+        self._files.setdefault(file_path, {})[name] = entity_id
+        self._names.setdefault(name, {})[entity_id] = None
+        self._out[entity_id] = {}
+        self._in[entity_id] = {}
+        return entity_id
+
+    def _delete_entity(self, entity_id: int) -> None:
+        """Supprime une entité, ses relations (entrantes et sortantes) et ses métriques."""
+        entity = self._entities.pop(entity_id)
+        del self._files[entity["file_path"]][entity["name"]]
+        ids = self._names[entity["name"]]
+        del ids[entity_id]
+        if not ids:
+            del self._names[entity["name"]]
+        for target, rel_type in self._out.pop(entity_id):
+            self._in[target].pop((entity_id, rel_type), None)
+        for source, rel_type in self._in.pop(entity_id):
+            self._out[source].pop((entity_id, rel_type), None)
+        self._stats.pop(entity_id, None)
+
+    def _remove_edge(self, source: int, target: int, rel_type: str) -> None:
+        del self._out[source][(target, rel_type)]
+        del self._in[target][(source, rel_type)]
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    async def find_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """Relations directes des entités dont le nom contient `entity_name`."""
+        page = await self.search_entity_relationships(entity_name)
+        return [fact.model_dump() for fact in page.items]
+
+    async def search_entity_relationships(
+        self,
+        entity_name: str,
+        match_mode: str = "substring",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> GraphSearchPage:
+        """
+        Relations directes des entités correspondant à `entity_name`, dédupliquées et
+        triées sur (source, type, cible), paginées par `cursor`.
+
+        Raises:
+            ValueError: mode inconnu ou curseur invalide.
+        """
+        if match_mode not in ENTITY_MATCH_MODES:
+            raise ValueError(
+                f"Unsupported match mode '{match_mode}'. Expected one of: {ENTITY_MATCH_MODES}"
+            )
+        after = tuple(_decode_cursor(cursor)) if cursor is not None else None
+
+        # Comme LIKE et l'index trigramme : prefix et substring sont insensibles à la casse.
+        term = entity_name.lower()
+        if match_mode == "exact":
+            names = [entity_name] if entity_name in self._names else []
+        elif match_mode == "prefix":
+            names = [name for name in self._names if name.lower().startswith(term)]
+        else:
+            names = [name for name in self._names if term in name.lower()]
+
+        facts = set()
+        for name in names:
+            for entity_id in self._names[name]:
+                for target, rel_type in self._out[entity_id]:
+                    facts.add(self._fact(entity_id, rel_type, target))
+                for source, rel_type in self._in[entity_id]:
+                    facts.add(self._fact(source, rel_type, entity_id))
+        rows = sorted(fact for fact in facts if after is None or fact > after)
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(dict(zip(FACT_COLUMNS, rows[-1])))
+        if not rows:
+            logger.info(f"No relationships found for entity matching '{entity_name}'.")
+
+        items = [
+            GraphSearchResult(
+                source=f"{source_name} ({source_type})",
+                relationship=rel_type,
+                target=f"{target_name} ({target_type})",
+            )
+            for source_name, source_type, rel_type, target_name, target_type in rows
+        ]
+        return GraphSearchPage(items=items, next_cursor=next_cursor)
+
+    def _fact(self, source: int, rel_type: str, target: int) -> Tuple[str, ...]:
+        s, t = self._entities[source], self._entities[target]
+        return (s["name"], s["type"], rel_type, t["name"], t["type"])
+
+    async def traverse(
+        self,
+        entity_name: str,
+        direction: str = "outgoing",
+        rel_types: Optional[List[str]] = None,
+        max_depth: int = 3,
+        limit: int = 1000,
+        mode: str = "frontier",
+        file_path: Optional[str] = None,
+    ) -> GraphTraversal:
+        """
+        Parcours multi-sauts depuis les entités nommées `entity_name` (restreintes à
+        `file_path` si fourni) ; paramètres et résultat identiques à
+        `SQLiteGraphRepository.traverse`.
+
+        Raises:
+            ValueError: paramètre hors des valeurs admises.
+        """
+        _validate_traversal(direction, mode, rel_types, max_depth, limit)
+        roots = [
+            self._node(entity_id, 0)
+            for entity_id in sorted(self._names.get(entity_name, {}))
+            if file_path is None or self._entities[entity_id]["file_path"] == file_path
+        ]
+        if not roots:
+            return GraphTraversal(nodes=[])
+        types = set(rel_types) if rel_types else None
+
+        if mode == "frontier":
+            depths = {root.id: 0 for root in roots}
+            frontier = list(depths)
+            reached = 0
+            # Un niveau est toujours exploré en entier : le tri (profondeur, nom) reste exact.
+            for depth in range(1, max_depth + 1):
+                next_frontier = []
+                for entity_id in frontier:
+                    for neighbour in self._neighbours(entity_id, direction, types):
+                        if neighbour not in depths:
+                            depths[neighbour] = depth
+                            next_frontier.append(neighbour)
+                reached += len(next_frontier)
+                frontier = next_frontier
+                if not frontier or reached > limit:
+                    break
+            nodes = sorted(
+                (
+                    self._node(entity_id, depth)
+                    for entity_id, depth in depths.items()
+                    if depth > 0
+                ),
+                key=lambda node: (node.depth, node.name, node.id),
+            )
+            return GraphTraversal(
+                nodes=roots + nodes[:limit], truncated=len(nodes) > limit
+            )
+
+        # paths : chemins simples en largeur d'abord, bornés comme le CTE (racines comprises).
+        row_limit = limit + len(roots) + 1
+        rows = len(roots)
+        paths: List[List[int]] = []
+        queue = deque([root.id] for root in roots)
+        while queue and rows < row_limit:
+            path = queue.popleft()
+            if len(path) > max_depth:
+                continue
+            for neighbour in self._neighbours(path[-1], direction, types):
+                if rows >= row_limit:
+                    break
+                if neighbour in path:
+                    continue
+                paths.append(path + [neighbour])
+                queue.append(paths[-1])
+                rows += 1
+        truncated = len(paths) > limit
+        paths = paths[:limit]
+
+        depths = {root.id: 0 for root in roots}
+        for path in paths:
+            for depth, entity_id in enumerate(path):
+                depths[entity_id] = min(depth, depths.get(entity_id, depth))
+        nodes = sorted(
+            (self._node(entity_id, depth) for entity_id, depth in depths.items()),
+            key=lambda node: (node.depth, node.name, node.id),
+        )
+        return GraphTraversal(nodes=nodes, paths=paths, truncated=truncated)
+
+    def _neighbours(
+        self, entity_id: int, direction: str, types: Optional[set]
+    ) -> Iterator[int]:
+        """Voisins d'une entité dans le sens demandé, une fois par arête suivie."""
+        adjacency = []
+        if direction in ("outgoing", "both"):
+            adjacency.append(self._out[entity_id])
+        if direction in ("incoming", "both"):
+            adjacency.append(self._in[entity_id])
+        for edges in adjacency:
+            for neighbour, rel_type in edges:
+                if types is None or rel_type in types:
+                    yield neighbour
+
+    def _node(self, entity_id: int, depth: int) -> TraversalNode:
+        entity = self._entities[entity_id]
+        return TraversalNode(
+            id=entity_id,
+            name=entity["name"],
+            type=entity["type"],
+            file_path=entity["file_path"],
+            depth=depth,
+        )
+
+    # ------------------------------------------------------------------
+    # Métriques et persistance
+    # ------------------------------------------------------------------
+
+    def build_graph_snapshot(self) -> CSRGraph:
+        """Instantané CSR du graphe courant (types codés selon RELATIONSHIP_TYPES)."""
+        codes = {name: code for code, name in enumerate(RELATIONSHIP_TYPES)}
+        edges = np.array(
+            [
+                (source, target, codes[rel_type])
+                for source, targets in self._out.items()
+                for target, rel_type in targets
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        return CSRGraph(
+            np.array(sorted(self._entities), dtype=np.int64),
+            encode_edges(edges[:, 0], edges[:, 1], edges[:, 2]),
+        )
+
+    async def compute_entity_stats(self, damping: float = 0.85) -> Dict[str, int]:
+        """Calcule les degrés et le PageRank de toutes les entités sur un instantané CSR."""
+        snapshot = self.build_graph_snapshot()
+        self._stats = {
+            entity_id: {
+                "in_degree": in_degree,
+                "out_degree": out_degree,
+                "pagerank": rank,
+            }
+            for entity_id, in_degree, out_degree, rank in zip(
+                snapshot.ids.tolist(),
+                snapshot.in_degree().tolist(),
+                snapshot.out_degree().tolist(),
+                snapshot.pagerank(damping).tolist(),
+            )
+        }
+        return {"entities": snapshot.node_count, "relationships": snapshot.edge_count}
+
+    async def get_entity_stats(
+        self, order_by: str = "pagerank", limit: int = 50
+    ) -> List[EntityStats]:
+        """Entités les plus centrales selon `order_by`, d'après le dernier calcul."""
+        if order_by not in ENTITY_STATS_ORDERS:
+            raise ValueError(
+                f"Unsupported order '{order_by}'. Expected one of: {ENTITY_STATS_ORDERS}"
+            )
+        ranked = sorted(
+            self._stats.items(), key=lambda item: (-item[1][order_by], item[0])
+        )[:limit]
+        return [
+            EntityStats(
+                **{
+                    key: self._entities[entity_id][key]
+                    for key in ("id", "name", "type", "file_path")
+                },
+                **stats,
+            )
+            for entity_id, stats in ranked
+        ]
+
+    def to_archive(self) -> GraphArchive:
+        """Contenu du graphe au format `GraphArchive` (entités triées par ID)."""
+        entities = [self._entities[entity_id] for entity_id in sorted(self._entities)]
+        edges = [
+            (source, target, rel_type)
+            for source, targets in self._out.items()
+            for target, rel_type in targets
+        ]
+        return GraphArchive(
+            entity_ids=np.array([e["id"] for e in entities], dtype=np.int64),
+            names=[e["name"] for e in entities],
+            file_paths=[e["file_path"] for e in entities],
+            types=[e["type"] for e in entities],
+            source_codes=[e["source_code"] or "" for e in entities],
+            edge_sources=np.array([edge[0] for edge in edges], dtype=np.int64),
+            edge_targets=np.array([edge[1] for edge in edges], dtype=np.int64),
+            edge_types=[edge[2] for edge in edges],
+        )
+
+    async def flush_to(
+        self, target: SQLiteGraphRepository, replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        Persiste le graphe dans une base SQLite en un seul chargement en masse.
+
+        Raises:
+            ValueError: base cible non vide sans `replace=True`.
+        """
+        return await target.load_graph(self.to_archive(), replace=replace)
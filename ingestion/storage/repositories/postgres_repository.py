@@ -1,8 +1,11 @@
 # FICHIER: analyzer-engine/ingestion/storage/repositories/postgres_repository.py (MODIFIÉ)
+import base64
 import json
 import logging
 import asyncio  # <-- AJOUTER CET IMPORT
-from typing import List, Dict, Any, Optional
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Any, Mapping, Optional, Sequence
 from contextlib import asynccontextmanager
 
 import asyncpg
@@ -10,18 +13,178 @@ from asyncpg.pool import Pool
 from dotenv import load_dotenv
 
 from core.contracts.vector_repository_contract import IVectorRepository
-from core.models.db import ChunkResult, DocumentMetadata
+from core.models.db import ChunkResult, DocumentMetadata, DocumentPage, SearchFilters
 from core.exceptions.base_exceptions import RepositoryError
+from core.telemetry import traced
+from ingestion.storage.content_hash import compute_content_hash
+from ingestion.storage.pgvector_codec import encode_vector, register_vector_codecs
+from ingestion.storage.vector_index import (
+    COMPACT_INDEXES,
+    HNSW_DEFAULT_EF_SEARCH,
+    ITERATIVE_SCAN_MODES,
+    VECTOR_INDEX_NAME,
+    apply_search_params,
+    compact_index_sql,
+    compute_index_params,
+    create_index_sql,
+    validate_index_method,
+)
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Modes supportés par `match_chunks` (voir sql/core/01_functions.sql).
+# "halfvec" et "binary" effectuent une présélection sur une représentation compacte
+# (index optionnels, voir `set_compact_indexes`) suivie d'un re-scoring cosinus exact ;
+# sans index compact valide, `match_chunks` se replie sur la recherche exacte.
+SEARCH_MODES = ("exact", "halfvec", "binary")
+
+# Fusion des scores de `hybrid_search` : mélange linéaire normalisé ou Reciprocal Rank Fusion.
+FUSION_METHODS = ("linear", "rrf")
+
+# Colonnes alimentées par le COPY binaire des chunks (ordre des tuples de `_chunk_records`).
+CHUNK_COPY_COLUMNS = [
+    "document_id",
+    "content",
+    "embedding",
+    "chunk_index",
+    "metadata",
+    "token_count",
+    "content_hash",
+]
+CHUNK_HASH_POSITION = CHUNK_COPY_COLUMNS.index("content_hash")
+CHUNK_TOKENS_POSITION = CHUNK_COPY_COLUMNS.index("token_count")
+
+# Requêtes des chemins chauds, partagées avec le préchauffage des connexions du pool.
+MATCH_CHUNKS_QUERY = (
+    "SELECT * FROM match_chunks($1::vector, $2, $3, $4, $5::text[], $6, $7)"
+)
+HYBRID_SEARCH_QUERY = """
+    SELECT * FROM hybrid_search(
+        $1::vector, $2, $3, $4, $5, $6, $7, $8,
+        filter_entity_types => $9::text[], filter_path_pattern => $10, filter_entity_name => $11
+    )
+"""
+INSERT_DOCUMENTS_QUERY = """
+    INSERT INTO documents (id, title, source, content, metadata, content_hash, chunk_count, total_tokens)
+    SELECT * FROM unnest(
+        $1::uuid[], $2::text[], $3::text[], $4::text[], $5::jsonb[], $6::text[], $7::int[], $8::bigint[]
+    )
+"""
+# Plusieurs requêtes en un aller-retour : une exécution latérale de match_chunks par embedding.
+MATCH_CHUNKS_MANY_QUERY = """
+    SELECT q.query_index, m.*
+    FROM unnest($1::vector[]) WITH ORDINALITY AS q(embedding, query_index)
+    CROSS JOIN LATERAL match_chunks(q.embedding, $2, $3, $4, $5::text[], $6, $7) m
+    ORDER BY q.query_index, m.similarity DESC
+"""
+DOCUMENT_LIST_COLUMNS = "id::text, title, source, metadata, created_at, updated_at, chunk_count, total_tokens"
+# Requêtes d'export intégral, lues par curseur serveur (voir `stream_rows`).
+EXPORT_QUERIES = {
+    "documents": (
+        "SELECT id::text, title, source, content, metadata, content_hash, "
+        "chunk_count, total_tokens, created_at, updated_at "
+        "FROM documents ORDER BY created_at, id"
+    ),
+    "chunks": (
+        "SELECT id::text, document_id::text, chunk_index, content, metadata, "
+        "token_count, content_hash, embedding "
+        "FROM chunks ORDER BY document_id, chunk_index"
+    ),
+}
+
+
+def _encode_cursor(created_at: datetime, document_id: str) -> str:
+    payload = json.dumps([created_at.isoformat(), document_id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    try:
+        created_at, document_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), uuid.UUID(document_id)
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+
+WARMUP_QUERIES = (
+    MATCH_CHUNKS_QUERY,
+    MATCH_CHUNKS_MANY_QUERY,
+    HYBRID_SEARCH_QUERY,
+    INSERT_DOCUMENTS_QUERY,
+)
+
 
 class PostgresRepository(IVectorRepository):
-    def __init__(self, pool: Pool):
+    def __init__(
+        self,
+        pool: Pool,
+        search_mode: str = "exact",
+        rescore_factor: int = 4,
+        index_method: str = "hnsw",
+        ef_search: Optional[int] = None,
+        ivfflat_probes: Optional[int] = None,
+        fusion: str = "linear",
+        text_match_count: Optional[int] = None,
+        iterative_scan: str = "relaxed_order",
+    ):
         self._pool = pool
+        self.search_mode = self._validate_search_mode(search_mode)
+        self.rescore_factor = max(1, rescore_factor)
+        self.index_method = validate_index_method(index_method)
+        # Valeurs par défaut des réglages de requête ; None = valeur du serveur.
+        self.ef_search = ef_search
+        self.ivfflat_probes = ivfflat_probes
+        self.fusion = self._validate_fusion(fusion)
+        # Candidats de la branche texte ; None = limit * 2 (défaut SQL).
+        self.text_match_count = text_match_count
+        if iterative_scan not in ITERATIVE_SCAN_MODES:
+            raise ValueError(
+                f"Unsupported iterative scan '{iterative_scan}'. Expected one of: {ITERATIVE_SCAN_MODES}"
+            )
+        # Appliqué aux seules recherches filtrées ("off" pour pgvector < 0.8).
+        self.iterative_scan = iterative_scan
         logger.info("PostgresRepository instance created with provided pool.")
 
+    @staticmethod
+    def _validate_search_mode(search_mode: str) -> str:
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(
+                f"Unsupported search mode '{search_mode}'. Expected one of: {SEARCH_MODES}"
+            )
+        return search_mode
+
+    @staticmethod
+    def _validate_fusion(fusion: str) -> str:
+        if fusion not in FUSION_METHODS:
+            raise ValueError(
+                f"Unsupported fusion '{fusion}'. Expected one of: {FUSION_METHODS}"
+            )
+        return fusion
+
+    @staticmethod
+    async def init_connection(conn) -> None:
+        """
+        Hook `init` du pool asyncpg, exécuté une fois par connexion physique.
+
+        Enregistre les codecs binaires pgvector (les embeddings transitent en float32
+        et sont décodés en tableaux NumPy) puis prépare les requêtes des chemins chauds :
+        l'introspection des types de leurs paramètres et résultats, mise en cache par la
+        connexion, n'est donc pas payée par la première requête utilisateur.
+        """
+        await register_vector_codecs(conn)
+        try:
+            for query in WARMUP_QUERIES:
+                await conn.prepare(query)
+        except Exception as e:
+            # Le préchauffage est une optimisation : un schéma absent ne doit pas bloquer le pool.
+            logger.warning(f"Statement warm-up skipped: {e}")
+
+    def _resolve_search_mode(self, search_mode: Optional[str], limit: int):
+        """Retourne le mode effectif et le nombre de candidats à re-scorer."""
+        mode = self._validate_search_mode(search_mode or self.search_mode)
+        return mode, limit * self.rescore_factor
+
     async def initialize(self) -> None:
         if self._pool is not None and not self._pool._closed:
             return
@@ -33,7 +196,11 @@ class PostgresRepository(IVectorRepository):
         for attempt in range(max_retries):
             try:
                 self._pool = await asyncpg.create_pool(
-                    self.database_url, min_size=2, max_size=5, command_timeout=30
+                    self.database_url,
+                    min_size=2,
+                    max_size=5,
+                    command_timeout=30,
+                    init=self.init_connection,
                 )
                 logger.info(f"PostgreSQL pool initialized on attempt {attempt + 1}")
                 return  # Succès, on sort de la méthode
@@ -61,51 +228,229 @@ class PostgresRepository(IVectorRepository):
         async with self._pool.acquire() as connection:
             yield connection
 
+    @asynccontextmanager
+    async def _search_transaction(
+        self,
+        candidates: int,
+        ef_search: Optional[int],
+        probes: Optional[int],
+        filtered: bool = False,
+    ):
+        """
+        Connexion en transaction avec `hnsw.ef_search` / `ivfflat.probes` appliqués
+        localement. Un parcours HNSW ne renvoie jamais plus de `ef_search` lignes :
+        la valeur est donc relevée au nombre de candidats demandés à l'index.
+        Une recherche filtrée active en plus le parcours itératif et un plan
+        spécifique aux valeurs des filtres.
+        """
+        ef_search = ef_search or self.ef_search
+        if ef_search is not None or candidates > HNSW_DEFAULT_EF_SEARCH:
+            ef_search = max(ef_search or HNSW_DEFAULT_EF_SEARCH, candidates)
+        async with self._get_connection() as conn:
+            async with conn.transaction():
+                await apply_search_params(
+                    conn,
+                    ef_search=ef_search,
+                    probes=probes or self.ivfflat_probes,
+                    iterative_scan=(
+                        self.iterative_scan
+                        if filtered and self.iterative_scan != "off"
+                        else None
+                    ),
+                    custom_plan=filtered,
+                )
+                yield conn
+
+    @traced("postgres.vector_search")
     async def vector_search(
-        self, embedding: List[float], limit: int
+        self,
+        embedding: List[float],
+        limit: int,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        filters: Optional[SearchFilters] = None,
     ) -> List[ChunkResult]:
-        async with self._get_connection() as conn:
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
+        mode, rescore_count = self._resolve_search_mode(search_mode, limit)
+        candidates = limit if mode == "exact" else rescore_count
+        filtered = filters is not None and not filters.is_empty()
+        async with self._search_transaction(
+            candidates, ef_search, probes, filtered
+        ) as conn:
+            rows = await conn.fetch(
+                MATCH_CHUNKS_QUERY,
+                embedding,
+                limit,
+                mode,
+                rescore_count,
+                *self._filter_args(filters),
+            )
+        return [self._chunk_result(row, "similarity") for row in rows]
+
+    @traced("postgres.vector_search_many")
+    async def vector_search_many(
+        self,
+        embeddings: Sequence[Sequence[float]],
+        limit: int,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> List[List[ChunkResult]]:
+        """
+        Exécute plusieurs recherches vectorielles en une seule requête (un aller-retour,
+        une connexion) : match_chunks est appelé latéralement pour chaque embedding.
+
+        Args:
+            embeddings: Matrice des embeddings de requête (liste de vecteurs ou
+                tableau NumPy 2-D), une ligne par requête.
+
+        Returns:
+            Une liste de résultats par requête, dans l'ordre des embeddings.
+        """
+        # Pré-encodés : asyncpg traiterait chaque vecteur itérable comme une sous-dimension de vector[].
+        embeddings = [encode_vector(embedding) for embedding in embeddings]
+        if not embeddings:
+            return []
+        mode, rescore_count = self._resolve_search_mode(search_mode, limit)
+        candidates = limit if mode == "exact" else rescore_count
+        filtered = filters is not None and not filters.is_empty()
+        async with self._search_transaction(
+            candidates, ef_search, probes, filtered
+        ) as conn:
             rows = await conn.fetch(
-                "SELECT * FROM match_chunks($1::vector, $2)", embedding_str, limit
+                MATCH_CHUNKS_MANY_QUERY,
+                embeddings,
+                limit,
+                mode,
+                rescore_count,
+                *self._filter_args(filters),
             )
-            return [
-                ChunkResult(
-                    chunk_id=row["chunk_id"],
-                    document_id=row["document_id"],
-                    content=row["content"],
-                    score=row["similarity"],
-                    metadata=json.loads(row["metadata"]),
-                    document_title=row["document_title"],
-                    document_source=row["document_source"],
-                )
-                for row in rows
-            ]
+        results: List[List[ChunkResult]] = [[] for _ in embeddings]
+        for row in rows:
+            results[row["query_index"] - 1].append(
+                self._chunk_result(row, "similarity")
+            )
+        return results
 
+    @staticmethod
+    def _chunk_result(row, score_column: str) -> ChunkResult:
+        return ChunkResult(
+            chunk_id=str(row["chunk_id"]),
+            document_id=str(row["document_id"]),
+            content=row["content"],
+            score=row[score_column],
+            metadata=json.loads(row["metadata"]),
+            document_title=row["document_title"],
+            document_source=row["document_source"],
+        )
+
+    @traced("postgres.hybrid_search")
     async def hybrid_search(
-        self, embedding: List[float], query_text: str, limit: int, text_weight: float
+        self,
+        embedding: List[float],
+        query_text: str,
+        limit: int,
+        text_weight: float,
+        search_mode: Optional[str] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        fusion: Optional[str] = None,
+        filters: Optional[SearchFilters] = None,
     ) -> List[ChunkResult]:
-        async with self._get_connection() as conn:
-            embedding_str = "[" + ",".join(map(str, embedding)) + "]"
+        # La branche vectorielle de hybrid_search récupère limit * 2 candidats.
+        mode, rescore_count = self._resolve_search_mode(search_mode, limit * 2)
+        fusion = self._validate_fusion(fusion or self.fusion)
+        candidates = limit * 2 if mode == "exact" else rescore_count
+        filtered = filters is not None and not filters.is_empty()
+        async with self._search_transaction(
+            candidates, ef_search, probes, filtered
+        ) as conn:
             rows = await conn.fetch(
-                "SELECT * FROM hybrid_search($1::vector, $2, $3, $4)",
-                embedding_str,
+                HYBRID_SEARCH_QUERY,
+                embedding,
                 query_text,
                 limit,
                 text_weight,
+                mode,
+                rescore_count,
+                fusion,
+                self.text_match_count,
+                *self._filter_args(filters),
             )
-            return [
-                ChunkResult(
-                    chunk_id=row["chunk_id"],
-                    document_id=row["document_id"],
-                    content=row["content"],
-                    score=row["combined_score"],
-                    metadata=json.loads(row["metadata"]),
-                    document_title=row["document_title"],
-                    document_source=row["document_source"],
-                )
-                for row in rows
-            ]
+        return [self._chunk_result(row, "combined_score") for row in rows]
+
+    @staticmethod
+    def _filter_args(filters: Optional[SearchFilters]):
+        """Paramètres de filtre de match_chunks / hybrid_search (None = inactif)."""
+        if filters is None:
+            return None, None, None
+        return filters.entity_types or None, filters.path_pattern(), filters.entity_name
+
+    async def rebuild_vector_index(
+        self, method: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Reconstruit l'index ANN des chunks avec des paramètres dérivés du corpus actuel.
+        Le nouvel index est construit en CONCURRENTLY (les écritures ne sont pas bloquées)
+        sous un nom temporaire, puis substitué à l'ancien dans une courte transaction.
+        """
+        method = validate_index_method(method or self.index_method)
+        temp_name = f"{VECTOR_INDEX_NAME}_rebuild"
+        async with self._get_connection() as conn:
+            row_count = await conn.fetchval("SELECT count(*) FROM chunks")
+            params = compute_index_params(method, row_count)
+            logger.info(
+                f"Rebuilding {VECTOR_INDEX_NAME} for {row_count} chunks with {params}."
+            )
+            try:
+                # Un build CONCURRENTLY interrompu laisse un index invalide à nettoyer.
+                await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {temp_name}")
+                await conn.execute(create_index_sql(temp_name, params))
+                async with conn.transaction():
+                    await conn.execute(f"DROP INDEX IF EXISTS {VECTOR_INDEX_NAME}")
+                    await conn.execute(
+                        f"ALTER INDEX {temp_name} RENAME TO {VECTOR_INDEX_NAME}"
+                    )
+            except Exception as e:
+                logger.error(f"Vector index rebuild failed: {e}", exc_info=True)
+                raise RepositoryError(f"Failed to rebuild vector index: {e}")
+        return {"method": params.method, "options": params.options, "rows": row_count}
+
+    async def set_compact_indexes(self, kinds: Sequence[str]) -> List[str]:
+        """
+        Crée les index compacts demandés (voir COMPACT_INDEXES) et supprime les autres.
+        Construction et suppression se font en CONCURRENTLY ; un index laissé invalide
+        par un build interrompu est reconstruit.
+
+        Returns:
+            Les index compacts présents à l'issue de l'opération.
+        """
+        unknown = set(kinds) - set(COMPACT_INDEXES)
+        if unknown:
+            raise ValueError(
+                f"Unsupported compact index {sorted(unknown)}. "
+                f"Expected one of: {tuple(COMPACT_INDEXES)}"
+            )
+        async with self._get_connection() as conn:
+            try:
+                for kind, (index_name, _) in COMPACT_INDEXES.items():
+                    valid = await conn.fetchval(
+                        "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)",
+                        index_name,
+                    )
+                    if valid is not None and (kind not in kinds or not valid):
+                        logger.info(f"Dropping compact index {index_name}.")
+                        await conn.execute(
+                            f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"
+                        )
+                    if kind in kinds and not valid:
+                        logger.info(f"Building compact index {index_name}.")
+                        await conn.execute(compact_index_sql(kind))
+            except Exception as e:
+                logger.error(f"Compact index update failed: {e}", exc_info=True)
+                raise RepositoryError(f"Failed to update compact indexes: {e}")
+        return [kind for kind in COMPACT_INDEXES if kind in kinds]
 
     async def get_document(self, document_id: str) -> Optional[Dict[str, Any]]:
         async with self._get_connection() as conn:
@@ -117,57 +462,393 @@ class PostgresRepository(IVectorRepository):
 
     async def list_documents(self, limit: int, offset: int) -> List[DocumentMetadata]:
         async with self._get_connection() as conn:
-            # Cette requête est simplifiée, on pourrait la rendre plus complexe au besoin
             rows = await conn.fetch(
-                "SELECT d.id::text, d.title, d.source, d.created_at, d.updated_at, COUNT(c.id) AS chunk_count FROM documents d LEFT JOIN chunks c ON d.id = c.document_id GROUP BY d.id ORDER BY d.created_at DESC LIMIT $1 OFFSET $2",
+                f"SELECT {DOCUMENT_LIST_COLUMNS} FROM documents ORDER BY created_at DESC, id DESC LIMIT $1 OFFSET $2",
                 limit,
                 offset,
             )
-            return [DocumentMetadata(**dict(row)) for row in rows]
+            return [self._document_metadata(row) for row in rows]
+
+    async def list_documents_page(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> DocumentPage:
+        """
+        Liste les documents du plus récent au plus ancien par pagination keyset sur
+        (created_at, id) : le coût d'une page ne dépend pas de sa position.
+
+        Raises:
+            ValueError: si le curseur n'a pas été produit par cette méthode.
+        """
+        async with self._get_connection() as conn:
+            if cursor is None:
+                rows = await conn.fetch(
+                    f"SELECT {DOCUMENT_LIST_COLUMNS} FROM documents ORDER BY created_at DESC, id DESC LIMIT $1",
+                    limit + 1,
+                )
+            else:
+                created_at, document_id = _decode_cursor(cursor)
+                rows = await conn.fetch(
+                    f"SELECT {DOCUMENT_LIST_COLUMNS} FROM documents WHERE (created_at, id) < ($2, $3) ORDER BY created_at DESC, id DESC LIMIT $1",
+                    limit + 1,
+                    created_at,
+                    document_id,
+                )
+        items = [self._document_metadata(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = _encode_cursor(items[-1].created_at, items[-1].id)
+        return DocumentPage(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _document_metadata(row) -> DocumentMetadata:
+        data = dict(row)
+        data["metadata"] = json.loads(data["metadata"]) if data["metadata"] else {}
+        return DocumentMetadata(**data)
+
+    async def stream_rows(
+        self, table: str, batch_size: int = 1000
+    ) -> AsyncIterator[List[asyncpg.Record]]:
+        """
+        Parcourt intégralement `documents` ou `chunks` par lots, via un curseur serveur.
+        Seul le lot courant est en mémoire côté client ; la transaction en lecture seule
+        REPEATABLE READ garantit un instantané cohérent pendant tout l'export.
+
+        Raises:
+            ValueError: si la table n'est pas exportable.
+        """
+        query = EXPORT_QUERIES.get(table)
+        if query is None:
+            raise ValueError(
+                f"Unsupported export table '{table}'. Expected one of: {tuple(EXPORT_QUERIES)}"
+            )
+        async with self._get_connection() as conn:
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                cursor = await conn.cursor(query)
+                while True:
+                    rows = await cursor.fetch(batch_size)
+                    if not rows:
+                        break
+                    yield rows
 
     async def get_document_chunks(self, document_id: str) -> List[Dict[str, Any]]:
+        # `embedding` est décodé par le codec du pool en tableau NumPy float32.
         async with self._get_connection() as conn:
             rows = await conn.fetch(
                 "SELECT * FROM get_document_chunks($1::uuid)", document_id
             )
             return [dict(row) for row in rows]
 
+    @traced("postgres.is_document_unchanged")
+    async def is_document_unchanged(self, source: str, content_hash: str) -> bool:
+        async with self._get_connection() as conn:
+            return await conn.fetchval(
+                "SELECT EXISTS (SELECT 1 FROM documents WHERE source = $1 AND content_hash = $2)",
+                source,
+                content_hash,
+            )
+
+    @traced("postgres.save_document_with_chunks")
     async def save_document_with_chunks(
         self,
         file_path: str,
         document_content: str,
-        chunks: List[Dict[str, Any]],
+        chunks: List[Any],
         document_metadata: Dict[str, Any],
-    ) -> int:
+        content_hash: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        document = {
+            "file_path": file_path,
+            "document_content": document_content,
+            "chunks": chunks,
+            "document_metadata": document_metadata,
+            "content_hash": content_hash,
+        }
+        async with self._get_connection() as conn:
+            async with conn.transaction():
+                outcomes = await self._write_documents(conn, [document])
+        return outcomes[0]
+
+    @traced("postgres.save_documents_batch")
+    async def save_documents_batch(
+        self, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Sauvegarde plusieurs documents et leurs chunks en un nombre constant d'allers-retours.
+
+        Le lot entier est d'abord tenté d'un bloc (un INSERT pour les documents, un COPY
+        binaire pour tous les chunks). En cas d'échec, chaque document est rejoué dans son
+        propre SAVEPOINT : un document invalide n'entraîne pas les autres, et aucun
+        document n'est jamais écrit partiellement. Le tout est validé par un seul commit.
+
+        Args:
+            documents: Dictionnaires avec les clés `file_path`, `document_content`,
+                `chunks`, `document_metadata` et `content_hash` optionnel
+                (mêmes arguments que `save_document_with_chunks`).
+
+        Returns:
+            Un résultat par document, dans l'ordre d'entrée : `file_path` plus le
+            résultat de `save_document_with_chunks`, ou `status="failed"` et `error`.
+        """
+        async with self.pending_documents_batch(documents) as outcomes:
+            return outcomes
+
+    @asynccontextmanager
+    async def pending_documents_batch(
+        self, documents: List[Dict[str, Any]]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Écrit le lot comme `save_documents_batch` et fournit ses résultats, mais ne valide
+        la transaction qu'à la sortie du bloc (annulée si le bloc lève une exception).
+        """
+        if not documents:
+            yield []
+            return
+
         async with self._get_connection() as conn:
             async with conn.transaction():
+                yield await self._write_batch(conn, documents)
 
-                document_id = await conn.fetchval(
-                    "INSERT INTO documents (title, source, content, metadata) VALUES ($1, $2, $3, $4) RETURNING id",
-                    file_path,
-                    file_path,
-                    document_content,
-                    json.dumps(document_metadata),
+    async def _write_batch(
+        self, conn, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        try:
+            async with conn.transaction():
+                outcomes = await self._write_documents(conn, documents)
+            return [
+                {"file_path": doc["file_path"], **outcome}
+                for doc, outcome in zip(documents, outcomes)
+            ]
+        except Exception as e:
+            if len(documents) == 1:
+                logger.error(f"Failed to save {documents[0]['file_path']}: {e}")
+                return [self._failed_outcome(documents[0], e)]
+            logger.warning(
+                f"Batch of {len(documents)} documents failed ({e}). "
+                "Retrying each document in its own savepoint."
+            )
+
+        results = []
+        for doc in documents:
+            try:
+                async with conn.transaction():
+                    outcomes = await self._write_documents(conn, [doc])
+                results.append({"file_path": doc["file_path"], **outcomes[0]})
+            except Exception as e:
+                logger.error(f"Failed to save {doc['file_path']}: {e}")
+                results.append(self._failed_outcome(doc, e))
+        return results
+
+    @staticmethod
+    def _failed_outcome(document: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+        return {
+            "file_path": document["file_path"],
+            "status": "failed",
+            "chunks_added": 0,
+            "error": str(error),
+        }
+
+    async def _write_documents(
+        self, conn, documents: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Écrit un lot de documents sur une connexion dont la transaction est gérée par l'appelant.
+
+        Les documents sont identifiés par (source, content_hash) :
+        - même source et même empreinte : rien n'est écrit (`unchanged`) ;
+        - même source, empreinte différente : remplacement avec diff au niveau des chunks (`replaced`) ;
+        - nouvelle source : INSERT du document puis COPY binaire de ses chunks (`created`).
+
+        Si une source apparaît plusieurs fois dans le lot, seule sa dernière version est
+        écrite ; les précédentes, remplacées dans le lot même, sont `replaced` sans chunk.
+        Les dictionnaires de l'appelant ne sont pas modifiés.
+        """
+        latest = {doc["file_path"]: i for i, doc in enumerate(documents)}
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(documents)
+        pending = []
+        for i, doc in enumerate(documents):
+            if latest[doc["file_path"]] != i:
+                outcomes[i] = {
+                    "status": "replaced",
+                    "chunks_added": 0,
+                    "chunks_deleted": 0,
+                    "chunks_kept": 0,
+                }
+            else:
+                content_hash = doc.get("content_hash") or compute_content_hash(
+                    doc["document_content"]
                 )
+                pending.append((i, {**doc, "content_hash": content_hash}))
+        sources = [doc["file_path"] for _, doc in pending]
 
-                chunks_to_insert = [
-                    (
-                        document_id,
-                        c["content"],
-                        str(c["embedding"]),
-                        c["index"],
-                        json.dumps(c["metadata"]),
-                        c.get("token_count"),
-                    )
-                    for c in chunks
-                    if c.get("embedding") is not None
-                ]
+        # Sérialise les écritures concurrentes d'une même source jusqu'à la fin de la transaction.
+        await conn.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(s)) FROM (SELECT DISTINCT unnest($1::text[]) AS s ORDER BY s) AS sources",
+            sources,
+        )
+        existing = {
+            row["source"]: row
+            for row in await conn.fetch(
+                "SELECT id, source, content_hash FROM documents WHERE source = ANY($1::text[])",
+                sources,
+            )
+        }
+
+        new_documents = []
+        for i, doc in pending:
+            current = existing.get(doc["file_path"])
+            if current is None:
+                new_documents.append((i, doc))
+            elif current["content_hash"] == doc["content_hash"]:
+                outcomes[i] = {
+                    "status": "unchanged",
+                    "chunks_added": 0,
+                    "chunks_deleted": 0,
+                    "chunks_kept": 0,
+                }
+            else:
+                outcomes[i] = await self._replace_document(conn, current["id"], doc)
+
+        if new_documents:
+            counts = await self._insert_documents(
+                conn, [doc for _, doc in new_documents]
+            )
+            for (i, _), count in zip(new_documents, counts):
+                outcomes[i] = {
+                    "status": "created",
+                    "chunks_added": count,
+                    "chunks_deleted": 0,
+                    "chunks_kept": 0,
+                }
+        return outcomes
 
-                if not chunks_to_insert:
-                    return 0
+    async def _insert_documents(
+        self, conn, documents: List[Dict[str, Any]]
+    ) -> List[int]:
+        """Insère de nouveaux documents puis leurs chunks via COPY binaire."""
+        # Les IDs sont générés côté client pour rattacher les chunks sans RETURNING ordonné.
+        document_ids = [uuid.uuid4() for _ in documents]
+        per_document = [
+            self._chunk_records(document_id, doc["chunks"])
+            for document_id, doc in zip(document_ids, documents)
+        ]
+        await conn.execute(
+            INSERT_DOCUMENTS_QUERY,
+            document_ids,
+            [doc["file_path"] for doc in documents],
+            [doc["file_path"] for doc in documents],
+            [doc["document_content"] for doc in documents],
+            [json.dumps(doc["document_metadata"]) for doc in documents],
+            [doc["content_hash"] for doc in documents],
+            [len(doc_records) for doc_records in per_document],
+            [self._total_tokens(doc_records) for doc_records in per_document],
+        )
 
-                await conn.executemany(
-                    "INSERT INTO chunks (document_id, content, embedding, chunk_index, metadata, token_count) VALUES ($1, $2, $3, $4, $5, $6)",
-                    chunks_to_insert,
+        records = [record for doc_records in per_document for record in doc_records]
+        counts = [len(doc_records) for doc_records in per_document]
+
+        if records:
+            await conn.copy_records_to_table(
+                "chunks", records=records, columns=CHUNK_COPY_COLUMNS
+            )
+        return counts
+
+    async def _replace_document(
+        self, conn, document_id: uuid.UUID, doc: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Remplace un document existant en appliquant un diff par empreinte de chunk :
+        les chunks identiques sont conservés (embedding inclus, seuls index et métadonnées
+        sont mis à jour), les chunks disparus sont supprimés et les nouveaux insérés.
+        """
+        records = self._chunk_records(document_id, doc["chunks"])
+        await conn.execute(
+            "UPDATE documents SET content = $2, metadata = $3::jsonb, content_hash = $4, chunk_count = $5, total_tokens = $6 WHERE id = $1",
+            document_id,
+            doc["document_content"],
+            json.dumps(doc["document_metadata"]),
+            doc["content_hash"],
+            len(records),
+            self._total_tokens(records),
+        )
+
+        # Empreinte -> IDs des chunks stockés (un même contenu peut apparaître plusieurs fois).
+        stored: Dict[str, List[uuid.UUID]] = {}
+        for row in await conn.fetch(
+            "SELECT id, content_hash FROM chunks WHERE document_id = $1 ORDER BY chunk_index",
+            document_id,
+        ):
+            stored.setdefault(row["content_hash"], []).append(row["id"])
+
+        kept, to_insert = [], []
+        for record in records:
+            ids = stored.get(record[CHUNK_HASH_POSITION])
+            if ids:
+                kept.append((ids.pop(0), record))
+            else:
+                to_insert.append(record)
+        to_delete = [chunk_id for ids in stored.values() for chunk_id in ids]
+
+        if to_delete:
+            await conn.execute(
+                "DELETE FROM chunks WHERE id = ANY($1::uuid[])", to_delete
+            )
+        if kept:
+            await conn.execute(
+                """
+                UPDATE chunks c
+                SET chunk_index = k.chunk_index, metadata = k.metadata, token_count = k.token_count
+                FROM unnest($1::uuid[], $2::int[], $3::jsonb[], $4::int[])
+                    AS k(id, chunk_index, metadata, token_count)
+                WHERE c.id = k.id
+                """,
+                [chunk_id for chunk_id, _ in kept],
+                [record[3] for _, record in kept],
+                [record[4] for _, record in kept],
+                [record[5] for _, record in kept],
+            )
+        if to_insert:
+            await conn.copy_records_to_table(
+                "chunks", records=to_insert, columns=CHUNK_COPY_COLUMNS
+            )
+
+        return {
+            "status": "replaced",
+            "chunks_added": len(to_insert),
+            "chunks_deleted": len(to_delete),
+            "chunks_kept": len(kept),
+        }
+
+    @staticmethod
+    def _total_tokens(records) -> int:
+        return sum(record[CHUNK_TOKENS_POSITION] or 0 for record in records)
+
+    @staticmethod
+    def _chunk_records(document_id: uuid.UUID, chunks: Sequence[Any]):
+        """
+        Convertit les chunks (`DocumentChunk` ou dictionnaires de mêmes champs) en tuples
+        alignés sur CHUNK_COPY_COLUMNS (chunks sans embedding ignorés).
+        """
+        records = []
+        for chunk in chunks:
+            if isinstance(chunk, Mapping):
+                content, embedding = chunk["content"], chunk.get("embedding")
+                index, metadata = chunk["index"], chunk["metadata"]
+                token_count = chunk.get("token_count")
+            else:
+                content, embedding = chunk.content, chunk.embedding
+                index, metadata = chunk.index, chunk.metadata
+                token_count = chunk.token_count
+            if embedding is None:
+                continue
+            records.append(
+                (
+                    document_id,
+                    content,
+                    embedding,
+                    index,
+                    json.dumps(metadata),
+                    token_count,
+                    compute_content_hash(content),
                 )
-                return len(chunks_to_insert)
+            )
+        return records
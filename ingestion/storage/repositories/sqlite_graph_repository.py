@@ -1,19 +1,212 @@
 # FICHIER: analyzer-engine/ingestion/storage/repositories/sqlite_graph_repository.py
 
 import os
+import re
+import asyncio
+import json
+import base64
 import logging
 import aiosqlite
-from typing import List, Dict, Any
+import numpy as np
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
 
 # IMPORTS STRATÉGIQUES :
 # Dépendance à l'abstraction (le contrat) et aux exceptions définies dans core.
-from core.contracts.repository_contract import ICodeRepository
+from core.contracts.repository_contract import BatchConfirm, ICodeRepository
 from core.exceptions.base_exceptions import RepositoryError
+from core.telemetry import traced
+from ingestion.storage.graph_archive import GraphArchive, decode_archive, encode_archive
+from ingestion.storage.graph_snapshot import CSRGraph, encode_edges
+from core.models.graph_models import (
+    EntityStats,
+    GraphSearchPage,
+    GraphSearchResult,
+    GraphTraversal,
+    TraversalNode,
+)
 
 logger = logging.getLogger(__name__)
 
 # La configuration de la base de données est une responsabilité de l'implémentation.
 DB_FILE = "code_graph.sqlite"
+# Réglages appliqués à chaque connexion. WAL + synchronous=NORMAL : un commit n'attend plus
+# de fsync du fichier principal, et les lecteurs ne bloquent pas l'écrivain.
+# cache_size négatif = taille en KiB ; mmap_size en octets.
+DEFAULT_PRAGMAS: Dict[str, Any] = {
+    "busy_timeout": 5000,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -65536,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+}
+# PRAGMA repris sur les connexions de lecture (journal_mode et synchronous ne concernent
+# que l'écrivain) ; query_only y interdit toute écriture.
+READER_PRAGMAS = ("busy_timeout", "cache_size", "mmap_size", "temp_store")
+# Tables temporaires (propres à la connexion d'écriture) recevant la structure d'un fichier
+# avant sa comparaison ensembliste avec l'existant.
+STAGING_TABLES_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS incoming_entities (
+        name TEXT PRIMARY KEY, type TEXT NOT NULL, source_code TEXT
+    );
+    CREATE TEMP TABLE IF NOT EXISTS incoming_relationships (
+        source_name TEXT NOT NULL, target_name TEXT NOT NULL, type TEXT NOT NULL
+    );
+    CREATE TEMP TABLE IF NOT EXISTS incoming_edges (
+        source_id INTEGER NOT NULL, target_id INTEGER NOT NULL, type TEXT NOT NULL,
+        PRIMARY KEY (source_id, target_id, type)
+    );
+"""
+# Modes de correspondance du nom d'entité :
+#   exact     : égalité, via idx_entities_name ;
+#   prefix    : le nom commence par le terme (insensible à la casse) ;
+#   substring : le nom contient le terme (insensible à la casse).
+# prefix et substring passent par l'index FTS5 trigramme `entities_fts` dès 3 caractères ;
+# en dessous, aucun trigramme n'est disponible et la recherche parcourt la table.
+ENTITY_MATCH_MODES = ("exact", "prefix", "substring")
+TRIGRAM_MIN_LENGTH = 3
+FACT_COLUMNS = ("source_name", "source_type", "rel_type", "target_name", "target_type")
+# Parcours multi-sauts : sens des arêtes suivies et types de relation admis.
+#   outgoing : source -> cible (ce que l'entité appelle / utilise) ;
+#   incoming : cible -> source (ce qui appelle / utilise l'entité) ;
+#   both     : les deux sens.
+TRAVERSAL_DIRECTIONS = ("outgoing", "incoming", "both")
+TRAVERSAL_MODES = ("frontier", "paths")
+ENTITY_TYPES = ("FUNCTION", "CLASS", "FILE")
+RELATIONSHIP_TYPES = ("CALLS", "USES_TYPE", "DEFINES_IN_FILE")
+ENTITY_STATS_ORDERS = ("pagerank", "in_degree", "out_degree")
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?\w+$")
+
+
+def _encode_cursor(row) -> str:
+    payload = json.dumps([row[column] for column in FACT_COLUMNS])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> List[str]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != len(FACT_COLUMNS):
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}")
+    return values
+
+
+def _like_escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _entity_match_clause(entity_name: str, match_mode: str):
+    """Construit la condition SQL (sur `entities`) et ses paramètres pour un mode de correspondance."""
+    if match_mode not in ENTITY_MATCH_MODES:
+        raise ValueError(
+            f"Unsupported match mode '{match_mode}'. Expected one of: {ENTITY_MATCH_MODES}"
+        )
+    if match_mode == "exact":
+        return "name = ?", [entity_name]
+
+    pattern = _like_escape(entity_name) + "%"
+    if match_mode == "substring":
+        pattern = "%" + pattern
+    if len(entity_name) < TRIGRAM_MIN_LENGTH:
+        return "name LIKE ? ESCAPE '\\'", [pattern]
+
+    # Une phrase de trigrammes correspond exactement aux noms contenant le terme.
+    phrase = '"' + entity_name.replace('"', '""') + '"'
+    clause = "id IN (SELECT rowid FROM entities_fts WHERE entities_fts MATCH ?)"
+    if match_mode == "substring":
+        return clause, [phrase]
+    return clause + " AND name LIKE ? ESCAPE '\\'", [phrase, pattern]
+
+
+def _validate_traversal(
+    direction: str,
+    mode: str,
+    rel_types: Optional[List[str]],
+    max_depth: int,
+    limit: int,
+) -> None:
+    """Valide les paramètres d'un parcours (partagé par les implémentations du contrat)."""
+    if direction not in TRAVERSAL_DIRECTIONS:
+        raise ValueError(
+            f"Unsupported direction '{direction}'. Expected one of: {TRAVERSAL_DIRECTIONS}"
+        )
+    if mode not in TRAVERSAL_MODES:
+        raise ValueError(
+            f"Unsupported traversal mode '{mode}'. Expected one of: {TRAVERSAL_MODES}"
+        )
+    unknown = set(rel_types or []) - set(RELATIONSHIP_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unsupported relationship types {sorted(unknown)}. Expected: {RELATIONSHIP_TYPES}"
+        )
+    if max_depth < 1 or limit < 1:
+        raise ValueError("max_depth and limit must be positive.")
+
+
+def _traversal_query(direction: str, mode: str, filter_types: bool) -> str:
+    """
+    Construit le CTE récursif du parcours : une branche récursive par sens suivi, chacune
+    jointe sur l'index de relations correspondant (source ou cible).
+
+    - frontier : UNION sur (id, profondeur), borné par max_depth ; chaque entité est
+      ensuite rapportée à sa profondeur minimale. Une entité apparaissant au plus une fois
+      par profondeur, le budget de lignes (:budget) garantit assez d'entités distinctes
+      tout en arrêtant le parcours tôt sur les graphes denses.
+    - paths : UNION ALL avec le chemin courant (",id1,id2,") ; une arête revenant sur une
+      entité déjà présente dans le chemin est écartée (détection de cycle). La file du CTE
+      étant FIFO, le LIMIT interrompt le parcours en largeur sur les chemins les plus longs.
+    """
+    type_clause = (
+        " AND r.type IN (SELECT value FROM json_each(:rel_types))"
+        if filter_types
+        else ""
+    )
+    joins = []
+    if direction in ("outgoing", "both"):
+        joins.append(("r.source_id", "r.target_id"))
+    if direction in ("incoming", "both"):
+        joins.append(("r.target_id", "r.source_id"))
+
+    if mode == "frontier":
+        steps = [
+            f"SELECT {nxt}, w.depth + 1 FROM walk w JOIN relationships r ON {cur} = w.id "
+            f"WHERE w.depth < :max_depth{type_clause}"
+            for cur, nxt in joins
+        ]
+        return f"""
+            WITH RECURSIVE walk(id, depth) AS (
+                SELECT value, 0 FROM json_each(:seeds)
+                UNION
+                {" UNION ".join(steps)}
+                LIMIT :budget
+            )
+            SELECT e.id, e.name, e.type, e.file_path, MIN(w.depth) AS depth
+            FROM walk w JOIN entities e ON e.id = w.id
+            GROUP BY e.id
+            ORDER BY depth, e.name, e.id
+            LIMIT :limit
+        """
+
+    steps = [
+        f"SELECT {nxt}, w.depth + 1, w.path || {nxt} || ',' "
+        f"FROM walk w JOIN relationships r ON {cur} = w.id "
+        f"WHERE w.depth < :max_depth AND instr(w.path, ',' || {nxt} || ',') = 0{type_clause}"
+        for cur, nxt in joins
+    ]
+    return f"""
+        WITH RECURSIVE walk(id, depth, path) AS (
+            SELECT value, 0, ',' || value || ',' FROM json_each(:seeds)
+            UNION ALL
+            {" UNION ALL ".join(steps)}
+            LIMIT :limit
+        )
+        SELECT path FROM walk WHERE depth > 0
+    """
 
 
 class SQLiteGraphRepository(ICodeRepository):
@@ -22,15 +215,38 @@ class SQLiteGraphRepository(ICodeRepository):
     Cette classe encapsule toute la logique de lecture et d'écriture pour le graphe de connaissance du code.
     """
 
-    def __init__(self, db_path: str = DB_FILE):
+    def __init__(
+        self,
+        db_path: str = DB_FILE,
+        pragmas: Optional[Dict[str, Any]] = None,
+        read_pool_size: int = 4,
+    ):
         """
         Initialise le repository.
 
         Args:
             db_path: Chemin vers le fichier de la base de données SQLite.
+            pragmas: PRAGMA appliqués à l'ouverture de la connexion (défaut : DEFAULT_PRAGMAS).
+            read_pool_size: nombre de connexions en lecture seule. Chaque connexion aiosqlite
+                a son propre thread : en WAL, les requêtes de lecture s'exécutent en parallèle
+                entre elles et avec l'écrivain. 0 (ou base ":memory:", propre à chaque
+                connexion) : les lectures passent par la connexion d'écriture.
         """
         self.db_path = db_path
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        for name, value in self.pragmas.items():
+            if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+                raise ValueError(f"Invalid SQLite pragma: {name} = {value!r}")
+        self.read_pool_size = 0 if db_path == ":memory:" else read_pool_size
+        # Connexion unique d'écriture (et de lecture à défaut de pool).
         self.conn: aiosqlite.Connection | None = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue | None = None
+        self.graph_snapshot: CSRGraph | None = None
+        self._journal_generation: Optional[int] = None
+        # Une seule transaction d'écriture à la fois sur la connexion partagée (les
+        # tables de staging temporaires et le commit sont propres à la connexion).
+        self._write_lock = asyncio.Lock()
         logger.info(
             f"SQLiteGraphRepository instance created for database at: {self.db_path}"
         )
@@ -50,11 +266,14 @@ class SQLiteGraphRepository(ICodeRepository):
             self.conn = await aiosqlite.connect(self.db_path)
             # Utiliser aiosqlite.Row pour accéder aux colonnes par leur nom.
             self.conn.row_factory = aiosqlite.Row
+            await self._apply_pragmas()
             # Activer les contraintes de clé étrangère, crucial pour l'intégrité des données.
             await self.conn.execute("PRAGMA foreign_keys = ON;")
             await self._create_tables_if_not_exists()
+            await self._open_readers()
             logger.info(
-                f"SQLiteGraphRepository initialized. Database at: {self.db_path}"
+                f"SQLiteGraphRepository initialized. Database at: {self.db_path} "
+                f"({len(self._readers)} read connections)"
             )
         except Exception as e:
             logger.error(
@@ -62,8 +281,57 @@ class SQLiteGraphRepository(ICodeRepository):
             )
             raise RepositoryError(f"Failed to initialize SQLiteGraphRepository: {e}")
 
+    async def _open_readers(self) -> None:
+        """Ouvre les connexions en lecture seule, une fois le schéma créé par l'écrivain."""
+        uri = Path(self.db_path).absolute().as_uri() + "?mode=ro"
+        self._idle_readers = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            reader = await aiosqlite.connect(uri, uri=True)
+            reader.row_factory = aiosqlite.Row
+            await self._apply_pragmas(reader, READER_PRAGMAS)
+            await reader.execute("PRAGMA query_only = ON;")
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+    @asynccontextmanager
+    async def _reader(self):
+        """Emprunte une connexion de lecture (la connexion d'écriture en l'absence de pool)."""
+        if not self.conn:
+            await self.initialize()
+        if not self._readers:
+            yield self.conn
+            return
+        reader = await self._idle_readers.get()
+        try:
+            yield reader
+        finally:
+            self._idle_readers.put_nowait(reader)
+
+    async def _apply_pragmas(
+        self, conn: aiosqlite.Connection = None, names: Optional[tuple] = None
+    ) -> None:
+        """Applique les PRAGMA configurés ; journal_mode renvoie le mode réellement retenu."""
+        conn = conn or self.conn
+        for name, value in self.pragmas.items():
+            if names is not None and name not in names:
+                continue
+            async with conn.execute(f"PRAGMA {name} = {value};") as cursor:
+                row = await cursor.fetchone()
+            if (
+                name == "journal_mode"
+                and row
+                and str(row[0]).lower() != str(value).lower()
+            ):
+                # Cas normal pour ":memory:", qui reste en journal "memory".
+                logger.debug(
+                    f"SQLite journal_mode is '{row[0]}' (requested '{value}')."
+                )
+
     async def close(self) -> None:
         """Ferme la connexion à la base de données si elle est ouverte."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
         if self.conn:
             await self.conn.close()
             self.conn = None
@@ -76,8 +344,7 @@ class SQLiteGraphRepository(ICodeRepository):
 
         try:
             # Utilisation de executescript pour exécuter plusieurs instructions dans une transaction.
-            await self.conn.executescript(
-                """
+            await self.conn.executescript("""
                 CREATE TABLE IF NOT EXISTS entities (
                     id INTEGER PRIMARY KEY,
                     name TEXT NOT NULL,
@@ -97,83 +364,123 @@ class SQLiteGraphRepository(ICodeRepository):
                 );
 
                 CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name);
+                -- Remplacement par fichier : toutes les comparaisons sont restreintes à un file_path.
+                CREATE INDEX IF NOT EXISTS idx_entities_file_path ON entities(file_path);
                 CREATE INDEX IF NOT EXISTS idx_relationships_source ON relationships(source_id);
                 CREATE INDEX IF NOT EXISTS idx_relationships_target ON relationships(target_id);
-            """
-            )
+
+                -- Métriques structurelles calculées sur l'instantané CSR (compute_entity_stats).
+                CREATE TABLE IF NOT EXISTS entity_stats (
+                    entity_id INTEGER PRIMARY KEY REFERENCES entities(id) ON DELETE CASCADE,
+                    in_degree INTEGER NOT NULL,
+                    out_degree INTEGER NOT NULL,
+                    pagerank REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entity_stats_pagerank ON entity_stats(pagerank DESC);
+
+                -- Journal des changements du graphe, rejoué par refresh_graph_snapshot.
+                -- type_code suit l'ordre de RELATIONSHIP_TYPES. Il n'est alimenté que
+                -- lorsqu'un instantané existe (`enabled`) ; `generation` change à chaque
+                -- coupure, ce qui invalide les instantanés construits avant.
+                CREATE TABLE IF NOT EXISTS graph_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    op TEXT NOT NULL CHECK(op IN ('N+', 'N-', 'E+', 'E-')),
+                    a INTEGER NOT NULL,
+                    b INTEGER,
+                    type_code INTEGER
+                );
+                CREATE TABLE IF NOT EXISTS graph_changes_state (
+                    id INTEGER PRIMARY KEY CHECK(id = 1),
+                    enabled INTEGER NOT NULL,
+                    generation INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO graph_changes_state (id, enabled, generation) VALUES (1, 0, 0);
+                DROP TRIGGER IF EXISTS graph_changes_entity_insert;
+                CREATE TRIGGER graph_changes_entity_insert AFTER INSERT ON entities
+                WHEN (SELECT enabled FROM graph_changes_state WHERE id = 1) BEGIN
+                    INSERT INTO graph_changes(op, a) VALUES ('N+', new.id);
+                END;
+                DROP TRIGGER IF EXISTS graph_changes_entity_delete;
+                CREATE TRIGGER graph_changes_entity_delete AFTER DELETE ON entities
+                WHEN (SELECT enabled FROM graph_changes_state WHERE id = 1) BEGIN
+                    INSERT INTO graph_changes(op, a) VALUES ('N-', old.id);
+                END;
+                DROP TRIGGER IF EXISTS graph_changes_edge_insert;
+                CREATE TRIGGER graph_changes_edge_insert AFTER INSERT ON relationships
+                WHEN (SELECT enabled FROM graph_changes_state WHERE id = 1) BEGIN
+                    INSERT INTO graph_changes(op, a, b, type_code) VALUES (
+                        'E+', new.source_id, new.target_id,
+                        CASE new.type WHEN 'CALLS' THEN 0 WHEN 'USES_TYPE' THEN 1 ELSE 2 END
+                    );
+                END;
+                DROP TRIGGER IF EXISTS graph_changes_edge_delete;
+                CREATE TRIGGER graph_changes_edge_delete AFTER DELETE ON relationships
+                WHEN (SELECT enabled FROM graph_changes_state WHERE id = 1) BEGIN
+                    INSERT INTO graph_changes(op, a, b, type_code) VALUES (
+                        'E-', old.source_id, old.target_id,
+                        CASE old.type WHEN 'CALLS' THEN 0 WHEN 'USES_TYPE' THEN 1 ELSE 2 END
+                    );
+                END;
+                -- Un journal laissé actif par un processus arrêté n'a plus de lecteur.
+                UPDATE graph_changes_state SET enabled = 0, generation = generation + 1
+                WHERE enabled = 1;
+                DELETE FROM graph_changes;
+            """)
+            await self._create_name_index()
+            await self.conn.executescript(STAGING_TABLES_SQL)
             await self.conn.commit()
             logger.debug("Tables 'entities' and 'relationships' are ready.")
         except Exception as e:
             logger.error(f"Failed to create tables: {e}", exc_info=True)
             raise RepositoryError(f"Failed to create tables: {e}")
 
+    async def _create_name_index(self) -> None:
+        """
+        Crée l'index FTS5 trigramme des noms d'entités (table à contenu externe), tenu à jour
+        par triggers. Sur une base existante, l'index est alimenté une fois à la création.
+        """
+        async with self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entities_fts'"
+        ) as cursor:
+            exists = await cursor.fetchone() is not None
+
+        await self.conn.executescript("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                name, content='entities', content_rowid='id', tokenize='trigram'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS entities_fts_insert AFTER INSERT ON entities BEGIN
+                INSERT INTO entities_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS entities_fts_delete AFTER DELETE ON entities BEGIN
+                INSERT INTO entities_fts(entities_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            END;
+            CREATE TRIGGER IF NOT EXISTS entities_fts_update AFTER UPDATE OF name ON entities BEGIN
+                INSERT INTO entities_fts(entities_fts, rowid, name) VALUES ('delete', old.id, old.name);
+                INSERT INTO entities_fts(rowid, name) VALUES (new.id, new.name);
+            END;
+        """)
+        if not exists:
+            await self.conn.execute(
+                "INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')"
+            )
+
+    @traced("sqlite.add_code_structure")
     async def add_code_structure(self, file_data: Dict[str, Any]) -> Dict[str, int]:
         """
-        Ajoute les entités (nœuds) et relations (arêtes) d'un fichier au graphe de manière atomique.
-        Cette méthode absorbe la logique de l'ancien `graph_builder.py`.
+        Remplace de manière atomique les entités (nœuds) et relations (arêtes) d'un fichier
+        par celles reçues. Cette méthode absorbe la logique de l'ancien `graph_builder.py`.
         """
         if not self.conn:
             await self.initialize()
 
-        entities = file_data.get("entities", [])
-        relationships = file_data.get("relationships", [])
         file_path = file_data.get("file_path")
 
-        if not entities or not file_path:
-            logger.warning("No entities or file_path provided in file_data. Skipping.")
-            return {"entities_added": 0, "relations_added": 0}
-
-        entities_added_count = 0
-        relations_added_count = 0
-
         # Utiliser une transaction explicite pour garantir l'atomicité.
-        async with self.conn.cursor() as cursor:
+        async with self._write_lock, self.conn.cursor() as cursor:
             try:
-                # 1. Insérer toutes les entités
-                for entity in entities:
-                    await cursor.execute(
-                        "INSERT OR IGNORE INTO entities (name, type, file_path, source_code) VALUES (?, ?, ?, ?)",
-                        (
-                            entity["name"],
-                            entity["type"],
-                            file_path,
-                            entity.get("source_code", ""),
-                        ),
-                    )
-                    if cursor.rowcount > 0:
-                        entities_added_count += 1
-
-                # 2. Récupérer les IDs des entités pour créer les relations
-                entity_ids = {}
-                await cursor.execute(
-                    "SELECT id, name FROM entities WHERE file_path = ?", (file_path,)
-                )
-                rows = await cursor.fetchall()
-                for row in rows:
-                    entity_ids[row["name"]] = row["id"]
-
-                # 3. Insérer toutes les relations
-                for rel in relationships:
-                    source_id = entity_ids.get(rel["source"])
-                    target_id = entity_ids.get(rel["target"])
-
-                    if source_id and target_id:
-                        await cursor.execute(
-                            "INSERT OR IGNORE INTO relationships (source_id, target_id, type) VALUES (?, ?, ?)",
-                            (source_id, target_id, rel["type"]),
-                        )
-                        if cursor.rowcount > 0:
-                            relations_added_count += 1
-                    else:
-                        logger.warning(
-                            f"Could not find IDs for relationship: {rel}. Skipping."
-                        )
-
+                stats = await self._insert_code_structure(cursor, file_data)
                 await self.conn.commit()
-                logger.info(
-                    f"Added {entities_added_count} new entities and {relations_added_count} new relationships for {file_path}."
-                )
-
             except Exception as e:
                 await self.conn.rollback()
                 logger.error(
@@ -182,73 +489,273 @@ class SQLiteGraphRepository(ICodeRepository):
                 )
                 raise RepositoryError(f"Failed to add code structure: {e}")
 
-        return {
-            "entities_added": entities_added_count,
-            "relations_added": relations_added_count,
-        }
+        return stats
 
-    async def find_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+    @traced("sqlite.add_code_structures_batch")
+    async def add_code_structures_batch(
+        self,
+        files_data: List[Dict[str, Any]],
+        confirm: Optional[BatchConfirm] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Recherche une entité par son nom et retourne toutes ses relations directes (entrantes et sortantes).
+        Ajoute la structure de plusieurs fichiers en une seule transaction (un seul commit).
+        Chaque fichier est isolé dans un SAVEPOINT : un fichier en échec est annulé seul,
+        sans jamais laisser d'écriture partielle, et les autres sont validés.
+
+        Un SAVEPOINT relâché ne peut plus être annulé isolément : si `confirm` rejette des
+        fichiers, la transaction est annulée puis rejouée sans eux avant le commit. Le
+        verrou d'écriture est tenu pendant `confirm`.
+
+        Returns:
+            Un résultat par fichier, dans l'ordre d'entrée, avec une clé `error` en cas d'échec.
         """
         if not self.conn:
             await self.initialize()
+        if not files_data:
+            return []
+
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
+                if not self.conn.in_transaction:
+                    await cursor.execute("BEGIN")
+                results = await self._insert_batch(cursor, files_data)
+                rejected = await confirm(results) if confirm is not None else {}
+                if rejected:
+                    await self.conn.rollback()
+                    await cursor.execute("BEGIN")
+                    kept = [
+                        i
+                        for i, result in enumerate(results)
+                        if "error" not in result and i not in rejected
+                    ]
+                    replayed = await self._insert_batch(
+                        cursor, [files_data[i] for i in kept]
+                    )
+                    for i, result in zip(kept, replayed):
+                        results[i] = result
+                    for i, error in rejected.items():
+                        results[i] = self._failed_result(files_data[i], error)
+                await self.conn.commit()
+            except Exception as e:
+                await self.conn.rollback()
+                logger.error(
+                    f"Batch transaction failed for {len(files_data)} files. Rolling back. Error: {e}",
+                    exc_info=True,
+                )
+                raise RepositoryError(f"Failed to add code structures: {e}")
 
-        # ======================= CORRECTION ELITE =======================
-        # La vérification de l'existence du fichier est supprimée. Elle est
-        # 1. Redondante : `initialize()` aurait déjà échoué si le fichier était inaccessible.
-        # 2. Erronée : `os.path.exists(':memory:')` est toujours False, ce qui
-        #    fait échouer les tests en mémoire de manière incorrecte.
-        # La seule vérification nécessaire est celle de la connexion (`self.conn`), déjà présente.
-        # ================================================================
-        # if not os.path.exists(self.db_path): <-- LIGNE SUPPRIMÉE
-        #     logger.warning(
-        #         f"Graph database file '{self.db_path}' not found. Run ingestion first."
-        #     )
-        #     return []
+        logger.info(
+            f"Committed code structure for {len(files_data)} files in one transaction."
+        )
+        return results
 
+    async def _insert_batch(
+        self, cursor: aiosqlite.Cursor, files_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Écrit chaque fichier dans son SAVEPOINT, sans valider la transaction."""
         results = []
+        for i, file_data in enumerate(files_data):
+            savepoint = f"file_{i}"
+            await cursor.execute(f"SAVEPOINT {savepoint}")
+            try:
+                stats = await self._insert_code_structure(cursor, file_data)
+                await cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+                results.append({"file_path": file_data.get("file_path"), **stats})
+            except Exception as e:
+                await cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                await cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+                logger.error(
+                    f"Failed to add code structure for {file_data.get('file_path')}: {e}"
+                )
+                results.append(self._failed_result(file_data, str(e)))
+        return results
+
+    @staticmethod
+    def _failed_result(file_data: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            "file_path": file_data.get("file_path"),
+            "entities_added": 0,
+            "relations_added": 0,
+            "error": error,
+        }
+
+    async def _insert_code_structure(
+        self, cursor: aiosqlite.Cursor, file_data: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """
+        Remplace la structure stockée d'un fichier sans valider la transaction.
+
+        L'ensemble reçu est chargé dans les tables temporaires puis comparé à l'existant par
+        des instructions ensemblistes : suppression des entités disparues (leurs relations
+        suivent par ON DELETE CASCADE), mise à jour des entités modifiées, insertion des
+        nouvelles ; les relations sortantes des entités du fichier sont remplacées de même.
+        Une liste d'entités vide retire donc toutes les entités du fichier.
+        """
+        entities = file_data.get("entities", [])
+        relationships = file_data.get("relationships", [])
+        file_path = file_data.get("file_path")
+
+        if not file_path:
+            logger.warning("No file_path provided in file_data. Skipping.")
+            return {"entities_added": 0, "relations_added": 0}
+
+        entity_rows = [
+            (entity["name"], entity["type"], entity.get("source_code", ""))
+            for entity in entities
+        ]
+        names = {name for name, _, _ in entity_rows}
+        relation_rows = []
+        for rel in relationships:
+            if rel["source"] in names and rel["target"] in names:
+                relation_rows.append((rel["source"], rel["target"], rel["type"]))
+            else:
+                logger.warning(f"Could not find IDs for relationship: {rel}. Skipping.")
+
+        # 1. Charger la structure reçue (la première occurrence d'un nom l'emporte).
+        await cursor.execute("DELETE FROM temp.incoming_entities")
+        await cursor.execute("DELETE FROM temp.incoming_relationships")
+        await cursor.execute("DELETE FROM temp.incoming_edges")
+        await cursor.executemany(
+            "INSERT OR IGNORE INTO temp.incoming_entities (name, type, source_code) VALUES (?, ?, ?)",
+            entity_rows,
+        )
+        await cursor.executemany(
+            "INSERT INTO temp.incoming_relationships (source_name, target_name, type) VALUES (?, ?, ?)",
+            relation_rows,
+        )
+
+        # 2. Entités : suppression des disparues, mise à jour des modifiées, insertion des nouvelles.
+        await cursor.execute(
+            "DELETE FROM entities WHERE file_path = ? AND name NOT IN (SELECT name FROM temp.incoming_entities)",
+            (file_path,),
+        )
+        entities_removed = cursor.rowcount
+        await cursor.execute(
+            """
+            UPDATE OR IGNORE entities SET type = i.type, source_code = i.source_code
+            FROM temp.incoming_entities i
+            WHERE entities.file_path = ? AND entities.name = i.name
+              AND (entities.type IS NOT i.type OR entities.source_code IS NOT i.source_code)
+            """,
+            (file_path,),
+        )
+        entities_updated = cursor.rowcount
+        await cursor.execute(
+            "INSERT OR IGNORE INTO entities (name, type, file_path, source_code) "
+            "SELECT name, type, ?, source_code FROM temp.incoming_entities",
+            (file_path,),
+        )
+        entities_added = cursor.rowcount
+
+        # 3. Relations sortantes du fichier, résolues par nom parmi ses entités.
+        await cursor.execute(
+            """
+            INSERT OR IGNORE INTO temp.incoming_edges (source_id, target_id, type)
+            SELECT s.id, t.id, r.type
+            FROM temp.incoming_relationships r
+            JOIN entities s ON s.file_path = ?1 AND s.name = r.source_name
+            JOIN entities t ON t.file_path = ?1 AND t.name = r.target_name
+            """,
+            (file_path,),
+        )
+        await cursor.execute(
+            """
+            DELETE FROM relationships
+            WHERE source_id IN (SELECT id FROM entities WHERE file_path = ?)
+              AND (source_id, target_id, type) NOT IN (
+                  SELECT source_id, target_id, type FROM temp.incoming_edges
+              )
+            """,
+            (file_path,),
+        )
+        relations_removed = cursor.rowcount
+        await cursor.execute(
+            "INSERT OR IGNORE INTO relationships (source_id, target_id, type) "
+            "SELECT source_id, target_id, type FROM temp.incoming_edges"
+        )
+        relations_added = cursor.rowcount
+
+        logger.info(
+            f"Replaced structure of {file_path}: +{entities_added} ~{entities_updated} "
+            f"-{entities_removed} entities, +{relations_added} -{relations_removed} relationships."
+        )
+        return {
+            "entities_added": entities_added,
+            "entities_updated": entities_updated,
+            "entities_removed": entities_removed,
+            "relations_added": relations_added,
+            "relations_removed": relations_removed,
+        }
+
+    @traced("sqlite.find_entity_relationships")
+    async def find_entity_relationships(self, entity_name: str) -> List[Dict[str, Any]]:
+        """
+        Recherche les entités dont le nom contient `entity_name` et retourne toutes leurs
+        relations directes (entrantes et sortantes).
+        """
+        page = await self.search_entity_relationships(entity_name)
+        return [fact.model_dump() for fact in page.items]
+
+    @traced("sqlite.search_entity_relationships")
+    async def search_entity_relationships(
+        self,
+        entity_name: str,
+        match_mode: str = "substring",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> GraphSearchPage:
+        """
+        Retourne les relations directes des entités correspondant à `entity_name`, dédupliquées
+        et triées côté SQL, par pagination keyset sur (source, type, cible).
+
+        Args:
+            match_mode: `exact`, `prefix` ou `substring` (voir ENTITY_MATCH_MODES).
+            limit: taille de page ; None renvoie toutes les relations.
+            cursor: `next_cursor` de la page précédente.
+
+        Raises:
+            ValueError: mode inconnu ou curseur invalide.
+        """
+        match_clause, params = _entity_match_clause(entity_name, match_mode)
+        after_clause = ""
+        if cursor is not None:
+            after_clause = f"WHERE ({', '.join(FACT_COLUMNS)}) > (?, ?, ?, ?, ?)"
+            params += _decode_cursor(cursor)
+        params.append(-1 if limit is None else limit + 1)
+
+        # UNION déduplique les relations trouvées par les deux extrémités.
+        query = f"""
+            WITH matched AS (SELECT id FROM entities WHERE {match_clause}),
+            facts AS (
+                SELECT
+                    s.name AS source_name, s.type AS source_type,
+                    r.type AS rel_type,
+                    t.name AS target_name, t.type AS target_type
+                FROM relationships r
+                JOIN entities s ON r.source_id = s.id
+                JOIN entities t ON r.target_id = t.id
+                WHERE r.source_id IN matched
+
+                UNION
+
+                SELECT
+                    s.name AS source_name, s.type AS source_type,
+                    r.type AS rel_type,
+                    t.name AS target_name, t.type AS target_type
+                FROM relationships r
+                JOIN entities s ON r.source_id = s.id
+                JOIN entities t ON r.target_id = t.id
+                WHERE r.target_id IN matched
+            )
+            SELECT * FROM facts
+            {after_clause}
+            ORDER BY {', '.join(FACT_COLUMNS)}
+            LIMIT ?
+        """
         try:
-            async with self.conn.cursor() as cursor:
-                search_term = f"%{entity_name}%"
-                query = """
-                    SELECT 
-                        s.name AS source_name, s.type AS source_type, 
-                        r.type AS rel_type, 
-                        t.name AS target_name, t.type AS target_type
-                    FROM relationships r
-                    JOIN entities s ON r.source_id = s.id
-                    JOIN entities t ON r.target_id = t.id
-                    WHERE s.name LIKE ?
-                    
-                    UNION
-                    
-                    SELECT 
-                        s.name AS source_name, s.type AS source_type, 
-                        r.type AS rel_type, 
-                        t.name AS target_name, t.type AS target_type
-                    FROM relationships r
-                    JOIN entities s ON r.source_id = s.id
-                    JOIN entities t ON r.target_id = t.id
-                    WHERE t.name LIKE ?
-                """
-                await cursor.execute(query, (search_term, search_term))
-                relationships = await cursor.fetchall()
-
-                if not relationships:
-                    logger.info(
-                        f"No relationships found for entity matching '{entity_name}'."
-                    )
-                    return []
-
-                for rel in relationships:
-                    fact = {
-                        "source": f"{rel['source_name']} ({rel['source_type']})",
-                        "relationship": rel["rel_type"],
-                        "target": f"{rel['target_name']} ({rel['target_type']})",
-                    }
-                    if fact not in results:
-                        results.append(fact)
+            async with self._reader() as conn:
+                async with conn.execute(query, params) as db_cursor:
+                    rows = await db_cursor.fetchall()
         except Exception as e:
             logger.error(
                 f"Error querying code graph for entity '{entity_name}': {e}",
@@ -256,26 +763,441 @@ class SQLiteGraphRepository(ICodeRepository):
             )
             raise RepositoryError(f"Error querying code graph: {e}")
 
-        return results
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1])
+        if not rows:
+            logger.info(f"No relationships found for entity matching '{entity_name}'.")
+
+        items = [
+            GraphSearchResult(
+                source=f"{row['source_name']} ({row['source_type']})",
+                relationship=row["rel_type"],
+                target=f"{row['target_name']} ({row['target_type']})",
+            )
+            for row in rows
+        ]
+        return GraphSearchPage(items=items, next_cursor=next_cursor)
+
+    @traced("sqlite.traverse")
+    async def traverse(
+        self,
+        entity_name: str,
+        direction: str = "outgoing",
+        rel_types: Optional[List[str]] = None,
+        max_depth: int = 3,
+        limit: int = 1000,
+        mode: str = "frontier",
+        file_path: Optional[str] = None,
+    ) -> GraphTraversal:
+        """
+        Parcours multi-sauts depuis les entités nommées `entity_name` (restreintes à
+        `file_path` si fourni), en un seul CTE récursif.
+
+        Args:
+            direction: `outgoing`, `incoming` ou `both` (voir TRAVERSAL_DIRECTIONS).
+            rel_types: types de relation suivis ; None suit tous les types.
+            max_depth: nombre maximal de sauts.
+            limit: nombre maximal d'entités atteintes (frontier) ou de chemins (paths).
+            mode: `frontier` (entités atteintes à leur profondeur minimale) ou `paths`
+                (chemins simples depuis les racines, en largeur d'abord).
+
+        Raises:
+            ValueError: paramètre hors des valeurs admises.
+        """
+        _validate_traversal(direction, mode, rel_types, max_depth, limit)
+
+        try:
+            async with self._reader() as conn:
+                return await self._traverse(
+                    conn,
+                    entity_name,
+                    direction,
+                    rel_types,
+                    max_depth,
+                    limit,
+                    mode,
+                    file_path,
+                )
+        except Exception as e:
+            logger.error(
+                f"Graph traversal failed for entity '{entity_name}': {e}", exc_info=True
+            )
+            raise RepositoryError(f"Graph traversal failed: {e}")
+
+    async def _traverse(
+        self,
+        conn: aiosqlite.Connection,
+        entity_name: str,
+        direction: str,
+        rel_types: Optional[List[str]],
+        max_depth: int,
+        limit: int,
+        mode: str,
+        file_path: Optional[str],
+    ) -> GraphTraversal:
+        query = (
+            "SELECT id, name, type, file_path, 0 AS depth FROM entities WHERE name = ?"
+        )
+        params = [entity_name]
+        if file_path is not None:
+            query += " AND file_path = ?"
+            params.append(file_path)
+        async with conn.execute(query, params) as cursor:
+            roots = [TraversalNode(**dict(row)) for row in await cursor.fetchall()]
+        if not roots:
+            return GraphTraversal(nodes=[])
+
+        params = {
+            "seeds": json.dumps([root.id for root in roots]),
+            "max_depth": max_depth,
+            "rel_types": json.dumps(rel_types or []),
+            # Les racines font partie du résultat du CTE (profondeur 0).
+            "limit": limit + len(roots) + 1,
+        }
+        query = _traversal_query(direction, mode, bool(rel_types))
+        if mode == "frontier":
+            params["budget"] = params["limit"] * (max_depth + 1)
+            async with conn.execute(query, params) as cursor:
+                rows = await cursor.fetchall()
+            reached = [TraversalNode(**dict(row)) for row in rows if row["depth"] > 0]
+            return GraphTraversal(
+                nodes=roots + reached[:limit], truncated=len(reached) > limit
+            )
+
+        async with conn.execute(query, params) as cursor:
+            paths = [
+                [int(i) for i in row["path"].strip(",").split(",")]
+                for row in await cursor.fetchall()
+            ]
+        truncated = len(paths) > limit
+        paths = paths[:limit]
+        nodes = await self._traversal_nodes(conn, roots, paths)
+        return GraphTraversal(nodes=nodes, paths=paths, truncated=truncated)
+
+    async def _traversal_nodes(
+        self,
+        conn: aiosqlite.Connection,
+        roots: List[TraversalNode],
+        paths: List[List[int]],
+    ) -> List[TraversalNode]:
+        """Charge les entités apparaissant dans les chemins, à leur profondeur minimale."""
+        depths: Dict[int, int] = {root.id: 0 for root in roots}
+        for path in paths:
+            for depth, entity_id in enumerate(path):
+                depths[entity_id] = min(depth, depths.get(entity_id, depth))
+        async with conn.execute(
+            "SELECT id, name, type, file_path FROM entities WHERE id IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(depths)),),
+        ) as cursor:
+            nodes = [
+                TraversalNode(**dict(row), depth=depths[row["id"]])
+                for row in await cursor.fetchall()
+            ]
+        return sorted(nodes, key=lambda node: (node.depth, node.name, node.id))
+
+    async def build_graph_snapshot(self) -> CSRGraph:
+        """
+        Construit l'instantané CSR complet du graphe. Le repère du journal est lu avant les
+        données : un changement concurrent peut donc être rejoué une seconde fois, ce qui
+        est sans effet (les mises à jour sont ensemblistes).
+        """
+        type_case = " ".join(
+            f"WHEN '{name}' THEN {code}" for code, name in enumerate(RELATIONSHIP_TYPES)
+        )
+        # Le journal est activé avant la lecture : aucun changement ultérieur n'est perdu.
+        generation = await self._enable_journal()
+        async with self._reader() as conn:
+            async with conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM graph_changes"
+            ) as cursor:
+                watermark = (await cursor.fetchone())[0]
+            async with conn.execute("SELECT id FROM entities ORDER BY id") as cursor:
+                ids = np.array(
+                    [row[0] for row in await cursor.fetchall()], dtype=np.int64
+                )
+            async with conn.execute(
+                f"SELECT source_id, target_id, CASE type {type_case} END FROM relationships"
+            ) as cursor:
+                edges = np.array(await cursor.fetchall(), dtype=np.int64).reshape(-1, 3)
+
+        self.graph_snapshot = CSRGraph(
+            ids, encode_edges(edges[:, 0], edges[:, 1], edges[:, 2]), watermark
+        )
+        self._journal_generation = generation
+        await self._prune_journal(watermark)
+        logger.info(
+            f"Graph snapshot built: {self.graph_snapshot.node_count} entities, "
+            f"{self.graph_snapshot.edge_count} relationships."
+        )
+        return self.graph_snapshot
+
+    async def refresh_graph_snapshot(self) -> CSRGraph:
+        """
+        Met à jour l'instantané en rejouant le journal depuis son repère, puis purge le
+        journal intégré. Construction complète au premier appel, ou si le journal a été
+        coupé depuis la construction (changements non journalisés).
+        """
+        if self.graph_snapshot is None:
+            return await self.build_graph_snapshot()
+
+        async with self._reader() as conn:
+            async with conn.execute(
+                "SELECT enabled, generation FROM graph_changes_state WHERE id = 1"
+            ) as cursor:
+                enabled, generation = await cursor.fetchone()
+            if not enabled or generation != self._journal_generation:
+                return await self.build_graph_snapshot()
+            async with conn.execute(
+                "SELECT seq, op, a, b, type_code FROM graph_changes WHERE seq > ? ORDER BY seq",
+                (self.graph_snapshot.watermark,),
+            ) as cursor:
+                changes = await cursor.fetchall()
+        if changes:
+            self.graph_snapshot = self.graph_snapshot.apply_changes(
+                tuple(row) for row in changes
+            )
+            await self._prune_journal(self.graph_snapshot.watermark)
+            logger.info(f"Graph snapshot refreshed with {len(changes)} changes.")
+        return self.graph_snapshot
+
+    async def _enable_journal(self) -> int:
+        """Active le journal des changements et retourne sa génération courante."""
+        if not self.conn:
+            await self.initialize()
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
+                await cursor.execute(
+                    "UPDATE graph_changes_state SET enabled = 1 WHERE id = 1"
+                )
+                await cursor.execute(
+                    "SELECT generation FROM graph_changes_state WHERE id = 1"
+                )
+                generation = (await cursor.fetchone())[0]
+                await self.conn.commit()
+            except Exception as e:
+                await self.conn.rollback()
+                raise RepositoryError(f"Failed to enable graph change journal: {e}")
+        return generation
+
+    async def _prune_journal(self, watermark: int) -> None:
+        """Supprime les changements déjà intégrés à l'instantané (son unique lecteur)."""
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
+                await cursor.execute(
+                    "DELETE FROM graph_changes WHERE seq <= ?", (watermark,)
+                )
+                await self.conn.commit()
+            except Exception as e:
+                await self.conn.rollback()
+                raise RepositoryError(f"Failed to prune graph change journal: {e}")
+
+    @traced("sqlite.compute_entity_stats")
+    async def compute_entity_stats(self, damping: float = 0.85) -> Dict[str, int]:
+        """
+        Rafraîchit l'instantané, calcule degrés et PageRank, puis remplace le contenu de
+        `entity_stats`.
+        """
+        snapshot = await self.refresh_graph_snapshot()
+        rows = zip(
+            snapshot.ids.tolist(),
+            snapshot.in_degree().tolist(),
+            snapshot.out_degree().tolist(),
+            snapshot.pagerank(damping).tolist(),
+        )
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
+                await cursor.execute("DELETE FROM entity_stats")
+                # Une entité supprimée depuis l'instantané n'a plus de ligne parente.
+                await cursor.executemany(
+                    "INSERT INTO entity_stats (entity_id, in_degree, out_degree, pagerank) "
+                    "SELECT ?1, ?2, ?3, ?4 WHERE EXISTS (SELECT 1 FROM entities WHERE id = ?1)",
+                    rows,
+                )
+                await self.conn.commit()
+            except Exception as e:
+                await self.conn.rollback()
+                logger.error(f"Failed to persist entity stats: {e}", exc_info=True)
+                raise RepositoryError(f"Failed to persist entity stats: {e}")
+        return {"entities": snapshot.node_count, "relationships": snapshot.edge_count}
+
+    async def get_entity_stats(
+        self, order_by: str = "pagerank", limit: int = 50
+    ) -> List[EntityStats]:
+        """Entités les plus centrales selon `order_by`, d'après le dernier calcul persisté."""
+        if order_by not in ENTITY_STATS_ORDERS:
+            raise ValueError(
+                f"Unsupported order '{order_by}'. Expected one of: {ENTITY_STATS_ORDERS}"
+            )
+        async with self._reader() as conn:
+            async with conn.execute(
+                f"""
+                SELECT e.id, e.name, e.type, e.file_path, s.in_degree, s.out_degree, s.pagerank
+                FROM entity_stats s JOIN entities e ON e.id = s.entity_id
+                ORDER BY s.{order_by} DESC, e.id
+                LIMIT ?
+                """,
+                (limit,),
+            ) as cursor:
+                return [EntityStats(**dict(row)) for row in await cursor.fetchall()]
+
+    async def export_archive(self, path: str) -> Dict[str, int]:
+        """
+        Exporte le graphe dans une archive binaire compacte (voir `graph_archive`), écrite
+        de manière atomique (fichier temporaire puis renommage).
+        """
+        async with self._reader() as conn:
+            async with conn.execute(
+                "SELECT id, name, type, file_path, COALESCE(source_code, '') FROM entities ORDER BY id"
+            ) as cursor:
+                entities = await cursor.fetchall()
+            async with conn.execute(
+                "SELECT source_id, target_id, type FROM relationships"
+            ) as cursor:
+                edges = await cursor.fetchall()
+
+        archive = GraphArchive(
+            entity_ids=np.array([row[0] for row in entities], dtype=np.int64),
+            names=[row[1] for row in entities],
+            types=[row[2] for row in entities],
+            file_paths=[row[3] for row in entities],
+            source_codes=[row[4] for row in entities],
+            edge_sources=np.array([row[0] for row in edges], dtype=np.int64),
+            edge_targets=np.array([row[1] for row in edges], dtype=np.int64),
+            edge_types=[row[2] for row in edges],
+        )
+        data = await asyncio.to_thread(encode_archive, archive)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        logger.info(
+            f"Graph archive written to {path}: {len(entities)} entities, "
+            f"{len(edges)} relationships, {len(data)} bytes."
+        )
+        return {
+            "entities": len(entities),
+            "relationships": len(edges),
+            "bytes": len(data),
+        }
+
+    async def import_archive(self, path: str, replace: bool = False) -> Dict[str, int]:
+        """
+        Charge une archive produite par `export_archive` (voir `load_graph`).
+
+        Raises:
+            ValueError: archive invalide, ou base non vide sans `replace=True`.
+        """
+        with open(path, "rb") as f:
+            archive = await asyncio.to_thread(decode_archive, f.read())
+        result = await self.load_graph(archive, replace=replace)
+        logger.info(f"Graph archive {path} imported.")
+        return result
+
+    async def load_graph(
+        self, archive: GraphArchive, replace: bool = False
+    ) -> Dict[str, int]:
+        """
+        Charge un graphe complet en une seule transaction, en conservant les IDs d'entités.
+
+        Les index secondaires et les triggers (index FTS, journal des changements) sont
+        suspendus pendant le chargement en masse puis recréés à l'identique : construire
+        un index en une passe est bien plus rapide que de le maintenir ligne à ligne.
+        L'index des noms est reconstruit de même ; l'instantané CSR devra être reconstruit.
+
+        Raises:
+            ValueError: base non vide sans `replace=True`.
+        """
+        if not self.conn:
+            await self.initialize()
+        async with self.conn.execute(
+            "SELECT EXISTS (SELECT 1 FROM entities)"
+        ) as cursor:
+            has_data = (await cursor.fetchone())[0]
+        if has_data and not replace:
+            raise ValueError(
+                "The graph database is not empty; pass replace=True to overwrite it."
+            )
+
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
+                await cursor.execute("BEGIN IMMEDIATE")
+                # Index secondaires et triggers : supprimés puis recréés depuis leur DDL.
+                await cursor.execute(
+                    "SELECT type, name, sql FROM sqlite_master "
+                    "WHERE type IN ('trigger', 'index') AND sql IS NOT NULL "
+                    "AND tbl_name IN ('entities', 'relationships')"
+                )
+                deferred = await cursor.fetchall()
+                for obj in deferred:
+                    await cursor.execute(f"DROP {obj['type'].upper()} {obj['name']}")
+
+                for table in (
+                    "relationships",
+                    "entity_stats",
+                    "entities",
+                    "graph_changes",
+                ):
+                    await cursor.execute(f"DELETE FROM {table}")
+                await cursor.executemany(
+                    "INSERT INTO entities (id, name, type, file_path, source_code) VALUES (?, ?, ?, ?, ?)",
+                    zip(
+                        archive.entity_ids.tolist(),
+                        archive.names,
+                        archive.types,
+                        archive.file_paths,
+                        archive.source_codes,
+                    ),
+                )
+                await cursor.executemany(
+                    "INSERT INTO relationships (source_id, target_id, type) VALUES (?, ?, ?)",
+                    zip(
+                        archive.edge_sources.tolist(),
+                        archive.edge_targets.tolist(),
+                        archive.edge_types,
+                    ),
+                )
+
+                for obj in deferred:
+                    await cursor.execute(obj["sql"])
+                await cursor.execute(
+                    "INSERT INTO entities_fts(entities_fts) VALUES ('rebuild')"
+                )
+                await self.conn.commit()
+            except Exception as e:
+                await self.conn.rollback()
+                logger.error(f"Failed to load graph: {e}", exc_info=True)
+                raise RepositoryError(f"Failed to load graph: {e}")
+
+        self.graph_snapshot = None
+        logger.info(
+            f"Graph loaded: {len(archive.names)} entities, "
+            f"{len(archive.edge_types)} relationships."
+        )
+        return {
+            "entities": len(archive.names),
+            "relationships": len(archive.edge_types),
+        }
 
     async def clean_db(self) -> None:
         """Supprime toutes les données des tables du graphe."""
         if not self.conn:
             await self.initialize()
 
-        try:
-            async with self.conn.cursor() as cursor:
+        async with self._write_lock, self.conn.cursor() as cursor:
+            try:
                 await cursor.execute("DELETE FROM relationships;")
                 await cursor.execute("DELETE FROM entities;")
                 # Réinitialise la séquence des IDs auto-incrémentés pour une base propre.
                 await cursor.execute(
                     "DELETE FROM sqlite_sequence WHERE name IN ('entities');"
                 )
-            await self.conn.commit()
-            logger.warning(
-                "Graph database has been cleaned (all entities and relationships removed)."
-            )
-        except Exception as e:
-            await self.conn.rollback()
-            logger.error(f"Failed to clean graph database: {e}", exc_info=True)
-            raise RepositoryError(f"Failed to clean graph database: {e}")
+                await self.conn.commit()
+                logger.warning(
+                    "Graph database has been cleaned (all entities and relationships removed)."
+                )
+            except Exception as e:
+                await self.conn.rollback()
+                logger.error(f"Failed to clean graph database: {e}", exc_info=True)
+                raise RepositoryError(f"Failed to clean graph database: {e}")
@@ -0,0 +1,138 @@
+# FICHIER: analyzer-engine/ingestion/storage/vector_index.py
+"""
+Gestion de l'index ANN des embeddings de chunks (`idx_chunks_embedding`).
+
+Les paramètres de construction sont dérivés de la taille du corpus au moment de la
+(re)construction, selon les recommandations de pgvector :
+- IVFFlat : `lists = lignes / 1000` jusqu'à 1M de lignes, `sqrt(lignes)` au-delà ;
+  `probes ≈ sqrt(lists)` comme point de départ.
+- HNSW : `m` et `ef_construction` augmentent avec le corpus pour préserver le rappel.
+
+Les paramètres de requête (`hnsw.ef_search`, `ivfflat.probes`) sont appliqués avec
+`set_config(..., true)`, donc limités à la transaction courante.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+VECTOR_INDEX_NAME = "idx_chunks_embedding"
+INDEX_METHODS = ("hnsw", "ivfflat")
+ITERATIVE_SCAN_MODES = ("off", "relaxed_order", "strict_order")
+# Index compacts optionnels des modes de recherche en deux phases de `match_chunks`
+# (pgvector >= 0.7). Ce sont des index sur expression : aucune colonne n'est stockée,
+# seul l'index doit tenir en mémoire. Noms et expressions doivent rester identiques à
+# ceux de sql/core/01_functions.sql, sans quoi le planificateur ne les retient pas.
+COMPACT_INDEXES: Dict[str, Tuple[str, str]] = {
+    # Demi-précision (2 octets par dimension) : présélection fidèle, index ~2x plus petit.
+    "halfvec": (
+        "idx_chunks_embedding_halfvec",
+        "(embedding::halfvec(768)) halfvec_cosine_ops",
+    ),
+    # Codes de signe (1 bit par dimension) : distance de Hamming, index ~32x plus petit.
+    "binary": (
+        "idx_chunks_embedding_binary",
+        "(binary_quantize(embedding)::bit(768)) bit_hamming_ops",
+    ),
+}
+# Valeur par défaut de `hnsw.ef_search` côté pgvector.
+HNSW_DEFAULT_EF_SEARCH = 40
+
+
+@dataclass(frozen=True)
+class VectorIndexParams:
+    """Méthode et options de construction (`WITH (...)`) de l'index ANN."""
+
+    method: str
+    options: Dict[str, int] = field(default_factory=dict)
+
+
+def validate_index_method(method: str) -> str:
+    if method not in INDEX_METHODS:
+        raise ValueError(
+            f"Unsupported index method '{method}'. Expected one of: {INDEX_METHODS}"
+        )
+    return method
+
+
+def compute_index_params(method: str, row_count: int) -> VectorIndexParams:
+    """Dérive les paramètres de construction de l'index à partir du nombre de chunks."""
+    validate_index_method(method)
+    if method == "ivfflat":
+        if row_count <= 1_000_000:
+            lists = row_count // 1000
+        else:
+            lists = int(math.sqrt(row_count))
+        return VectorIndexParams("ivfflat", {"lists": max(1, lists)})
+
+    if row_count < 100_000:
+        m, ef_construction = 16, 64
+    elif row_count < 1_000_000:
+        m, ef_construction = 24, 128
+    else:
+        m, ef_construction = 32, 200
+    return VectorIndexParams("hnsw", {"m": m, "ef_construction": ef_construction})
+
+
+def recommended_probes(lists: int) -> int:
+    """Point de départ pour `ivfflat.probes` : racine carrée du nombre de listes."""
+    return max(1, round(math.sqrt(lists)))
+
+
+def create_index_sql(
+    index_name: str, params: VectorIndexParams, concurrently: bool = True
+) -> str:
+    """Construit l'instruction CREATE INDEX de l'index ANN cosinus sur `chunks.embedding`."""
+    options = ", ".join(f"{key} = {value}" for key, value in params.options.items())
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{index_name} "
+        f"ON chunks USING {params.method} (embedding vector_cosine_ops)"
+        + (f" WITH ({options})" if options else "")
+    )
+
+
+def compact_index_sql(kind: str, concurrently: bool = True) -> str:
+    """Construit l'instruction CREATE INDEX de l'index compact `kind` (voir COMPACT_INDEXES)."""
+    if kind not in COMPACT_INDEXES:
+        raise ValueError(
+            f"Unsupported compact index '{kind}'. Expected one of: {tuple(COMPACT_INDEXES)}"
+        )
+    index_name, expression = COMPACT_INDEXES[kind]
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS "
+        f"{index_name} ON chunks USING hnsw ({expression})"
+    )
+
+
+async def apply_search_params(
+    conn,
+    ef_search: Optional[int] = None,
+    probes: Optional[int] = None,
+    iterative_scan: Optional[str] = None,
+    custom_plan: bool = False,
+) -> None:
+    """
+    Applique les réglages de recherche pour la transaction courante uniquement.
+    Doit être appelé à l'intérieur de `conn.transaction()` : hors transaction, le
+    réglage local serait perdu dès la fin de l'instruction.
+
+    Args:
+        ef_search: `hnsw.ef_search`.
+        probes: `ivfflat.probes`.
+        iterative_scan: `hnsw.iterative_scan` (pgvector >= 0.8), pour les recherches filtrées.
+        custom_plan: force un plan spécifique aux valeurs des paramètres, afin que les
+            filtres soient estimés (et indexés) sur leurs valeurs réelles.
+    """
+    values = {
+        "hnsw.ef_search": ef_search,
+        "ivfflat.probes": probes,
+        "hnsw.iterative_scan": iterative_scan,
+        "plan_cache_mode": "force_custom_plan" if custom_plan else None,
+    }
+    values = {name: str(value) for name, value in values.items() if value is not None}
+    if not values:
+        return
+    calls = ", ".join(
+        f"set_config('{name}', ${i}, true)" for i, name in enumerate(values, start=1)
+    )
+    await conn.execute(f"SELECT {calls}", *values.values())
@@ -2,14 +2,25 @@
 
 import logging
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 # ELITE FIX: Importer la CORSMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.v1 import endpoints as api_v1
+from api.v1.endpoints import resume_interrupted_jobs
+from config import settings
+from core.telemetry import configure_telemetry, metrics
 from plugins.loader import load_plugins
-from api.dependencies import get_db_pool, close_db_pool, sqlite_repo_singleton
+from api.dependencies import (
+    get_db_pool,
+    close_db_pool,
+    close_storage_writer,
+    job_manager_singleton,
+    job_store_singleton,
+    sqlite_repo_singleton,
+    websocket_manager_singleton,
+)
 
 # Configuration du logging
 logging.basicConfig(
@@ -44,9 +55,19 @@ async def on_startup():
     """Actions à exécuter au démarrage de l'application."""
     logger.info("=" * 50)
     logger.info("Phase de démarrage : Initialisation des ressources...")
+    configure_telemetry(
+        tracing=settings.TELEMETRY_TRACING_ENABLED,
+        metrics_enabled=settings.TELEMETRY_METRICS_ENABLED,
+    )
     await get_db_pool()  # Initialise le pool de connexion Postgres
     await sqlite_repo_singleton.initialize()  # Initialise la connexion SQLite
     load_plugins()
+    if job_store_singleton is not None:
+        # Après les plugins : les jobs repris utilisent les registres complets.
+        await job_store_singleton.initialize()
+        await resume_interrupted_jobs(
+            job_manager_singleton, websocket_manager_singleton, job_store_singleton
+        )
     logger.info("Chargement des plugins terminé. L'application est prête.")
     logger.info("=" * 50)
 
@@ -55,8 +76,12 @@ async def on_startup():
 async def on_shutdown():
     """Actions à exécuter à l'arrêt de l'application."""
     logger.info("Phase d'arrêt : Libération des ressources...")
+    # L'écrivain doit être vidé avant la fermeture des bases qu'il alimente.
+    await close_storage_writer()
     await close_db_pool()
     await sqlite_repo_singleton.close()
+    if job_store_singleton is not None:
+        await job_store_singleton.close()
     logger.info("Ressources libérées. Arrêt propre.")
 
 
@@ -79,3 +104,11 @@ app.include_router(api_v1.router, prefix="/api/v1", tags=["v1"])
 @app.get("/", tags=["Root"])
 async def read_root():
     return {"message": "Welcome to the JabbarRoot Analyzer Engine API"}
+
+
+@app.get("/metrics", tags=["Root"], response_class=PlainTextResponse)
+async def read_metrics():
+    """Métriques en mémoire (compteurs, latences par opération) au format Prometheus."""
+    return PlainTextResponse(
+        metrics.render_prometheus(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,8 +1,14 @@
 # NOUVEAU FICHIER: analyzer-engine/services/ingestion_service.py
+import asyncio
 import logging
 import os
-from typing import List, Callable, Awaitable
+from collections import Counter
+from typing import Dict, List, Callable, Awaitable, Optional
+from core.telemetry import metrics
+from ingestion.orchestration.concurrency_limiter import ConcurrencyLimiter, Slot
 from ingestion.orchestration.pipeline_director import PipelineDirector
+from services.job_store import SQLiteJobStore
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -10,75 +16,241 @@ logger = logging.getLogger(__name__)
 class IngestionService:
     """Service encapsulant la logique d'ingestion pour la rendre réutilisable."""
 
-    def __init__(self, status_callback: Callable[[dict], Awaitable[None]]):
-        self.director = PipelineDirector(status_callback=status_callback)
+    def __init__(
+        self,
+        status_callback: Callable[[dict], Awaitable[None]],
+        concurrency: Optional[int] = None,
+        adaptive: Optional[bool] = None,
+        streaming: Optional[bool] = None,
+        job_store: Optional[SQLiteJobStore] = None,
+    ):
+        """
+        Args:
+            concurrency: nombre de fichiers traités simultanément (défaut :
+                INGESTION_CONCURRENCY) ; limite initiale en mode adaptatif.
+            adaptive: ajuste la limite selon les échecs et la latence, jusqu'à
+                INGESTION_MAX_CONCURRENCY (défaut : INGESTION_ADAPTIVE_CONCURRENCY).
+            streaming: exécute les étapes en flux, chacune avec ses workers, au lieu
+                d'un pool de fichiers (défaut : INGESTION_STREAMING_PIPELINE).
+            job_store: si fourni, le job est persisté avec un point de contrôle par
+                fichier et par étape ; relancer un job interrompu ne traite que ses
+                fichiers non terminés, chacun à partir de sa dernière étape.
+        """
+        self.director = PipelineDirector(
+            status_callback=status_callback, job_store=job_store
+        )
+        self.job_store = job_store
         self.status_callback = status_callback
+        self.concurrency = concurrency or settings.INGESTION_CONCURRENCY
+        self.adaptive = (
+            settings.INGESTION_ADAPTIVE_CONCURRENCY if adaptive is None else adaptive
+        )
+        self.streaming = (
+            settings.INGESTION_STREAMING_PIPELINE if streaming is None else streaming
+        )
+
+    async def run_ingestion_for_job(
+        self, job_id: str, file_paths: List[str], source_root: Optional[str] = None
+    ):
+        """
+        Ingère les fichiers d'un job (pool borné de fichiers, ou pipeline en flux) et
+        publie un rapport final par statut. L'échec d'un fichier est journalisé et
+        n'interrompt pas les autres.
 
-    async def run_ingestion_for_job(self, job_id: str, file_paths: List[str]):
-        logger.info(f"[{job_id}] Starting ingestion for {len(file_paths)} files.")
+        Args:
+            job_id: Identifiant du job.
+            file_paths: Chemins des fichiers à lire sur disque.
+            source_root: Si fourni, les documents sont identifiés par leur chemin relatif
+                à ce répertoire (ex: répertoire temporaire d'upload), ce qui rend la
+                ré-ingestion d'un même fichier idempotente d'un job à l'autre.
+        """
+        report = Counter()
+        total = len(file_paths)
+        if self.job_store is not None:
+            documents = [self._document_path(path, source_root) for path in file_paths]
+            finished = await self.job_store.start_job(
+                job_id, list(zip(file_paths, documents)), source_root
+            )
+            if finished:
+                # Reprise : les fichiers terminés avant l'interruption comptent déjà.
+                report.update(finished.values())
+                file_paths = [
+                    path
+                    for path, document in zip(file_paths, documents)
+                    if document not in finished
+                ]
+                logger.info(
+                    f"[{job_id}] Resuming job: {len(finished)}/{total} files already done."
+                )
+        logger.info(f"[{job_id}] Starting ingestion for {total} files.")
         await self.status_callback(
             {
                 "job_id": job_id,
                 "type": "status",
                 "status": "RUNNING",
-                "message": f"Starting ingestion for {len(file_paths)} files.",
+                "message": f"Starting ingestion for {total} files.",
             }
         )
 
-        for i, file_path in enumerate(file_paths):
-            if not os.path.exists(file_path):
-                logger.error(f"[{job_id}] File not found: {file_path}")
-                await self.status_callback(
-                    {
-                        "job_id": job_id,
-                        "type": "log",
-                        "level": "error",
-                        "message": f"File not found: {file_path}. Skipping.",
-                    }
-                )
-                continue
-
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    source_code = f.read()
-
-                log_message = f"({i+1}/{len(file_paths)}) Processing: {os.path.basename(file_path)}"
-                logger.info(f"[{job_id}] {log_message}")
-                await self.status_callback(
-                    {
-                        "job_id": job_id,
-                        "type": "log",
-                        "level": "info",
-                        "message": log_message,
-                    }
-                )
+        async def record(document: str, status: str):
+            report[status] += 1
+            metrics.increment("ingestion_files_total", status=status)
+            if self.job_store is not None:
+                await self.job_store.finish_file(job_id, document, status)
+            done = sum(report.values())
+            log_message = f"({done}/{total}) {status}: {os.path.basename(document)}"
+            logger.info(f"[{job_id}] {log_message}")
+            await self.status_callback(
+                {
+                    "job_id": job_id,
+                    "type": "log",
+                    "level": "info",
+                    "message": log_message,
+                    "progress": {"done": done, "total": total},
+                }
+            )
 
-                language = "python" if file_path.endswith(".py") else "unknown"
-                await self.director.process(
-                    file_path=file_path,
-                    source_code=source_code,
-                    language=language,
-                    job_id=job_id,
-                )
-            except Exception as e:
-                error_message = f"Failed to process {file_path}: {e}"
-                logger.error(f"[{job_id}] {error_message}", exc_info=True)
-                await self.status_callback(
-                    {
-                        "job_id": job_id,
-                        "type": "log",
-                        "level": "error",
-                        "message": error_message,
-                    }
-                )
+        # Le pipeline est initialisé une fois, avant que les workers ne l'utilisent.
+        await self.director.initialize_pipeline()
+        if self.streaming:
+            await self._run_streaming(job_id, file_paths, source_root, record)
+        else:
+            await self._run_pooled(job_id, file_paths, source_root, record)
 
-        final_message = "Ingestion job completed."
+        final_message = (
+            f"Ingestion job completed: {report['created']} created, "
+            f"{report['replaced']} replaced, {report['unchanged']} skipped (unchanged), "
+            f"{report['failed']} failed."
+        )
         logger.info(f"[{job_id}] {final_message}")
+        if self.job_store is not None:
+            await self.job_store.update_job(job_id, "SUCCESS", final_message)
         await self.status_callback(
             {
                 "job_id": job_id,
                 "type": "status",
                 "status": "SUCCESS",
                 "message": final_message,
+                "report": {
+                    key: report[key]
+                    for key in ("created", "replaced", "unchanged", "failed")
+                },
+            }
+        )
+
+    async def _run_pooled(self, job_id, file_paths, source_root, record):
+        """Chaque worker exécute le pipeline complet d'un fichier à la fois."""
+        limiter = ConcurrencyLimiter(
+            self.concurrency,
+            adaptive=self.adaptive,
+            max_limit=settings.INGESTION_MAX_CONCURRENCY if self.adaptive else None,
+        )
+        pending = iter(file_paths)
+
+        async def worker():
+            # L'itérateur est partagé : chaque fichier est pris par un seul worker.
+            for file_path in pending:
+                async with limiter.slot() as slot:
+                    status = await self._ingest_file(
+                        job_id, file_path, source_root, slot
+                    )
+                await record(self._document_path(file_path, source_root), status)
+
+        workers = min(limiter.max_limit, len(file_paths))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    async def _run_streaming(self, job_id, file_paths, source_root, record):
+        """Les étapes se chevauchent d'un fichier à l'autre (voir `process_stream`)."""
+
+        async def files():
+            for file_path in file_paths:
+                file = await self._read_file(job_id, file_path, source_root)
+                if file is None:
+                    await record(self._document_path(file_path, source_root), "failed")
+                else:
+                    yield file
+
+        async for item in self.director.process_stream(files(), job_id):
+            status = item.context.ingestion_status or "created"
+            if item.error is not None:
+                status = "failed"
+                await self._report_error(
+                    job_id, f"Failed to process {item.context.file_path}: {item.error}"
+                )
+            await record(item.context.file_path, status)
+
+    async def _read_file(
+        self, job_id: str, file_path: str, source_root: Optional[str]
+    ) -> Optional[Dict[str, str]]:
+        """Lit un fichier du job ; None (erreur publiée) s'il est introuvable ou illisible."""
+        if not os.path.exists(file_path):
+            logger.error(f"[{job_id}] File not found: {file_path}")
+            await self.status_callback(
+                {
+                    "job_id": job_id,
+                    "type": "log",
+                    "level": "error",
+                    "message": f"File not found: {file_path}. Skipping.",
+                }
+            )
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                source_code = f.read()
+        except Exception as e:
+            await self._report_error(
+                job_id, f"Failed to read {file_path}: {e}", exc_info=True
+            )
+            return None
+        metrics.increment("ingestion_bytes_total", os.path.getsize(file_path))
+        return {
+            "file_path": self._document_path(file_path, source_root),
+            "source_code": source_code,
+            "language": "python" if file_path.endswith(".py") else "unknown",
+        }
+
+    async def _ingest_file(
+        self, job_id: str, file_path: str, source_root: Optional[str], slot: Slot
+    ) -> str:
+        """
+        Ingère un fichier et retourne son statut (`failed` en cas d'erreur).
+
+        L'issue est reportée au limiteur : un échec du pipeline réduit la concurrence,
+        et les fichiers illisibles ou inchangés n'entrent pas dans la latence de référence.
+        """
+        file = await self._read_file(job_id, file_path, source_root)
+        if file is None:
+            slot.skip()
+            return "failed"
+        try:
+            context = await self.director.process(**file, job_id=job_id)
+        except Exception as e:
+            slot.fail()
+            await self._report_error(
+                job_id, f"Failed to process {file_path}: {e}", exc_info=True
+            )
+            return "failed"
+        if context.ingestion_status == "unchanged":
+            slot.skip()
+        return context.ingestion_status or "created"
+
+    @staticmethod
+    def _document_path(file_path: str, source_root: Optional[str]) -> str:
+        """
+        Identifiant du document d'un fichier : chemin relatif à `source_root` si fourni
+        (pour un upload, `<project>/<chemin de l'upload>`, voir `/ingest`).
+        """
+        return os.path.relpath(file_path, source_root) if source_root else file_path
+
+    async def _report_error(
+        self, job_id: str, error_message: str, exc_info: bool = False
+    ) -> None:
+        logger.error(f"[{job_id}] {error_message}", exc_info=exc_info)
+        await self.status_callback(
+            {
+                "job_id": job_id,
+                "type": "log",
+                "level": "error",
+                "message": error_message,
             }
         )
@@ -21,6 +21,17 @@ class JobManager:
         self.jobs[job_id] = job
         return job
 
+    def restore_job(self, job_id: str, files: List[str]) -> IngestionJob:
+        """Réenregistre un job interrompu (arrêt du service) au moment de sa reprise."""
+        job = IngestionJob(
+            job_id=job_id,
+            status="RUNNING",
+            details="Job interrupted by a restart; resuming from its last checkpoint.",
+            files=files,
+        )
+        self.jobs[job_id] = job
+        return job
+
     def get_job(self, job_id: str) -> IngestionJob | None:
         return self.jobs.get(job_id)
 
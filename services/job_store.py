@@ -0,0 +1,288 @@
+# FICHIER: analyzer-engine/services/job_store.py
+"""
+Persistance des jobs d'ingestion et de leurs points de contrôle (SQLite local).
+
+Chaque fichier d'un job a une ligne dans `job_files` :
+- `stage` : dernière étape du pipeline terminée pour ce fichier ;
+- `payload` / `embeddings` : contexte d'exécution sauvegardé après cette étape, dès
+  qu'il ne contient plus d'AST (après l'analyse, puis après le calcul des embeddings) ;
+- `status` : statut final (`created`, `replaced`, `unchanged`, `failed`), renseigné
+  quand le fichier est terminé ; son point de contrôle est alors effacé.
+
+Après un arrêt, un job non terminé est relancé sur ses seuls fichiers sans statut final,
+chacun repartant de l'étape qui suit son dernier point de contrôle : les embeddings déjà
+calculés ne sont pas redemandés au fournisseur.
+"""
+
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiosqlite
+import numpy as np
+
+from core.exceptions.base_exceptions import RepositoryError
+from ingestion.chunker import DocumentChunk
+from ingestion.orchestration.execution_context import ExecutionContext
+
+logger = logging.getLogger(__name__)
+
+JOB_DB_FILE = "ingestion_jobs.sqlite"
+# Statuts de job définitifs : les autres (PENDING, RUNNING) sont repris au démarrage.
+FINAL_JOB_STATUSES = ("SUCCESS", "FAILED")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    details TEXT NOT NULL DEFAULT '',
+    source_root TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id TEXT NOT NULL REFERENCES jobs(job_id) ON DELETE CASCADE,
+    document TEXT NOT NULL,
+    path TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    stage TEXT,
+    status TEXT,
+    payload BLOB,
+    embeddings BLOB,
+    PRIMARY KEY (job_id, document)
+);
+"""
+
+
+def encode_context(context: ExecutionContext) -> Tuple[bytes, Optional[bytes]]:
+    """
+    Sérialise un contexte sans AST : JSON compressé, et embeddings empilés en float32
+    (la précision stockée par pgvector), dans l'ordre des chunks qui en ont un.
+    """
+    embedded = [chunk.embedding for chunk in context.chunks if chunk.embedding]
+    state = {
+        "file_path": context.file_path,
+        "source_code": context.source_code,
+        "language": context.language,
+        "content_hash": context.content_hash,
+        "entities": context.entities,
+        "relationships": context.relationships,
+        "chunks": [
+            {
+                "content": chunk.content,
+                "index": chunk.index,
+                "start_char": chunk.start_char,
+                "end_char": chunk.end_char,
+                "metadata": chunk.metadata,
+                "token_count": chunk.token_count,
+                "embedded": bool(chunk.embedding),
+            }
+            for chunk in context.chunks
+        ],
+        "dimension": len(embedded[0]) if embedded else 0,
+    }
+    payload = zlib.compress(json.dumps(state).encode("utf-8"))
+    embeddings = np.asarray(embedded, dtype=np.float32).tobytes() if embedded else None
+    return payload, embeddings
+
+
+def decode_context(payload: bytes, embeddings: Optional[bytes]) -> ExecutionContext:
+    """Reconstruit le contexte sauvegardé par `encode_context`."""
+    state = json.loads(zlib.decompress(payload))
+    vectors = iter(
+        np.frombuffer(embeddings, dtype=np.float32)
+        .reshape(-1, state["dimension"])
+        .tolist()
+        if embeddings
+        else ()
+    )
+    chunks = []
+    for chunk in state["chunks"]:
+        embedded = chunk.pop("embedded")
+        chunks.append(
+            DocumentChunk(**chunk, embedding=next(vectors) if embedded else None)
+        )
+    return ExecutionContext(
+        file_path=state["file_path"],
+        source_code=state["source_code"],
+        language=state["language"],
+        content_hash=state["content_hash"],
+        entities=state["entities"],
+        relationships=state["relationships"],
+        chunks=chunks,
+    )
+
+
+class SQLiteJobStore:
+    """Jobs d'ingestion et points de contrôle par fichier et par étape (voir le module)."""
+
+    def __init__(self, db_path: str = JOB_DB_FILE):
+        self.db_path = db_path
+        self.conn: aiosqlite.Connection | None = None
+
+    async def initialize(self) -> None:
+        """Ouvre la base et crée le schéma si nécessaire (idempotent)."""
+        if self.conn is not None:
+            return
+        try:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            self.conn = await aiosqlite.connect(self.db_path)
+            self.conn.row_factory = aiosqlite.Row
+            # Un point de contrôle par étape et par fichier : pas de fsync par commit.
+            await self.conn.execute("PRAGMA journal_mode = WAL;")
+            await self.conn.execute("PRAGMA synchronous = NORMAL;")
+            await self.conn.execute("PRAGMA foreign_keys = ON;")
+            await self.conn.executescript(SCHEMA_SQL)
+            await self.conn.commit()
+            logger.info(f"SQLiteJobStore initialized. Database at: {self.db_path}")
+        except Exception as e:
+            logger.error(f"Failed to initialize SQLiteJobStore: {e}", exc_info=True)
+            raise RepositoryError(f"Failed to initialize SQLiteJobStore: {e}")
+
+    async def close(self) -> None:
+        if self.conn is not None:
+            await self.conn.close()
+            self.conn = None
+            logger.info("SQLiteJobStore connection closed.")
+
+    async def _write(self, sql: str, params: tuple = ()) -> None:
+        if self.conn is None:
+            await self.initialize()
+        try:
+            await self.conn.execute(sql, params)
+            await self.conn.commit()
+        except Exception as e:
+            raise RepositoryError(f"Job store write failed: {e}")
+
+    async def start_job(
+        self,
+        job_id: str,
+        files: List[Tuple[str, str]],
+        source_root: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """
+        Enregistre un job et ses fichiers, ou le reprend s'il existe déjà.
+
+        Args:
+            files: couples (chemin sur disque, document), le document étant l'identifiant
+                du fichier dans le pipeline (`ExecutionContext.file_path`).
+
+        Returns:
+            Le statut final des documents déjà terminés lors d'une exécution précédente.
+        """
+        if self.conn is None:
+            await self.initialize()
+        now = datetime.utcnow().isoformat()
+        try:
+            await self.conn.execute(
+                "INSERT INTO jobs (job_id, status, source_root, created_at, updated_at) "
+                "VALUES (?, 'RUNNING', ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET status = 'RUNNING', updated_at = ?",
+                (job_id, source_root, now, now, now),
+            )
+            await self.conn.executemany(
+                "INSERT OR IGNORE INTO job_files (job_id, document, path, position) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (job_id, document, path, position)
+                    for position, (path, document) in enumerate(files)
+                ],
+            )
+            await self.conn.commit()
+            async with self.conn.execute(
+                "SELECT document, status FROM job_files "
+                "WHERE job_id = ? AND status IS NOT NULL",
+                (job_id,),
+            ) as cursor:
+                return {
+                    row["document"]: row["status"] for row in await cursor.fetchall()
+                }
+        except Exception as e:
+            raise RepositoryError(f"Failed to start job {job_id}: {e}")
+
+    async def update_job(self, job_id: str, status: str, details: str) -> None:
+        """Met à jour le statut d'un job ; un statut final efface ses points de contrôle."""
+        await self._write(
+            "UPDATE jobs SET status = ?, details = ?, updated_at = ? WHERE job_id = ?",
+            (status, details, datetime.utcnow().isoformat(), job_id),
+        )
+        if status in FINAL_JOB_STATUSES:
+            await self._write(
+                "UPDATE job_files SET payload = NULL, embeddings = NULL WHERE job_id = ?",
+                (job_id,),
+            )
+
+    async def save_stage(
+        self, job_id: str, document: str, stage: str, context: ExecutionContext
+    ) -> None:
+        """
+        Note qu'une étape est terminée pour un document. Le contexte est sauvegardé s'il
+        ne contient plus d'AST ; sinon, le point de contrôle précédent est effacé.
+        """
+        payload, embeddings = (
+            encode_context(context) if context.normalized_ast is None else (None, None)
+        )
+        await self._write(
+            "UPDATE job_files SET stage = ?, payload = ?, embeddings = ? "
+            "WHERE job_id = ? AND document = ?",
+            (stage, payload, embeddings, job_id, document),
+        )
+
+    async def load_checkpoint(
+        self, job_id: str, document: str
+    ) -> Optional[Tuple[str, ExecutionContext]]:
+        """Retourne (dernière étape terminée, contexte sauvegardé) ou None."""
+        if self.conn is None:
+            await self.initialize()
+        async with self.conn.execute(
+            "SELECT stage, payload, embeddings FROM job_files "
+            "WHERE job_id = ? AND document = ? AND status IS NULL "
+            "AND payload IS NOT NULL",
+            (job_id, document),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return row["stage"], decode_context(row["payload"], row["embeddings"])
+
+    async def finish_file(self, job_id: str, document: str, status: str) -> None:
+        """Enregistre le statut final d'un document et efface son point de contrôle."""
+        await self._write(
+            "UPDATE job_files SET status = ?, payload = NULL, embeddings = NULL "
+            "WHERE job_id = ? AND document = ?",
+            (status, job_id, document),
+        )
+
+    async def interrupted_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Jobs sans statut final (arrêt en cours d'exécution), avec tous leurs fichiers dans
+        l'ordre d'origine : `job_id`, `source_root`, `paths`, `documents`.
+        """
+        if self.conn is None:
+            await self.initialize()
+        placeholders = ", ".join("?" for _ in FINAL_JOB_STATUSES)
+        async with self.conn.execute(
+            f"SELECT j.job_id, j.source_root, f.path, f.document FROM jobs j "
+            f"JOIN job_files f ON f.job_id = j.job_id "
+            f"WHERE j.status NOT IN ({placeholders}) ORDER BY j.created_at, f.position",
+            FINAL_JOB_STATUSES,
+        ) as cursor:
+            rows = await cursor.fetchall()
+        jobs: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            job = jobs.setdefault(
+                row["job_id"],
+                {
+                    "job_id": row["job_id"],
+                    "source_root": row["source_root"],
+                    "paths": [],
+                    "documents": [],
+                },
+            )
+            job["paths"].append(row["path"])
+            job["documents"].append(row["document"])
+        return list(jobs.values())
@@ -1,29 +1,127 @@
 -- FICHIER: sql/core/01_functions.sql
 -- Responsabilité Unique : Définir les fonctions stockées (logique métier en base).
 
--- Fonction de recherche par similarité vectorielle pure.
+-- Fonction de recherche par similarité vectorielle.
+-- search_mode :
+--   'exact'   : parcours ANN sur le vecteur pleine précision (comportement historique).
+--   'halfvec' : présélection sur la représentation demi-précision, puis re-scoring exact.
+--   'binary'  : présélection par distance de Hamming sur les codes de signe, puis re-scoring exact.
+--   Les modes compacts exigent l'index sur expression correspondant, créé à la demande
+--   (`python cli.py reindex --compact halfvec binary`) ; s'il manque, recherche exacte.
+-- rescore_count : nombre de candidats présélectionnés avant le re-scoring cosinus exact.
+-- Filtres (NULL = inactif), évalués pendant le parcours ANN sur les colonnes promues :
+--   filter_entity_types : chunks.entity_type parmi la liste ;
+--   filter_path_pattern : motif LIKE sur chunks.file_path (préfixe déjà échappé par l'appelant) ;
+--   filter_entity_name  : égalité sur chunks.entity_name.
+-- Avec des filtres, l'appelant active hnsw.iterative_scan : l'index poursuit son parcours
+-- jusqu'à réunir assez de lignes conformes. L'ordre « relaxed » n'étant pas strict, les
+-- candidats sont toujours re-triés par distance exacte.
 CREATE OR REPLACE FUNCTION match_chunks(
     query_embedding vector(768),
-    match_count INT DEFAULT 10
+    match_count INT DEFAULT 10,
+    search_mode TEXT DEFAULT 'exact',
+    rescore_count INT DEFAULT 40,
+    filter_entity_types TEXT[] DEFAULT NULL,
+    filter_path_pattern TEXT DEFAULT NULL,
+    filter_entity_name TEXT DEFAULT NULL
 )
 RETURNS TABLE (
     chunk_id UUID, document_id UUID, content TEXT, similarity FLOAT,
     metadata JSONB, document_title TEXT, document_source TEXT
 ) LANGUAGE plpgsql AS $$
+DECLARE
+    compact_index TEXT := CASE search_mode
+        WHEN 'halfvec' THEN 'idx_chunks_embedding_halfvec'
+        WHEN 'binary' THEN 'idx_chunks_embedding_binary'
+    END;
 BEGIN
-    RETURN QUERY
-    SELECT c.id, c.document_id, c.content, 1 - (c.embedding <=> query_embedding),
-           c.metadata, d.title, d.source
-    FROM chunks c JOIN documents d ON c.document_id = d.id
-    WHERE c.embedding IS NOT NULL
-    ORDER BY c.embedding <=> query_embedding
-    LIMIT match_count;
+    -- Les index compacts sont optionnels (`python cli.py reindex --compact ...`) : sans
+    -- index valide, la présélection parcourrait toute la table, la recherche exacte est
+    -- alors moins coûteuse pour un résultat au moins aussi bon.
+    IF compact_index IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM pg_index
+        WHERE indexrelid = to_regclass(compact_index) AND indisvalid
+    ) THEN
+        RAISE NOTICE 'Index % absent ou invalide : recherche exacte.', compact_index;
+        search_mode := 'exact';
+    END IF;
+
+    IF search_mode = 'halfvec' THEN
+        RETURN QUERY
+        WITH candidates AS MATERIALIZED (
+            SELECT ch.id FROM chunks ch
+            WHERE ch.embedding IS NOT NULL
+              AND (filter_entity_types IS NULL OR ch.entity_type = ANY(filter_entity_types))
+              AND (filter_path_pattern IS NULL OR ch.file_path LIKE filter_path_pattern)
+              AND (filter_entity_name IS NULL OR ch.entity_name = filter_entity_name)
+            ORDER BY ch.embedding::halfvec(768) <=> query_embedding::halfvec(768)
+            LIMIT GREATEST(rescore_count, match_count)
+        )
+        SELECT c.id, c.document_id, c.content, 1 - (c.embedding <=> query_embedding),
+               c.metadata, d.title, d.source
+        FROM candidates k
+        JOIN chunks c ON c.id = k.id
+        JOIN documents d ON c.document_id = d.id
+        ORDER BY c.embedding <=> query_embedding
+        LIMIT match_count;
+    ELSIF search_mode = 'binary' THEN
+        RETURN QUERY
+        WITH candidates AS MATERIALIZED (
+            SELECT ch.id FROM chunks ch
+            WHERE ch.embedding IS NOT NULL
+              AND (filter_entity_types IS NULL OR ch.entity_type = ANY(filter_entity_types))
+              AND (filter_path_pattern IS NULL OR ch.file_path LIKE filter_path_pattern)
+              AND (filter_entity_name IS NULL OR ch.entity_name = filter_entity_name)
+            ORDER BY binary_quantize(ch.embedding)::bit(768) <~> binary_quantize(query_embedding)
+            LIMIT GREATEST(rescore_count, match_count)
+        )
+        SELECT c.id, c.document_id, c.content, 1 - (c.embedding <=> query_embedding),
+               c.metadata, d.title, d.source
+        FROM candidates k
+        JOIN chunks c ON c.id = k.id
+        JOIN documents d ON c.document_id = d.id
+        ORDER BY c.embedding <=> query_embedding
+        LIMIT match_count;
+    ELSIF search_mode = 'exact' THEN
+        RETURN QUERY
+        WITH candidates AS MATERIALIZED (
+            SELECT ch.id FROM chunks ch
+            WHERE ch.embedding IS NOT NULL
+              AND (filter_entity_types IS NULL OR ch.entity_type = ANY(filter_entity_types))
+              AND (filter_path_pattern IS NULL OR ch.file_path LIKE filter_path_pattern)
+              AND (filter_entity_name IS NULL OR ch.entity_name = filter_entity_name)
+            ORDER BY ch.embedding <=> query_embedding
+            LIMIT match_count
+        )
+        SELECT c.id, c.document_id, c.content, 1 - (c.embedding <=> query_embedding),
+               c.metadata, d.title, d.source
+        FROM candidates k
+        JOIN chunks c ON c.id = k.id
+        JOIN documents d ON c.document_id = d.id
+        ORDER BY c.embedding <=> query_embedding
+        LIMIT match_count;
+    ELSE
+        RAISE EXCEPTION 'Unknown search_mode: %', search_mode;
+    END IF;
 END;
 $$;
 
 -- Fonction de recherche hybride (vecteur + texte plein).
+-- La branche vectorielle délègue à match_chunks et hérite donc de son search_mode
+-- et de ses filtres, appliqués à l'identique à la branche texte.
+-- La branche texte interroge la colonne générée content_tsv (index GIN) et ne garde que
+-- les text_match_count meilleurs chunks (par défaut match_count * 2).
+-- fusion :
+--   'linear' : text_weight * rang texte + (1 - text_weight) * similarité cosinus ; le rang
+--              ts_rank_cd est normalisé dans [0, 1[ (option 32 : rank / (rank + 1)).
+--   'rrf'    : Reciprocal Rank Fusion pondérée, w / (rrf_k + rang) sommé sur les deux
+--              branches ; insensible aux échelles de score.
 CREATE OR REPLACE FUNCTION hybrid_search(
-    query_embedding vector(768), query_text TEXT, match_count INT DEFAULT 10, text_weight FLOAT DEFAULT 0.3
+    query_embedding vector(768), query_text TEXT, match_count INT DEFAULT 10, text_weight FLOAT DEFAULT 0.3,
+    search_mode TEXT DEFAULT 'exact', rescore_count INT DEFAULT 40,
+    fusion TEXT DEFAULT 'linear', text_match_count INT DEFAULT NULL, rrf_k INT DEFAULT 60,
+    filter_entity_types TEXT[] DEFAULT NULL, filter_path_pattern TEXT DEFAULT NULL,
+    filter_entity_name TEXT DEFAULT NULL
 )
 RETURNS TABLE (
     chunk_id UUID, document_id UUID, content TEXT, combined_score FLOAT,
@@ -31,34 +129,60 @@ RETURNS TABLE (
     document_title TEXT, document_source TEXT
 ) LANGUAGE plpgsql AS $$
 BEGIN
+    IF fusion NOT IN ('linear', 'rrf') THEN
+        RAISE EXCEPTION 'Unknown fusion: %', fusion;
+    END IF;
+
     RETURN QUERY
     WITH vector_results AS (
-        SELECT id, 1 - (embedding <=> query_embedding) AS vector_sim
-        FROM chunks WHERE embedding IS NOT NULL
-        ORDER BY vector_sim DESC LIMIT match_count * 2
+        SELECT m.chunk_id AS id, m.similarity AS vector_sim,
+               row_number() OVER (ORDER BY m.similarity DESC) AS vector_rank
+        FROM match_chunks(
+            query_embedding, match_count * 2, search_mode, rescore_count,
+            filter_entity_types, filter_path_pattern, filter_entity_name
+        ) m
     ),
     text_results AS (
-        SELECT id, ts_rank_cd(to_tsvector('english', content), plainto_tsquery('english', query_text)) AS text_sim
-        FROM chunks WHERE to_tsvector('english', content) @@ plainto_tsquery('english', query_text)
+        SELECT ch.id, ts_rank_cd(ch.content_tsv, q.query, 32) AS text_sim,
+               row_number() OVER (ORDER BY ts_rank_cd(ch.content_tsv, q.query, 32) DESC) AS text_rank
+        FROM chunks ch, plainto_tsquery('english', query_text) AS q(query)
+        WHERE ch.content_tsv @@ q.query
+          AND (filter_entity_types IS NULL OR ch.entity_type = ANY(filter_entity_types))
+          AND (filter_path_pattern IS NULL OR ch.file_path LIKE filter_path_pattern)
+          AND (filter_entity_name IS NULL OR ch.entity_name = filter_entity_name)
+        ORDER BY text_sim DESC
+        LIMIT COALESCE(text_match_count, match_count * 2)
+    ),
+    fused AS (
+        SELECT COALESCE(v.id, t.id) AS id,
+               CASE WHEN fusion = 'rrf' THEN
+                   COALESCE((1 - text_weight) / (rrf_k + v.vector_rank), 0)
+                   + COALESCE(text_weight / (rrf_k + t.text_rank), 0)
+               ELSE
+                   COALESCE(v.vector_sim, 0) * (1 - text_weight) + COALESCE(t.text_sim, 0) * text_weight
+               END AS score,
+               COALESCE(v.vector_sim, 0) AS vector_sim,
+               COALESCE(t.text_sim, 0) AS text_sim
+        FROM vector_results v
+        FULL OUTER JOIN text_results t ON v.id = t.id
     )
-    SELECT c.id, c.document_id, c.content,
-           (COALESCE(v.vector_sim, 0) * (1 - text_weight) + COALESCE(t.text_sim, 0) * text_weight),
-           COALESCE(v.vector_sim, 0), COALESCE(t.text_sim, 0), c.metadata, d.title, d.source
-    FROM chunks c JOIN documents d ON c.document_id = d.id
-    LEFT JOIN vector_results v ON c.id = v.id
-    LEFT JOIN text_results t ON c.id = t.id
-    WHERE v.id IS NOT NULL OR t.id IS NOT NULL
-    ORDER BY combined_score DESC LIMIT match_count;
+    SELECT c.id, c.document_id, c.content, f.score::FLOAT, f.vector_sim::FLOAT, f.text_sim::FLOAT,
+           c.metadata, d.title, d.source
+    FROM fused f
+    JOIN chunks c ON c.id = f.id
+    JOIN documents d ON c.document_id = d.id
+    ORDER BY f.score DESC
+    LIMIT match_count;
 END;
 $$;
 
 -- Fonction utilitaire pour récupérer tous les chunks d'un document.
 CREATE OR REPLACE FUNCTION get_document_chunks(doc_id UUID)
-RETURNS TABLE (chunk_id UUID, content TEXT, chunk_index INTEGER, metadata JSONB)
+RETURNS TABLE (chunk_id UUID, content TEXT, chunk_index INTEGER, metadata JSONB, embedding vector(768))
 LANGUAGE plpgsql AS $$
 BEGIN
     RETURN QUERY
-    SELECT id, chunks.content, chunks.chunk_index, chunks.metadata
+    SELECT id, chunks.content, chunks.chunk_index, chunks.metadata, chunks.embedding
     FROM chunks WHERE document_id = doc_id ORDER BY chunk_index;
 END;
 $$;
\ No newline at end of file
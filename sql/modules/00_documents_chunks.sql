@@ -7,8 +7,15 @@ CREATE TABLE documents (
     source TEXT NOT NULL,
     content TEXT NOT NULL,
     metadata JSONB DEFAULT '{}',
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+    -- Empreinte SHA-256 du contenu source : un document est identifié par (source, content_hash).
+    content_hash TEXT NOT NULL,
+    -- Statistiques tenues à jour par le chemin d'écriture (PostgresRepository) :
+    -- évite un COUNT/SUM sur toute la table chunks à chaque listing.
+    chunk_count INTEGER NOT NULL DEFAULT 0,
+    total_tokens BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT uq_documents_source_content_hash UNIQUE (source, content_hash)
 );
 
 CREATE TABLE chunks (
@@ -19,13 +26,29 @@ CREATE TABLE chunks (
     chunk_index INTEGER NOT NULL,
     metadata JSONB DEFAULT '{}',
     token_count INTEGER,
+    -- Empreinte SHA-256 du contenu du chunk, clé du diff lors d'un remplacement de document.
+    content_hash TEXT NOT NULL,
+    -- Vecteur plein texte précalculé à l'écriture, interrogé par hybrid_search.
+    content_tsv tsvector GENERATED ALWAYS AS (to_tsvector('english', content)) STORED,
+    -- Champs d'entité promus depuis metadata pour le filtrage indexé des recherches.
+    file_path TEXT GENERATED ALWAYS AS (metadata->>'file_path') STORED,
+    entity_type TEXT GENERATED ALWAYS AS (metadata->>'entity_type') STORED,
+    entity_name TEXT GENERATED ALWAYS AS (metadata->>'entity_name') STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Index pour la performance
 CREATE INDEX idx_documents_metadata ON documents USING GIN (metadata);
-CREATE INDEX idx_documents_created_at ON documents (created_at DESC);
+-- Clé de la pagination par curseur (keyset) de list_documents_page.
+CREATE INDEX idx_documents_created_at ON documents (created_at DESC, id DESC);
 CREATE INDEX idx_chunks_document_id ON chunks (document_id);
 CREATE INDEX idx_chunks_chunk_index ON chunks (document_id, chunk_index);
-CREATE INDEX idx_chunks_content_trgm ON chunks USING GIN (content gin_trgm_ops);
-CREATE INDEX idx_chunks_embedding ON chunks USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
\ No newline at end of file
+CREATE INDEX idx_chunks_content_tsv ON chunks USING GIN (content_tsv);
+-- text_pattern_ops : sert les filtres par préfixe de chemin (LIKE 'services/%').
+CREATE INDEX idx_chunks_file_path ON chunks (file_path text_pattern_ops);
+CREATE INDEX idx_chunks_entity_type ON chunks (entity_type);
+CREATE INDEX idx_chunks_entity_name ON chunks (entity_name);
+-- Index ANN géré : HNSW ne dépend pas des données présentes à sa création (contrairement
+-- à IVFFlat). `python cli.py reindex [--method hnsw|ivfflat]` le reconstruit avec des
+-- paramètres dimensionnés sur le corpus (voir ingestion/storage/vector_index.py).
+CREATE INDEX idx_chunks_embedding ON chunks USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
\ No newline at end of file
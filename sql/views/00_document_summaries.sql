@@ -9,9 +9,7 @@ SELECT
     d.created_at,
     d.updated_at,
     d.metadata,
-    COUNT(c.id) AS chunk_count,
-    AVG(c.token_count) AS avg_tokens_per_chunk,
-    SUM(c.token_count) AS total_tokens
-FROM documents d
-LEFT JOIN chunks c ON d.id = c.document_id
-GROUP BY d.id;
\ No newline at end of file
+    d.chunk_count,
+    d.total_tokens::NUMERIC / NULLIF(d.chunk_count, 0) AS avg_tokens_per_chunk,
+    d.total_tokens
+FROM documents d;
\ No newline at end of file
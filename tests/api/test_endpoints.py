@@ -0,0 +1,55 @@
+# FICHIER: tests/api/test_endpoints.py
+# Tests unitaires de l'identification des documents uploadés.
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.dependencies import get_job_manager, get_job_store, get_websocket_manager
+from api.v1 import endpoints
+from api.v1.endpoints import document_names
+from config import settings
+from services.job_manager import JobManager
+
+
+@pytest.mark.unit
+def test_uploaded_documents_are_keyed_on_project_and_path():
+    names = document_names("shop", ["pkg/utils.py", "lib\\utils.py", "./__init__.py"])
+
+    assert names == ["shop/pkg/utils.py", "shop/lib/utils.py", "shop/__init__.py"]
+    assert document_names("other", ["pkg/utils.py"]) == ["other/pkg/utils.py"]
+    for project, filenames in [
+        ("shop", ["../etc/passwd"]),
+        ("shop", ["a/utils.py", "a//utils.py"]),
+        ("", ["utils.py"]),
+    ]:
+        with pytest.raises(ValueError):
+            document_names(project, filenames)
+
+
+@pytest.mark.unit
+def test_upload_without_project_uses_the_default_prefix(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_UPLOAD_DIR", str(tmp_path))
+    started = []
+
+    async def fake_ingestion(job_id, file_paths, *args):
+        started.append(file_paths)
+
+    monkeypatch.setattr(endpoints, "run_ingestion_background", fake_ingestion)
+    app = FastAPI()
+    app.include_router(endpoints.router, prefix="/api/v1")
+    job_manager = JobManager()
+    app.dependency_overrides[get_job_manager] = lambda: job_manager
+    app.dependency_overrides[get_job_store] = lambda: None
+    app.dependency_overrides[get_websocket_manager] = lambda: None
+
+    response = TestClient(app).post(
+        "/api/v1/ingest", files=[("files", ("pkg/utils.py", b"x = 1\n"))]
+    )
+
+    assert response.status_code == 202
+    job = job_manager.get_job(response.json()["job_id"])
+    assert job.files == [f"{settings.INGEST_DEFAULT_PROJECT}/pkg/utils.py"]
+    assert started[0][0] == str(
+        next(tmp_path.iterdir()) / settings.INGEST_DEFAULT_PROJECT / "pkg" / "utils.py"
+    )
+    assert document_names(None, ["utils.py"]) == ["default/utils.py"]
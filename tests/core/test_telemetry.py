@@ -0,0 +1,88 @@
+# FICHIER: tests/core/test_telemetry.py
+# Tests unitaires du registre de métriques et de l'instrumentation des étapes.
+from contextlib import contextmanager
+
+import pytest
+
+from core import telemetry
+from core.telemetry import MetricsRegistry, instrument, metrics
+from ingestion.orchestration.execution_context import ExecutionContext
+from ingestion.orchestration.stages.base_stage import IPipelineStage, run_stage
+
+
+class RecordingSpan:
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+
+    def is_recording(self):
+        return True
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        span = RecordingSpan(name, attributes or {})
+        self.spans.append(span)
+        yield span
+
+
+class ChunkingStage(IPipelineStage):
+    async def execute(self, context, job_id):
+        context.entities = [{"name": "f"}, {"name": "g"}]
+        return context
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    tracer = RecordingTracer()
+    monkeypatch.setattr(telemetry, "_tracer", tracer)
+    metrics.reset()
+    yield tracer
+    metrics.reset()
+
+
+@pytest.mark.unit
+def test_registry_renders_counters_and_cumulative_histograms():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.increment("files_total", status="created")
+    registry.increment("files_total", 2, status="created")
+    for value in (0.05, 0.5, 3.0):
+        registry.observe("latency_seconds", value, operation="embed")
+
+    text = registry.render_prometheus()
+    snapshot = registry.snapshot()
+
+    assert 'files_total{status="created"} 3' in text
+    assert 'latency_seconds_bucket{operation="embed",le="1"} 2' in text
+    assert 'latency_seconds_bucket{operation="embed",le="+Inf"} 3' in text
+    assert snapshot["histograms"]["latency_seconds"]["operation=embed"]["sum"] == 3.55
+
+    disabled = MetricsRegistry(enabled=False)
+    disabled.increment("files_total")
+    assert disabled.snapshot() == {"counters": {}, "histograms": {}}
+
+
+@pytest.mark.unit
+async def test_stage_spans_carry_volumes_and_latency_by_outcome(tracer):
+    context = ExecutionContext(file_path="a.py", source_code="x = 1\n", language="py")
+
+    await run_stage(ChunkingStage(), context, "job-1")
+    with pytest.raises(RuntimeError):
+        with instrument("provider.embed_batch", **{"texts.count": 3, "skip": None}):
+            raise RuntimeError("quota")
+
+    stage_span, provider_span = tracer.spans
+    durations = metrics.snapshot()["histograms"][telemetry.OPERATION_DURATION]
+    assert stage_span.name == "stage.ChunkingStage"
+    assert stage_span.attributes["file.chars"] == 6
+    assert stage_span.attributes["entities.count"] == 2
+    assert provider_span.attributes == {"texts.count": 3}
+    assert durations["operation=stage.ChunkingStage,outcome=ok"]["count"] == 1
+    assert durations["operation=provider.embed_batch,outcome=error"]["count"] == 1
@@ -0,0 +1,62 @@
+# FICHIER: tests/ingestion/orchestration/test_concurrency_limiter.py
+# Tests unitaires du limiteur de concurrence de l'ingestion.
+import asyncio
+
+import pytest
+
+from ingestion.orchestration.concurrency_limiter import ConcurrencyLimiter
+
+
+async def run_tasks(limiter, count, delay=0.001, fail=lambda i: False, skip=False):
+    peak = 0
+
+    async def task(i):
+        nonlocal peak
+        async with limiter.slot() as slot:
+            peak = max(peak, limiter.in_flight)
+            await asyncio.sleep(delay)
+            if skip:
+                slot.skip()
+            if fail(i):
+                raise RuntimeError("boom")
+
+    await asyncio.gather(*(task(i) for i in range(count)), return_exceptions=True)
+    return peak
+
+
+@pytest.mark.unit
+async def test_fixed_limit_bounds_in_flight():
+    limiter = ConcurrencyLimiter(3)
+
+    peak = await run_tasks(limiter, 20)
+
+    assert peak == 3
+    assert limiter.limit == 3 and limiter.in_flight == 0
+
+
+@pytest.mark.unit
+async def test_adaptive_limit_grows_then_backs_off_on_failures():
+    # Tolérance large : la croissance ne doit pas dépendre de la gigue du planificateur.
+    limiter = ConcurrencyLimiter(2, adaptive=True, max_limit=6, tolerance=50.0)
+
+    await run_tasks(limiter, 100)
+    grown = limiter.limit
+    await run_tasks(limiter, 12, fail=lambda i: True)
+
+    assert grown == 6
+    assert limiter.limit < grown
+    assert limiter.limit >= limiter.min_limit
+    with pytest.raises(ValueError):
+        ConcurrencyLimiter(0)
+
+
+@pytest.mark.unit
+async def test_skipped_slots_do_not_lower_the_latency_baseline():
+    # Des fichiers inchangés quasi instantanés ne doivent pas faire paraître lents
+    # les fichiers réellement traités ensuite.
+    limiter = ConcurrencyLimiter(2, adaptive=True, max_limit=4, tolerance=50.0)
+
+    await run_tasks(limiter, 40, delay=0, skip=True)
+    await run_tasks(limiter, 20, delay=0.01)
+
+    assert limiter.limit >= 2
@@ -0,0 +1,44 @@
+# FICHIER: tests/ingestion/orchestration/test_execution_context.py
+# Tests unitaires du contexte d'exécution allégé et des chunks typés.
+import uuid
+
+import pytest
+
+from ingestion.chunker import DocumentChunk
+from ingestion.orchestration.execution_context import ExecutionContext
+from ingestion.orchestration.stages.analysis_stage import AnalysisStage
+from ingestion.orchestration.stages.parsing_stage import ParsingStage
+from ingestion.storage.repositories.postgres_repository import PostgresRepository
+
+
+@pytest.mark.unit
+async def test_ast_is_released_once_analysis_is_done():
+    context = ExecutionContext(
+        file_path="mod.py",
+        source_code="def f():\n    return 1\n",
+        language="python",
+    )
+
+    context = await ParsingStage().execute(context, "job")
+    assert context.normalized_ast is not None
+    context = await AnalysisStage().execute(context, "job")
+
+    assert context.normalized_ast is None
+    assert any(entity["name"] == "f" for entity in context.entities)
+    assert not hasattr(context, "__dict__")
+    assert ExecutionContext("a.py", "", "python").chunks is not context.chunks
+
+
+@pytest.mark.unit
+def test_typed_chunks_are_stored_without_conversion():
+    embedding = [0.5, 0.25]
+    chunk = DocumentChunk("def f(): ...", 0, 0, 12, {"entity_name": "f"})
+    chunk.embedding = embedding
+    pending = DocumentChunk("x = 1", 1, 0, 5, {})
+    as_dict = {"content": "def f(): ...", "embedding": embedding, "index": 0}
+    as_dict.update(metadata={"entity_name": "f"}, token_count=chunk.token_count)
+
+    records = PostgresRepository._chunk_records(uuid.UUID(int=0), [chunk, pending])
+
+    assert len(records) == 1 and records[0][2] is embedding
+    assert records == PostgresRepository._chunk_records(uuid.UUID(int=0), [as_dict])
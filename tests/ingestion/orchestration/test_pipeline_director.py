@@ -1,7 +1,11 @@
 import pytest
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
+from ingestion.orchestration import pipeline_director
 from ingestion.orchestration.pipeline_director import PipelineDirector
 from ingestion.orchestration.execution_context import ExecutionContext
+from ingestion.storage.repositories.memory_graph_repository import (
+    InMemoryCodeRepository,
+)
 
 
 @pytest.mark.unit
@@ -43,7 +47,10 @@ async def test_pipeline_director_stage_execution_order(mocker):
 
     # Act: Exécuter le processus sur le directeur patché
     final_context = await director.process(
-        initial_context.file_path, initial_context.source_code, initial_context.language
+        initial_context.file_path,
+        initial_context.source_code,
+        initial_context.language,
+        job_id="job",
     )
 
     # Assert: Vérifier que les mocks ont été appelés correctement
@@ -57,3 +64,71 @@ async def test_pipeline_director_stage_execution_order(mocker):
 
     # Vérifier que le contexte final est bien celui retourné par la dernière étape
     assert final_context == context_after_stage2
+
+
+@pytest.mark.unit
+async def test_pipeline_director_skips_unchanged_file(mocker):
+    """Un fichier déjà ingéré avec la même empreinte ne traverse aucune étape."""
+    stage = AsyncMock()
+    director = PipelineDirector()
+    mocker.patch.object(director, "pipeline", [stage])
+    director.vector_repo = AsyncMock()
+    director.vector_repo.is_document_unchanged.return_value = True
+
+    context = await director.process("test.py", "x = 1\n", "python", job_id="job")
+
+    assert context.ingestion_status == "unchanged"
+    stage.execute.assert_not_called()
+    source, content_hash = director.vector_repo.is_document_unchanged.call_args.args
+    assert source == "test.py"
+    assert content_hash == context.content_hash
+
+
+@pytest.mark.unit
+async def test_injected_code_repo_receives_graph_writes(monkeypatch):
+    """Un repository injecté (graphe en mémoire) n'est pas contourné par l'écrivain partagé."""
+    monkeypatch.setattr(pipeline_director, "get_db_pool", AsyncMock(return_value=None))
+    monkeypatch.setattr(
+        pipeline_director,
+        "get_storage_writer",
+        AsyncMock(side_effect=AssertionError("shared writer must not be used")),
+    )
+    code_repo = InMemoryCodeRepository()
+    director = PipelineDirector(code_repo=code_repo)
+    await director.initialize_pipeline()
+    director.vector_repo.is_document_unchanged = AsyncMock(return_value=False)
+    director.vector_repo.save_document_with_chunks = AsyncMock(
+        return_value={"status": "created"}
+    )
+    director.pipeline[2].embedder.embed_chunks = AsyncMock(side_effect=lambda c: c)
+
+    context = await director.process(
+        "mod.py", "def f():\n    return 1\n", "python", job_id="job"
+    )
+
+    assert context.ingestion_status == "created"
+    assert await code_repo.find_entity_relationships("f")
+
+
+@pytest.mark.unit
+async def test_group_commit_pipeline_uses_the_writer_repository(monkeypatch):
+    """Avec l'écrivain partagé, aucun repository SQLite propre au pipeline n'est ouvert."""
+    writer = AsyncMock()
+    monkeypatch.setattr(pipeline_director, "get_db_pool", AsyncMock(return_value=None))
+    monkeypatch.setattr(
+        pipeline_director, "get_storage_writer", AsyncMock(return_value=writer)
+    )
+    monkeypatch.setattr(
+        pipeline_director.settings, "STORAGE_GROUP_COMMIT_ENABLED", True
+    )
+    monkeypatch.setattr(
+        pipeline_director,
+        "SQLiteGraphRepository",
+        MagicMock(side_effect=AssertionError("no pipeline-local SQLite repository")),
+    )
+
+    director = PipelineDirector()
+    await director.initialize_pipeline()
+
+    storage = director.pipeline[3]
+    assert storage.writer is writer and storage.code_repo is writer.code_repo
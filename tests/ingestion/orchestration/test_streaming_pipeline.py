@@ -0,0 +1,100 @@
+# FICHIER: tests/ingestion/orchestration/test_streaming_pipeline.py
+# Tests unitaires du pipeline en flux (chevauchement, erreurs, contre-pression, arrêt).
+import asyncio
+
+import pytest
+
+from ingestion.orchestration.execution_context import ExecutionContext
+from ingestion.orchestration.stages.base_stage import IPipelineStage
+from ingestion.orchestration.streaming_pipeline import PipelineItem, StreamingPipeline
+
+
+class RecordingStage(IPipelineStage):
+    """Étape simulée : journalise son exécution et échoue sur les fichiers `bad_*`."""
+
+    active = set()
+    overlaps = 0
+
+    def __init__(self, name, delay=0.002):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.seen = []
+
+    async def execute(self, context, job_id):
+        RecordingStage.active.add(self.name)
+        if len(RecordingStage.active) > 1:
+            RecordingStage.overlaps += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if context.file_path.startswith(f"bad_{self.name}"):
+                raise RuntimeError(f"{self.name} failed")
+            self.seen.append(context.file_path)
+            return context
+        finally:
+            RecordingStage.active.discard(self.name)
+
+
+async def source(names, pulled=None):
+    for name in names:
+        if pulled is not None:
+            pulled.append(name)
+        yield PipelineItem(
+            ExecutionContext(file_path=name, source_code="", language="python")
+        )
+
+
+@pytest.mark.unit
+async def test_stages_overlap_and_failures_stay_per_file():
+    RecordingStage.overlaps = 0
+    stages = [RecordingStage("parse"), RecordingStage("embed"), RecordingStage("store")]
+    names = [f"f{i}.py" for i in range(8)] + ["bad_embed.py"]
+
+    results = [
+        item
+        async for item in StreamingPipeline(stages, {"RecordingStage": 2}).run(
+            source(names), "job"
+        )
+    ]
+
+    failed = [item for item in results if item.error is not None]
+    assert sorted(item.context.file_path for item in results) == sorted(names)
+    assert [item.context.file_path for item in failed] == ["bad_embed.py"]
+    assert "bad_embed.py" in stages[0].seen and "bad_embed.py" not in stages[2].seen
+    assert RecordingStage.overlaps > 0
+
+
+@pytest.mark.unit
+async def test_backpressure_bounds_files_in_flight():
+    pulled = []
+    pipeline = StreamingPipeline([RecordingStage("a", 0)], queue_size=1)
+    stream = pipeline.run(source([f"f{i}.py" for i in range(50)], pulled), "job")
+
+    first = await stream.__anext__()
+    await asyncio.sleep(0.01)
+    ahead = len(pulled)
+    await stream.aclose()
+
+    assert first.context.file_path == "f0.py"
+    # Entrée + sortie (1 chacune), 1 en cours d'exécution, 1 bloqué dans `put`.
+    assert ahead <= 5
+
+
+@pytest.mark.unit
+async def test_close_and_source_errors_stop_all_workers():
+    async def broken():
+        yield PipelineItem(
+            ExecutionContext(file_path="ok.py", source_code="", language="python")
+        )
+        raise OSError("disk gone")
+
+    before = len(asyncio.all_tasks())
+    pipeline = StreamingPipeline([RecordingStage("a"), RecordingStage("b")])
+    with pytest.raises(OSError):
+        async for _ in pipeline.run(broken(), "job"):
+            pass
+    stream = pipeline.run(source([f"f{i}.py" for i in range(20)]), "job")
+    await stream.__anext__()
+    await stream.aclose()
+
+    assert len(asyncio.all_tasks()) == before
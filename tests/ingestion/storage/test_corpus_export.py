@@ -0,0 +1,68 @@
+# FICHIER: tests/ingestion/storage/test_corpus_export.py
+# Tests unitaires de la sérialisation en flux de l'export du corpus.
+import base64
+import io
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from ingestion.storage.corpus_export import (
+    encode_ndjson,
+    export_stream,
+    validate_export,
+)
+
+
+def make_chunk(i: int):
+    return {
+        "id": f"id-{i}",
+        "chunk_index": i,
+        "content": f"def f{i}(): pass",
+        "metadata": json.dumps({"file_path": "a.py"}),
+        "embedding": np.full(4, i, dtype=np.float32),
+    }
+
+
+async def batches(*groups):
+    for group in groups:
+        yield group
+
+
+@pytest.mark.unit
+def test_ndjson_encodes_embedding_as_little_endian_float32_base64():
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    line = encode_ndjson([{**make_chunk(2), "created_at": created_at}])
+
+    data = json.loads(line)
+    assert line.endswith(b"\n")
+    assert data["metadata"] == {"file_path": "a.py"}
+    assert data["created_at"] == created_at.isoformat()
+    embedding = np.frombuffer(base64.b64decode(data["embedding_b64"]), dtype="<f4")
+    assert embedding.tolist() == [2.0] * 4
+
+
+@pytest.mark.unit
+def test_validate_export_rejects_unknown_table_and_format():
+    with pytest.raises(ValueError):
+        validate_export("entities", "ndjson")
+    with pytest.raises(ValueError):
+        validate_export("chunks", "csv")
+
+
+@pytest.mark.unit
+async def test_arrow_stream_emits_one_record_batch_per_fetch():
+    pa = pytest.importorskip("pyarrow")
+    chunks = [make_chunk(i) for i in range(5)]
+
+    parts = [
+        part async for part in export_stream(batches(chunks[:3], chunks[3:]), "arrow")
+    ]
+    reader = pa.ipc.open_stream(io.BytesIO(b"".join(parts)))
+    record_batches = list(reader)
+
+    assert [b.num_rows for b in record_batches] == [3, 2]
+    assert reader.schema.field("embedding").type == pa.list_(pa.float32())
+    table = pa.Table.from_batches(record_batches)
+    assert table.column("embedding")[4].as_py() == [4.0] * 4
@@ -0,0 +1,91 @@
+# FICHIER: tests/ingestion/storage/test_graph_archive.py
+# Tests unitaires de l'archive binaire du graphe (export / import à chaud).
+import numpy as np
+import pytest
+
+from ingestion.storage.graph_archive import GraphArchive, decode_archive, encode_archive
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+def make_archive():
+    return GraphArchive(
+        entity_ids=np.array([3, 7, 8, 42], dtype=np.int64),
+        names=["main", "helper", "Parser", "é_unicode"],
+        file_paths=["a.py", "a.py", "b.py", "b.py"],
+        types=["FUNCTION", "FUNCTION", "CLASS", "FUNCTION"],
+        source_codes=["def main(): ...", "", "class Parser: ...", "# é"],
+        edge_sources=np.array([42, 3, 3, 7], dtype=np.int64),
+        edge_targets=np.array([3, 8, 7, 8], dtype=np.int64),
+        edge_types=["CALLS", "USES_TYPE", "CALLS", "USES_TYPE"],
+    )
+
+
+def edge_set(archive):
+    return set(
+        zip(
+            archive.edge_sources.tolist(),
+            archive.edge_targets.tolist(),
+            archive.edge_types,
+        )
+    )
+
+
+@pytest.mark.unit
+def test_archive_round_trip():
+    archive = make_archive()
+
+    decoded = decode_archive(encode_archive(archive))
+
+    assert decoded.entity_ids.tolist() == [3, 7, 8, 42]
+    assert decoded.names == archive.names
+    assert decoded.file_paths == archive.file_paths
+    assert decoded.types == archive.types
+    assert decoded.source_codes == archive.source_codes
+    assert edge_set(decoded) == edge_set(archive)
+
+
+@pytest.mark.unit
+def test_corrupted_archive_is_rejected():
+    data = bytearray(encode_archive(make_archive()))
+    data[-1] ^= 0xFF
+
+    with pytest.raises(ValueError, match="checksum"):
+        decode_archive(bytes(data))
+    with pytest.raises(ValueError, match="magic"):
+        decode_archive(b"XXXX" + bytes(data[4:]))
+
+
+@pytest.mark.unit
+async def test_export_then_import_restores_graph(sqlite_repo, tmp_path):
+    await sqlite_repo.add_code_structure(
+        {
+            "file_path": "a.py",
+            "entities": [
+                {"name": "main", "type": "FUNCTION", "source_code": "def main(): ..."},
+                {"name": "helper", "type": "FUNCTION"},
+            ],
+            "relationships": [{"source": "main", "target": "helper", "type": "CALLS"}],
+        }
+    )
+    archive_path = str(tmp_path / "graph.aega")
+    exported = await sqlite_repo.export_archive(archive_path)
+
+    replica = SQLiteGraphRepository(db_path=str(tmp_path / "replica.sqlite"))
+    await replica.initialize()
+    try:
+        imported = await replica.import_archive(archive_path)
+        results = await replica.find_entity_relationships("main")
+        stats = await replica.compute_entity_stats()
+        with pytest.raises(ValueError):
+            await replica.import_archive(archive_path)
+    finally:
+        await replica.close()
+
+    assert exported["entities"] == imported["entities"] == 2
+    assert imported["relationships"] == 1
+    assert [(r["source"], r["target"]) for r in results] == [
+        ("main (FUNCTION)", "helper (FUNCTION)")
+    ]
+    assert stats == {"entities": 2, "relationships": 1}
@@ -0,0 +1,140 @@
+# FICHIER: tests/ingestion/storage/test_graph_snapshot.py
+# Tests unitaires de l'instantané CSR du graphe et des métriques persistées.
+import numpy as np
+import pytest
+
+from ingestion.storage.graph_snapshot import CSRGraph, encode_edges
+
+
+def make_graph(edges, ids=None):
+    sources, targets = zip(*edges)
+    ids = np.array(ids or sorted(set(sources) | set(targets)), dtype=np.int64)
+    return CSRGraph(ids, encode_edges(sources, targets, [0] * len(edges)))
+
+
+@pytest.mark.unit
+def test_degrees_and_bfs_depths():
+    graph = make_graph(
+        [(10, 20), (20, 30), (30, 10), (30, 40)], ids=[10, 20, 30, 40, 50]
+    )
+
+    assert graph.out_degree().tolist() == [1, 1, 2, 0, 0]
+    assert graph.in_degree().tolist() == [1, 1, 1, 1, 0]
+    assert graph.bfs([10]).tolist() == [0, 1, 2, 3, -1]
+    assert graph.bfs([10], max_depth=1).tolist() == [0, 1, -1, -1, -1]
+    assert graph.bfs([40], direction="incoming").tolist() == [3, 2, 1, 0, -1]
+
+
+@pytest.mark.unit
+def test_pagerank_sums_to_one_and_favours_hubs():
+    graph = make_graph([(1, 4), (2, 4), (3, 4), (4, 1)])
+
+    rank = graph.pagerank()
+
+    assert rank.sum() == pytest.approx(1.0)
+    assert rank.argmax() == graph.positions([4])[0]
+
+
+@pytest.mark.unit
+def test_edge_keys_reject_ids_outside_their_bit_fields():
+    (key,) = encode_edges([(1 << 30) - 1], [(1 << 31) - 1], [3])
+    assert key == np.iinfo(np.int64).max
+
+    for sources, targets, types in (
+        ([1 << 30], [1], [0]),
+        ([1], [1 << 31], [0]),
+        ([1], [-1], [0]),
+        ([1], [2], [4]),
+    ):
+        with pytest.raises(ValueError):
+            encode_edges(sources, targets, types)
+
+
+@pytest.mark.unit
+def test_apply_changes_keeps_last_operation():
+    graph = make_graph([(1, 2), (2, 3)])
+
+    updated = graph.apply_changes(
+        [
+            (1, "N+", 4, None, None),
+            (2, "E+", 3, 4, 0),
+            (3, "E-", 1, 2, 0),
+            (4, "E+", 1, 2, 0),
+            (5, "E-", 2, 3, 0),
+        ]
+    )
+
+    assert updated.watermark == 5
+    assert updated.ids.tolist() == [1, 2, 3, 4]
+    assert updated.edge_count == 2
+    assert updated.bfs([1]).tolist() == [0, 1, -1, -1]
+
+
+async def ingest(repo, path, names, calls):
+    await repo.add_code_structure(
+        {
+            "file_path": path,
+            "entities": [{"name": n, "type": "FUNCTION"} for n in names],
+            "relationships": [
+                {"source": a, "target": b, "type": "CALLS"} for a, b in calls
+            ],
+        }
+    )
+
+
+@pytest.mark.unit
+async def test_incremental_refresh_matches_full_rebuild(sqlite_repo):
+    await ingest(sqlite_repo, "a.py", ["a", "b", "c"], [("a", "c"), ("b", "c")])
+    await sqlite_repo.compute_entity_stats()
+    await ingest(sqlite_repo, "b.py", ["d"], [])
+    await sqlite_repo.conn.execute(
+        "DELETE FROM entities WHERE name = 'a' AND file_path = 'a.py'"
+    )
+    await sqlite_repo.conn.commit()
+
+    refreshed = await sqlite_repo.refresh_graph_snapshot()
+    rebuilt = await sqlite_repo.build_graph_snapshot()
+
+    assert refreshed.ids.tolist() == rebuilt.ids.tolist()
+    assert refreshed.edge_keys.tolist() == rebuilt.edge_keys.tolist()
+
+
+async def journal_size(repo):
+    async with repo.conn.execute("SELECT COUNT(*) FROM graph_changes") as cursor:
+        return (await cursor.fetchone())[0]
+
+
+@pytest.mark.unit
+async def test_change_journal_stays_bounded(sqlite_repo):
+    # Sans instantané, les écritures ne sont pas journalisées.
+    await ingest(sqlite_repo, "a.py", ["a", "b"], [("a", "b")])
+    assert await journal_size(sqlite_repo) == 0
+
+    await sqlite_repo.refresh_graph_snapshot()
+    for i in range(3):
+        await ingest(sqlite_repo, f"m{i}.py", ["c", "d"], [("c", "d")])
+        assert await journal_size(sqlite_repo) > 0
+        snapshot = await sqlite_repo.refresh_graph_snapshot()
+        assert await journal_size(sqlite_repo) == 0
+    assert snapshot.node_count == 8
+
+    # Un redémarrage coupe le journal : l'instantané suivant est reconstruit en entier.
+    await sqlite_repo._create_tables_if_not_exists()
+    await ingest(sqlite_repo, "z.py", ["z"], [])
+    assert await journal_size(sqlite_repo) == 0
+    assert (await sqlite_repo.refresh_graph_snapshot()).node_count == 9
+
+
+@pytest.mark.unit
+async def test_entity_stats_are_persisted_and_ranked(sqlite_repo):
+    await ingest(sqlite_repo, "a.py", ["hub", "x", "y"], [("x", "hub"), ("y", "hub")])
+
+    result = await sqlite_repo.compute_entity_stats()
+    top = await sqlite_repo.get_entity_stats(limit=1)
+    by_out = await sqlite_repo.get_entity_stats(order_by="out_degree")
+
+    assert result == {"entities": 3, "relationships": 2}
+    assert top[0].name == "hub" and top[0].in_degree == 2
+    assert {s.name for s in by_out if s.out_degree == 1} == {"x", "y"}
+    with pytest.raises(ValueError):
+        await sqlite_repo.get_entity_stats(order_by="betweenness")
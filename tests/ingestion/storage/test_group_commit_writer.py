@@ -0,0 +1,158 @@
+# FICHIER: tests/ingestion/storage/test_group_commit_writer.py
+# Tests unitaires de l'écrivain à commits groupés et du lot SQLite à SAVEPOINTs.
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import pytest
+
+from core.exceptions.base_exceptions import RepositoryError
+from ingestion.storage.group_commit_writer import GroupCommitWriter
+
+
+def make_file(path: str, entities=None):
+    return {
+        "file_path": path,
+        "entities": (
+            entities
+            if entities is not None
+            else [{"name": f"{path}:f", "type": "FUNCTION"}]
+        ),
+        "relationships": [],
+    }
+
+
+def make_document(path: str):
+    return {"file_path": path, "document_content": "", "chunks": []}
+
+
+def make_code_repo(failing=()):
+    """Repository de graphe simulé : échoue sur `failing`, puis applique `confirm`."""
+
+    async def add_code_structures_batch(files, confirm=None):
+        results = [
+            (
+                {"file_path": f["file_path"], "error": "boom"}
+                if f["file_path"] in failing
+                else {"file_path": f["file_path"], "entities_added": 1}
+            )
+            for f in files
+        ]
+        rejected = await confirm(results) if confirm else {}
+        return [
+            {"file_path": r["file_path"], "error": rejected[i]} if i in rejected else r
+            for i, r in enumerate(results)
+        ]
+
+    code_repo = AsyncMock()
+    code_repo.add_code_structures_batch.side_effect = add_code_structures_batch
+    return code_repo
+
+
+class FakeVectorRepo:
+    """Repository vectoriel simulé : échoue sur `failing`, valide à la sortie du bloc."""
+
+    def __init__(self, failing=(), before_commit=None):
+        self.failing = failing
+        self.before_commit = before_commit
+        self.batches = []
+        self.committed = []
+
+    @asynccontextmanager
+    async def pending_documents_batch(self, documents):
+        paths = [d["file_path"] for d in documents]
+        self.batches.append(paths)
+        yield [
+            (
+                {"file_path": path, "status": "failed", "error": "boom"}
+                if path in self.failing
+                else {"file_path": path, "document_id": path, "status": "created"}
+            )
+            for path in paths
+        ]
+        if self.before_commit is not None:
+            await self.before_commit()
+        self.committed.extend(path for path in paths if path not in self.failing)
+
+
+@pytest.mark.unit
+async def test_concurrent_submissions_share_one_commit():
+    code_repo = make_code_repo()
+    vector_repo = FakeVectorRepo()
+    writer = GroupCommitWriter(code_repo, vector_repo, max_batch_size=8)
+
+    results = await asyncio.gather(
+        *(
+            writer.submit(make_file(f"f{i}.py"), make_document(f"f{i}.py"))
+            for i in range(5)
+        )
+    )
+    await writer.close()
+
+    assert code_repo.add_code_structures_batch.await_count == 1
+    assert len(vector_repo.batches) == 1
+    assert [r["vector"]["document_id"] for r in results] == [
+        f"f{i}.py" for i in range(5)
+    ]
+
+
+@pytest.mark.unit
+async def test_failed_graph_write_is_isolated_and_skips_vector_write():
+    code_repo = make_code_repo(failing=("bad.py",))
+    vector_repo = FakeVectorRepo()
+    writer = GroupCommitWriter(code_repo, vector_repo)
+
+    good, bad = await asyncio.gather(
+        writer.submit(make_file("good.py"), make_document("good.py")),
+        writer.submit(make_file("bad.py"), make_document("bad.py")),
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    assert good["vector"]["status"] == "created"
+    assert isinstance(bad, RepositoryError)
+    assert vector_repo.batches == [["good.py"]]
+
+
+@pytest.mark.unit
+async def test_sqlite_batch_rolls_back_only_the_failing_file(sqlite_repo):
+    results = await sqlite_repo.add_code_structures_batch(
+        [
+            make_file("a.py"),
+            # Entité sans clé "type" : l'insertion échoue au milieu du fichier.
+            make_file("b.py", [{"name": "b1", "type": "CLASS"}, {"name": "b2"}]),
+            make_file("c.py"),
+        ]
+    )
+
+    assert "error" in results[1]
+    assert "error" not in results[0] and "error" not in results[2]
+    async with sqlite_repo.conn.execute(
+        "SELECT DISTINCT file_path FROM entities ORDER BY file_path"
+    ) as cursor:
+        assert [row["file_path"] for row in await cursor.fetchall()] == ["a.py", "c.py"]
+
+
+@pytest.mark.unit
+async def test_failed_vector_write_leaves_no_graph(sqlite_repo):
+    async def graph_is_committed():
+        # Le document, clé d'idempotence, n'est validé qu'après le graphe.
+        assert not sqlite_repo.conn.in_transaction
+
+    vector_repo = FakeVectorRepo(failing=("bad.py",), before_commit=graph_is_committed)
+    writer = GroupCommitWriter(sqlite_repo, vector_repo)
+
+    good, bad = await asyncio.gather(
+        writer.submit(make_file("good.py"), make_document("good.py")),
+        writer.submit(make_file("bad.py"), make_document("bad.py")),
+        return_exceptions=True,
+    )
+    await writer.close()
+
+    assert good["graph"]["entities_added"] == 1
+    assert isinstance(bad, RepositoryError)
+    assert vector_repo.committed == ["good.py"]
+    async with sqlite_repo.conn.execute(
+        "SELECT DISTINCT file_path FROM entities ORDER BY file_path"
+    ) as cursor:
+        assert [row["file_path"] for row in await cursor.fetchall()] == ["good.py"]
@@ -0,0 +1,34 @@
+# FICHIER: tests/ingestion/storage/test_pgvector_codec.py
+import numpy as np
+import pytest
+
+from ingestion.storage.pgvector_codec import (
+    decode_halfvec,
+    decode_vector,
+    encode_halfvec,
+    encode_vector,
+)
+
+
+@pytest.mark.unit
+def test_vector_binary_format_matches_pgvector_layout():
+    data = encode_vector([1.0, -2.0])
+    # int16 dim | int16 unused | float32 big-endian
+    assert data == bytes.fromhex("00020000" "3f800000" "c0000000")
+
+
+@pytest.mark.unit
+def test_vector_round_trip_accepts_lists_and_arrays():
+    values = np.linspace(-1, 1, 768, dtype=np.float32)
+    assert np.array_equal(decode_vector(encode_vector(values)), values)
+    assert np.array_equal(decode_vector(encode_vector(values.tolist())), values)
+
+
+@pytest.mark.unit
+def test_halfvec_round_trip_and_shape_validation():
+    decoded = decode_halfvec(encode_halfvec([0.5, 0.25, -4.0]))
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, 0.25, -4.0]
+
+    with pytest.raises(ValueError):
+        encode_vector([[1.0], [2.0]])
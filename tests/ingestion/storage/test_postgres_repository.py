@@ -0,0 +1,276 @@
+# FICHIER: tests/ingestion/storage/test_postgres_repository.py
+# Tests unitaires du PostgresRepository : la connexion asyncpg est simulée,
+# on valide uniquement les requêtes et paramètres envoyés.
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from core.models.db import SearchFilters
+from ingestion.storage.repositories.postgres_repository import (
+    WARMUP_QUERIES,
+    PostgresRepository,
+)
+
+
+def make_repo(conn, **kwargs) -> PostgresRepository:
+    repo = PostgresRepository(MagicMock(), **kwargs)
+
+    @asynccontextmanager
+    async def fake_connection():
+        yield conn
+
+    @asynccontextmanager
+    async def fake_transaction():
+        yield
+
+    repo._get_connection = fake_connection
+    conn.transaction = MagicMock(side_effect=fake_transaction)
+    return repo
+
+
+@pytest.mark.unit
+async def test_vector_search_uses_configured_two_phase_mode():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn, search_mode="binary", rescore_factor=5)
+
+    await repo.vector_search([0.1, 0.2], limit=10)
+
+    query, _, limit, mode, rescore_count, *filters = conn.fetch.call_args.args
+    assert "match_chunks" in query
+    assert (limit, mode, rescore_count) == (10, "binary", 50)
+    assert filters == [None, None, None]
+
+
+@pytest.mark.unit
+async def test_vector_search_mode_can_be_overridden_per_call():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn)
+
+    await repo.vector_search([0.1], limit=3, search_mode="halfvec")
+    assert conn.fetch.call_args.args[3] == "halfvec"
+
+    with pytest.raises(ValueError):
+        await repo.vector_search([0.1], limit=3, search_mode="int4")
+
+
+@pytest.mark.unit
+async def test_search_params_are_scoped_to_the_search_transaction():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn, ef_search=64, ivfflat_probes=8)
+
+    await repo.vector_search([0.1], limit=10, ef_search=100)
+
+    conn.transaction.assert_called_once()
+    query, *values = conn.execute.call_args.args
+    assert "set_config('hnsw.ef_search', $1, true)" in query
+    assert "set_config('ivfflat.probes', $2, true)" in query
+    assert values == ["100", "8"]
+
+
+@pytest.mark.unit
+async def test_ef_search_is_raised_to_the_number_of_rescored_candidates():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn, search_mode="halfvec", rescore_factor=4)
+
+    await repo.vector_search([0.1], limit=25)
+
+    assert conn.execute.call_args.args[1:] == ("100",)
+
+
+@pytest.mark.unit
+async def test_init_connection_registers_codecs_and_warms_statements():
+    conn = AsyncMock()
+
+    await PostgresRepository.init_connection(conn)
+
+    codecs = [call.args[0] for call in conn.set_type_codec.call_args_list]
+    assert codecs == ["vector", "halfvec"]
+    prepared = [call.args[0] for call in conn.prepare.call_args_list]
+    assert prepared == list(WARMUP_QUERIES)
+    conn.copy_records_to_table.assert_not_awaited()
+
+
+@pytest.mark.unit
+async def test_init_connection_tolerates_missing_schema():
+    conn = AsyncMock()
+    conn.prepare.side_effect = Exception('function "match_chunks" does not exist')
+
+    await PostgresRepository.init_connection(conn)
+
+    conn.set_type_codec.assert_awaited()
+
+
+@pytest.mark.unit
+async def test_hybrid_search_passes_fusion_and_text_candidates():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn, fusion="rrf", text_match_count=50)
+
+    await repo.hybrid_search([0.1], "parse tokens", limit=5, text_weight=0.4)
+
+    query, *args = conn.fetch.call_args.args
+    assert "hybrid_search" in query
+    assert args[6:8] == ["rrf", 50]
+
+    await repo.hybrid_search([0.1], "q", limit=5, text_weight=0.4, fusion="linear")
+    assert conn.fetch.call_args.args[7] == "linear"
+
+    with pytest.raises(ValueError):
+        await repo.hybrid_search([0.1], "q", limit=5, text_weight=0.4, fusion="max")
+
+
+def document_row(i: int):
+    return {
+        "id": f"00000000-0000-0000-0000-00000000000{i}",
+        "title": f"f{i}.py",
+        "source": f"f{i}.py",
+        "metadata": "{}",
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "updated_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+        "chunk_count": i,
+        "total_tokens": 10 * i,
+    }
+
+
+@pytest.mark.unit
+async def test_list_documents_page_uses_keyset_cursor():
+    conn = AsyncMock()
+    conn.fetch.return_value = [document_row(i) for i in (3, 2, 1)]
+    repo = make_repo(conn)
+
+    page = await repo.list_documents_page(limit=2)
+
+    assert [d.source for d in page.items] == ["f3.py", "f2.py"]
+    assert page.items[0].chunk_count == 3 and page.items[0].total_tokens == 30
+    assert page.next_cursor is not None
+    assert conn.fetch.call_args.args[1] == 3  # une ligne de plus pour détecter la suite
+
+    conn.fetch.return_value = [document_row(1)]
+    last = await repo.list_documents_page(limit=2, cursor=page.next_cursor)
+
+    query, _, created_at, document_id = conn.fetch.call_args.args
+    assert "(created_at, id) < ($2, $3)" in query
+    assert created_at == page.items[-1].created_at
+    assert str(document_id) == page.items[-1].id
+    assert last.next_cursor is None
+
+
+@pytest.mark.unit
+async def test_list_documents_page_rejects_invalid_cursor():
+    repo = make_repo(AsyncMock())
+    with pytest.raises(ValueError):
+        await repo.list_documents_page(limit=2, cursor="not-a-cursor")
+
+
+@pytest.mark.unit
+async def test_filters_are_pushed_down_with_iterative_scan():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn)
+    filters = SearchFilters(entity_types=["CLASS"], file_path_prefix="services/my_dir")
+
+    await repo.vector_search([0.1], limit=5, filters=filters)
+
+    assert conn.fetch.call_args.args[-3:] == (["CLASS"], "services/my\\_dir%", None)
+    settings_query, *values = conn.execute.call_args.args
+    assert "set_config('hnsw.iterative_scan'" in settings_query
+    assert "relaxed_order" in values and "force_custom_plan" in values
+
+
+@pytest.mark.unit
+async def test_unfiltered_search_leaves_iterative_scan_untouched():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn, ef_search=64)
+
+    await repo.vector_search([0.1], limit=5, filters=SearchFilters())
+
+    assert "iterative_scan" not in conn.execute.call_args.args[0]
+
+
+@pytest.mark.unit
+async def test_vector_search_many_groups_rows_per_query():
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {
+            "query_index": query_index,
+            "chunk_id": f"c{query_index}{rank}",
+            "document_id": "d",
+            "content": "x",
+            "similarity": 0.9 - rank / 10,
+            "metadata": "{}",
+            "document_title": "t",
+            "document_source": "s",
+        }
+        for query_index, rank in [(1, 0), (1, 1), (3, 0)]
+    ]
+    repo = make_repo(conn)
+
+    results = await repo.vector_search_many([[0.1], [0.2], [0.3]], limit=2)
+
+    assert [[r.chunk_id for r in result] for result in results] == [
+        ["c10", "c11"],
+        [],
+        ["c30"],
+    ]
+    query, embeddings, *_ = conn.fetch.call_args.args
+    assert "CROSS JOIN LATERAL match_chunks" in query
+    assert len(embeddings) == 3 and all(isinstance(e, bytes) for e in embeddings)
+    conn.fetch.assert_awaited_once()
+
+
+@pytest.mark.unit
+async def test_batch_keeps_only_the_last_version_of_a_source():
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    repo = make_repo(conn)
+    versions = [
+        {
+            "file_path": "a.py",
+            "document_content": content,
+            "chunks": [],
+            "document_metadata": {},
+        }
+        for content in ("x = 1\n", "x = 2\n")
+    ]
+
+    outcomes = await repo.save_documents_batch(versions)
+
+    insert = conn.execute.call_args_list[-1].args
+    assert insert[2] == ["a.py"] and insert[4] == ["x = 2\n"]
+    assert [outcome["status"] for outcome in outcomes] == ["replaced", "created"]
+    assert all("content_hash" not in version for version in versions)
+
+
+@pytest.mark.unit
+async def test_compact_indexes_are_built_only_on_request():
+    conn = AsyncMock()
+    # halfvec absent, binary présent mais invalide (build CONCURRENTLY interrompu).
+    conn.fetchval.side_effect = [None, False]
+    repo = make_repo(conn)
+
+    assert await repo.set_compact_indexes(["binary"]) == ["binary"]
+
+    statements = [call.args[0] for call in conn.execute.call_args_list]
+    assert statements == [
+        "DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_binary",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_chunks_embedding_binary "
+        "ON chunks USING hnsw ((binary_quantize(embedding)::bit(768)) bit_hamming_ops)",
+    ]
+
+    # Une liste vide supprime les index compacts existants et valides.
+    conn.execute.reset_mock()
+    conn.fetchval.side_effect = [True, None]
+    assert await repo.set_compact_indexes([]) == []
+    assert [call.args[0] for call in conn.execute.call_args_list] == [
+        "DROP INDEX CONCURRENTLY IF EXISTS idx_chunks_embedding_halfvec"
+    ]
+
+    with pytest.raises(ValueError):
+        await repo.set_compact_indexes(["int8"])
@@ -0,0 +1,234 @@
+# FICHIER: tests/ingestion/storage/test_repository_conformance.py
+# Suite de conformité au contrat ICodeRepository, exécutée sur chaque implémentation.
+import pytest
+
+from core.exceptions.base_exceptions import RepositoryError
+from ingestion.storage.repositories.memory_graph_repository import (
+    InMemoryCodeRepository,
+)
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+async def code_repo(request):
+    if request.param == "sqlite":
+        repo = SQLiteGraphRepository(db_path=":memory:")
+    else:
+        repo = InMemoryCodeRepository()
+    await repo.initialize()
+    yield repo
+    await repo.close()
+
+
+def file_data(path, names, calls=(), types=None):
+    return {
+        "file_path": path,
+        "entities": [
+            {"name": n, "type": (types or {}).get(n, "FUNCTION"), "source_code": n}
+            for n in names
+        ],
+        "relationships": [
+            {"source": a, "target": b, "type": "CALLS"} for a, b in calls
+        ],
+    }
+
+
+def names(traversal):
+    return [(node.name, node.depth) for node in traversal.nodes]
+
+
+@pytest.mark.unit
+async def test_replace_semantics(code_repo):
+    first = await code_repo.add_code_structure(
+        file_data("a.py", ["a", "b", "c", "a"], [("a", "b"), ("b", "c"), ("a", "x")])
+    )
+    second = await code_repo.add_code_structure(
+        {
+            "file_path": "a.py",
+            "entities": [
+                {"name": "a", "type": "FUNCTION", "source_code": "a"},
+                {"name": "b", "type": "CLASS", "source_code": "b"},
+                {"name": "d", "type": "FUNCTION", "source_code": "d"},
+                {"name": "bad", "type": "METHOD", "source_code": ""},
+            ],
+            "relationships": [
+                {"source": "a", "target": "d", "type": "CALLS"},
+                {"source": "d", "target": "b", "type": "INHERITS"},
+            ],
+        }
+    )
+    facts = await code_repo.find_entity_relationships("")
+
+    assert first == {
+        "entities_added": 3,
+        "entities_updated": 0,
+        "entities_removed": 0,
+        "relations_added": 2,
+        "relations_removed": 0,
+    }
+    assert second == {
+        "entities_added": 1,
+        "entities_updated": 1,
+        "entities_removed": 1,
+        "relations_added": 1,
+        "relations_removed": 1,
+    }
+    assert facts == [
+        {
+            "source": "a (FUNCTION)",
+            "relationship": "CALLS",
+            "target": "d (FUNCTION)",
+        }
+    ]
+
+
+@pytest.mark.unit
+async def test_batch_isolates_failing_file(code_repo):
+    broken = {"file_path": "broken.py", "entities": [{"name": "oops"}]}
+
+    results = await code_repo.add_code_structures_batch(
+        [file_data("a.py", ["a", "b"], [("a", "b")]), broken]
+    )
+
+    assert results[0]["relations_added"] == 1
+    assert "error" in results[1] and results[1]["entities_added"] == 0
+    assert await code_repo.find_entity_relationships("oops") == []
+    with pytest.raises(RepositoryError):
+        await code_repo.add_code_structure(broken)
+
+
+@pytest.mark.unit
+async def test_batch_confirmation_rolls_back_rejected_files(code_repo):
+    await code_repo.add_code_structure(file_data("b.py", ["old", "b"], [("old", "b")]))
+
+    async def reject_b(results):
+        assert [r["file_path"] for r in results] == ["a.py", "b.py"]
+        return {1: "vector write failed"}
+
+    results = await code_repo.add_code_structures_batch(
+        [
+            file_data("a.py", ["a", "b"], [("a", "b")]),
+            file_data("b.py", ["new", "b"], [("new", "b")]),
+        ],
+        confirm=reject_b,
+    )
+
+    assert "error" not in results[0]
+    assert results[1]["error"] == "vector write failed"
+    assert await code_repo.find_entity_relationships("a")
+    assert await code_repo.find_entity_relationships("old")
+    assert await code_repo.find_entity_relationships("new") == []
+
+
+@pytest.mark.unit
+async def test_search_modes_and_pagination(code_repo):
+    await code_repo.add_code_structure(
+        file_data(
+            "m.py",
+            ["parse_file", "ParseError", "reparse", "io"],
+            [
+                ("parse_file", "ParseError"),
+                ("reparse", "parse_file"),
+                ("io", "reparse"),
+            ],
+            types={"ParseError": "CLASS"},
+        )
+    )
+
+    def sources(page):
+        return [item.source for item in page.items]
+
+    prefix = await code_repo.search_entity_relationships("parse", "prefix")
+    substring = await code_repo.search_entity_relationships("PARSE")
+    short = await code_repo.search_entity_relationships("io", "substring")
+    exact = await code_repo.search_entity_relationships("ParseError", "exact")
+    first = await code_repo.search_entity_relationships("parse", limit=2)
+    rest = await code_repo.search_entity_relationships(
+        "parse", cursor=first.next_cursor
+    )
+
+    assert sources(prefix) == ["parse_file (FUNCTION)", "reparse (FUNCTION)"]
+    assert sources(substring) == [
+        "io (FUNCTION)",
+        "parse_file (FUNCTION)",
+        "reparse (FUNCTION)",
+    ]
+    assert sources(short) == ["io (FUNCTION)"]
+    assert [item.target for item in exact.items] == ["ParseError (CLASS)"]
+    assert sources(first) + sources(rest) == sources(substring)
+    assert rest.next_cursor is None
+    with pytest.raises(ValueError):
+        await code_repo.search_entity_relationships("x", match_mode="regex")
+    with pytest.raises(ValueError):
+        await code_repo.search_entity_relationships("x", cursor="not-a-cursor")
+
+
+@pytest.mark.unit
+async def test_traversal_frontier_and_paths(code_repo):
+    await code_repo.add_code_structure(
+        file_data(
+            "g.py",
+            ["root", "a", "b", "c", "d"],
+            [("root", "a"), ("root", "b"), ("a", "c"), ("b", "c"), ("c", "d")],
+        )
+    )
+
+    frontier = await code_repo.traverse("root", max_depth=2)
+    truncated = await code_repo.traverse("root", max_depth=3, limit=2)
+    callers = await code_repo.traverse("d", direction="incoming", max_depth=5)
+    paths = await code_repo.traverse("root", max_depth=3, mode="paths")
+    by_id = {node.id: node.name for node in paths.nodes}
+
+    assert names(frontier) == [("root", 0), ("a", 1), ("b", 1), ("c", 2)]
+    assert names(truncated) == [("root", 0), ("a", 1), ("b", 1)]
+    assert truncated.truncated
+    assert names(callers) == [("d", 0), ("c", 1), ("a", 2), ("b", 2), ("root", 3)]
+    assert sorted("".join(by_id[i][0] for i in path) for path in paths.paths) == [
+        "ra",
+        "rac",
+        "racd",
+        "rb",
+        "rbc",
+        "rbcd",
+    ]
+    assert await code_repo.traverse("missing") == type(frontier)(nodes=[])
+    with pytest.raises(ValueError):
+        await code_repo.traverse("root", rel_types=["IMPORTS"])
+
+
+@pytest.mark.unit
+async def test_entity_stats(code_repo):
+    await code_repo.add_code_structure(
+        file_data("a.py", ["hub", "x", "y"], [("x", "hub"), ("y", "hub")])
+    )
+
+    result = await code_repo.compute_entity_stats()
+    top = await code_repo.get_entity_stats(limit=1)
+    by_out = await code_repo.get_entity_stats(order_by="out_degree", limit=2)
+    await code_repo.add_code_structure(file_data("a.py", ["x", "y"]))
+    after_removal = await code_repo.get_entity_stats()
+
+    assert result == {"entities": 3, "relationships": 2}
+    assert (top[0].name, top[0].in_degree) == ("hub", 2)
+    assert [s.name for s in by_out] == ["x", "y"]
+    assert sorted(s.name for s in after_removal) == ["x", "y"]
+    with pytest.raises(ValueError):
+        await code_repo.get_entity_stats(order_by="betweenness")
+
+
+@pytest.mark.unit
+async def test_memory_repository_flushes_to_sqlite(tmp_path):
+    memory = InMemoryCodeRepository()
+    await memory.add_code_structure(file_data("a.py", ["a", "b"], [("a", "b")]))
+    sqlite = SQLiteGraphRepository(db_path=str(tmp_path / "graph.sqlite"))
+    await sqlite.initialize()
+    try:
+        result = await memory.flush_to(sqlite)
+        facts = await sqlite.find_entity_relationships("a")
+    finally:
+        await sqlite.close()
+
+    assert result == {"entities": 2, "relationships": 1}
+    assert facts == await memory.find_entity_relationships("a")
@@ -0,0 +1,322 @@
+# FICHIER: tests/ingestion/storage/test_sqlite_graph_repository.py
+# Tests unitaires des écritures, des PRAGMA, de la recherche et des parcours du graphe SQLite.
+import asyncio
+import sqlite3
+
+import pytest
+
+from ingestion.storage.repositories.sqlite_graph_repository import (
+    SQLiteGraphRepository,
+)
+
+
+def make_file(path: str, n_entities: int):
+    names = [f"f{i}" for i in range(n_entities)]
+    return {
+        "file_path": path,
+        "entities": [{"name": name, "type": "FUNCTION"} for name in names],
+        "relationships": [
+            {"source": a, "target": b, "type": "CALLS"}
+            for a, b in zip(names, names[1:])
+        ],
+    }
+
+
+def make_stats(added=0, updated=0, removed=0, rel_added=0, rel_removed=0):
+    return {
+        "entities_added": added,
+        "entities_updated": updated,
+        "entities_removed": removed,
+        "relations_added": rel_added,
+        "relations_removed": rel_removed,
+    }
+
+
+@pytest.mark.unit
+async def test_bulk_insert_of_a_large_file(sqlite_repo):
+    n = 1203
+
+    stats = await sqlite_repo.add_code_structure(make_file("a.py", n))
+
+    assert stats == make_stats(added=n, rel_added=n - 1)
+
+
+@pytest.mark.unit
+async def test_reingestion_reuses_existing_ids_for_new_relationships(sqlite_repo):
+    await sqlite_repo.add_code_structure(make_file("a.py", 3))
+    file_data = make_file("a.py", 4)
+    file_data["relationships"].append({"source": "f3", "target": "f0", "type": "CALLS"})
+
+    stats = await sqlite_repo.add_code_structure(file_data)
+
+    assert stats == make_stats(added=1, rel_added=2)
+    facts = await sqlite_repo.find_entity_relationships("f3")
+    assert {f["target"] for f in facts if f["source"] == "f3 (FUNCTION)"} == {
+        "f0 (FUNCTION)"
+    }
+
+
+async def stored(repo, query, params=()):
+    async with repo.conn.execute(query, params) as cursor:
+        return [tuple(row) for row in await cursor.fetchall()]
+
+
+@pytest.mark.unit
+async def test_reingestion_replaces_the_file_structure(sqlite_repo):
+    await sqlite_repo.add_code_structure(make_file("a.py", 3))
+    await sqlite_repo.add_code_structure(make_file("b.py", 1))
+    # f1 disparaît, f2 change de code, f9 apparaît ; f0 -> f2 remplace la chaîne.
+    file_data = {
+        "file_path": "a.py",
+        "entities": [
+            {"name": "f0", "type": "FUNCTION"},
+            {"name": "f2", "type": "FUNCTION", "source_code": "def f2(): return 2"},
+            {"name": "f9", "type": "CLASS"},
+        ],
+        "relationships": [{"source": "f0", "target": "f2", "type": "CALLS"}],
+    }
+
+    stats = await sqlite_repo.add_code_structure(file_data)
+
+    assert stats == make_stats(added=1, updated=1, removed=1, rel_added=1)
+    assert await stored(
+        sqlite_repo,
+        "SELECT name, type, source_code FROM entities WHERE file_path = 'a.py' ORDER BY name",
+    ) == [
+        ("f0", "FUNCTION", ""),
+        ("f2", "FUNCTION", "def f2(): return 2"),
+        ("f9", "CLASS", ""),
+    ]
+    assert await stored(
+        sqlite_repo,
+        "SELECT s.name, t.name FROM relationships r "
+        "JOIN entities s ON s.id = r.source_id JOIN entities t ON t.id = r.target_id",
+    ) == [("f0", "f2")]
+    assert await stored(
+        sqlite_repo, "SELECT name FROM entities WHERE file_path = 'b.py'"
+    ) == [("f0",)]
+
+
+@pytest.mark.unit
+async def test_unchanged_reingestion_is_a_no_op_and_empty_file_clears_it(sqlite_repo):
+    await sqlite_repo.add_code_structure(make_file("a.py", 3))
+
+    unchanged = await sqlite_repo.add_code_structure(make_file("a.py", 3))
+    cleared = await sqlite_repo.add_code_structure(
+        {"file_path": "a.py", "entities": [], "relationships": []}
+    )
+
+    assert unchanged == make_stats()
+    assert cleared == make_stats(removed=3)
+    assert await stored(sqlite_repo, "SELECT COUNT(*) FROM relationships") == [(0,)]
+
+
+@pytest.mark.unit
+async def test_file_database_uses_configured_pragmas(tmp_path):
+    repo = SQLiteGraphRepository(str(tmp_path / "graph.sqlite"))
+    await repo.initialize()
+    try:
+        async with repo.conn.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+        async with repo.conn.execute("PRAGMA synchronous") as cursor:
+            assert (await cursor.fetchone())[0] == 1  # NORMAL
+    finally:
+        await repo.close()
+
+
+@pytest.mark.unit
+def test_rejects_unsafe_pragma():
+    with pytest.raises(ValueError):
+        SQLiteGraphRepository(":memory:", pragmas={"cache_size": "1; DROP TABLE x"})
+
+
+async def seed_graph(repo):
+    await repo.add_code_structure(
+        {
+            "file_path": "svc.py",
+            "entities": [
+                {"name": name, "type": "FUNCTION"}
+                for name in ("get_user", "get_user_name", "forget_user", "getXuser")
+            ],
+            "relationships": [
+                {"source": "get_user_name", "target": "get_user", "type": "CALLS"},
+                {"source": "forget_user", "target": "get_user", "type": "CALLS"},
+                {"source": "getXuser", "target": "forget_user", "type": "CALLS"},
+            ],
+        }
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "mode, term, expected_sources",
+    [
+        ("exact", "get_user_name", {"get_user_name"}),
+        ("prefix", "GET_USER", {"get_user_name", "forget_user"}),
+        ("substring", "t_user", {"get_user_name", "forget_user", "getXuser"}),
+        ("substring", "_u", {"get_user_name", "forget_user", "getXuser"}),
+    ],
+)
+async def test_match_modes(sqlite_repo, mode, term, expected_sources):
+    await seed_graph(sqlite_repo)
+
+    page = await sqlite_repo.search_entity_relationships(term, match_mode=mode)
+
+    assert {fact.source.split(" ")[0] for fact in page.items} == expected_sources
+    assert len(page.items) == len({tuple(f.model_dump().values()) for f in page.items})
+
+
+@pytest.mark.unit
+async def test_keyset_pagination_walks_all_relationships(sqlite_repo):
+    await seed_graph(sqlite_repo)
+    everything = await sqlite_repo.search_entity_relationships("user")
+
+    seen, cursor = [], None
+    while True:
+        page = await sqlite_repo.search_entity_relationships(
+            "user", limit=2, cursor=cursor
+        )
+        seen += page.items
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == everything.items and len(seen) == 3
+    with pytest.raises(ValueError):
+        await sqlite_repo.search_entity_relationships("user", cursor="not-a-cursor")
+
+
+@pytest.mark.unit
+async def test_name_index_follows_deletes(sqlite_repo):
+    await seed_graph(sqlite_repo)
+    await sqlite_repo.conn.execute("DELETE FROM entities WHERE name LIKE '%user%'")
+
+    async with sqlite_repo.conn.execute(
+        "SELECT COUNT(*) FROM entities_fts WHERE entities_fts MATCH '\"user\"'"
+    ) as cursor:
+        assert (await cursor.fetchone())[0] == 0
+
+
+async def seed_call_chain(repo):
+    # a -> b -> c -> a (cycle), c -> d ; e USES_TYPE b
+    await repo.add_code_structure(
+        {
+            "file_path": "chain.py",
+            "entities": [{"name": n, "type": "FUNCTION"} for n in "abcde"],
+            "relationships": [
+                {"source": "a", "target": "b", "type": "CALLS"},
+                {"source": "b", "target": "c", "type": "CALLS"},
+                {"source": "c", "target": "a", "type": "CALLS"},
+                {"source": "c", "target": "d", "type": "CALLS"},
+                {"source": "e", "target": "b", "type": "USES_TYPE"},
+            ],
+        }
+    )
+
+
+@pytest.mark.unit
+async def test_traverse_frontier_reports_minimal_depth_through_cycles(sqlite_repo):
+    await seed_call_chain(sqlite_repo)
+
+    result = await sqlite_repo.traverse("a", max_depth=5)
+
+    assert [(n.name, n.depth) for n in result.nodes] == [
+        ("a", 0),
+        ("b", 1),
+        ("c", 2),
+        ("d", 3),
+    ]
+    assert not result.truncated
+
+
+@pytest.mark.unit
+async def test_traverse_incoming_filters_relationship_types(sqlite_repo):
+    await seed_call_chain(sqlite_repo)
+
+    callers = await sqlite_repo.traverse("b", direction="incoming", max_depth=1)
+    only_calls = await sqlite_repo.traverse(
+        "b", direction="incoming", rel_types=["CALLS"], max_depth=1
+    )
+
+    assert {n.name for n in callers.nodes} == {"b", "a", "e"}
+    assert {n.name for n in only_calls.nodes} == {"b", "a"}
+
+
+@pytest.mark.unit
+async def test_traverse_paths_are_simple_and_limited(sqlite_repo):
+    await seed_call_chain(sqlite_repo)
+    ids = {n.name: n.id for n in (await sqlite_repo.traverse("a", max_depth=5)).nodes}
+
+    result = await sqlite_repo.traverse("a", max_depth=5, mode="paths")
+    limited = await sqlite_repo.traverse("a", max_depth=5, mode="paths", limit=2)
+
+    assert result.paths == [
+        [ids["a"], ids["b"]],
+        [ids["a"], ids["b"], ids["c"]],
+        [ids["a"], ids["b"], ids["c"], ids["d"]],
+    ]
+    assert limited.paths == result.paths[:2] and limited.truncated
+
+
+@pytest.mark.unit
+async def test_traverse_rejects_invalid_parameters(sqlite_repo):
+    with pytest.raises(ValueError):
+        await sqlite_repo.traverse("a", direction="sideways")
+    with pytest.raises(ValueError):
+        await sqlite_repo.traverse("a", rel_types=["IMPORTS"])
+
+
+@pytest.mark.unit
+async def test_reads_use_read_only_pool_while_a_write_is_open(tmp_path):
+    repo = SQLiteGraphRepository(str(tmp_path / "graph.sqlite"), read_pool_size=2)
+    await repo.initialize()
+    try:
+        await seed_call_chain(repo)
+        # Transaction d'écriture ouverte et non validée sur la connexion d'écriture.
+        await repo.conn.execute("BEGIN IMMEDIATE")
+        await repo.conn.execute(
+            "INSERT INTO entities (name, type, file_path) VALUES ('z', 'FUNCTION', 'z.py')"
+        )
+
+        results = await asyncio.gather(
+            repo.traverse("a", max_depth=5),
+            repo.find_entity_relationships("b"),
+            repo.search_entity_relationships("z", match_mode="exact"),
+        )
+
+        assert [n.name for n in results[0].nodes] == ["a", "b", "c", "d"]
+        assert results[1] and not results[2].items
+        await repo.conn.rollback()
+        async with repo._reader() as reader:
+            assert reader is not repo.conn
+            with pytest.raises(sqlite3.OperationalError):
+                await reader.execute("DELETE FROM entities")
+    finally:
+        await repo.close()
+
+
+@pytest.mark.unit
+def test_memory_database_reads_through_the_writer():
+    assert SQLiteGraphRepository(":memory:", read_pool_size=4).read_pool_size == 0
+
+
+@pytest.mark.unit
+async def test_every_commit_happens_under_the_write_lock(sqlite_repo):
+    # Connexion partagée : un commit hors verrou validerait l'écriture d'un autre appelant.
+    commit = sqlite_repo.conn.commit
+    unlocked = []
+
+    async def checked_commit():
+        if not sqlite_repo._write_lock.locked():
+            unlocked.append(True)
+        await commit()
+
+    sqlite_repo.conn.commit = checked_commit
+    await asyncio.gather(
+        sqlite_repo.add_code_structure(make_file("a.py", 3)),
+        sqlite_repo.compute_entity_stats(),
+        sqlite_repo.add_code_structures_batch([make_file("b.py", 2)]),
+    )
+    await sqlite_repo.clean_db()
+
+    assert unlocked == []
@@ -0,0 +1,38 @@
+# FICHIER: tests/ingestion/storage/test_vector_index.py
+import pytest
+
+from ingestion.storage.vector_index import (
+    compute_index_params,
+    create_index_sql,
+    recommended_probes,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "rows, lists",
+    [(0, 1), (50_000, 50), (1_000_000, 1000), (4_000_000, 2000)],
+)
+def test_ivfflat_lists_follow_corpus_size(rows, lists):
+    assert compute_index_params("ivfflat", rows).options == {"lists": lists}
+
+
+@pytest.mark.unit
+def test_hnsw_params_grow_with_corpus():
+    small = compute_index_params("hnsw", 10_000).options
+    large = compute_index_params("hnsw", 5_000_000).options
+    assert small == {"m": 16, "ef_construction": 64}
+    assert large["m"] > small["m"]
+    assert large["ef_construction"] > small["ef_construction"]
+
+
+@pytest.mark.unit
+def test_create_index_sql_and_probes():
+    params = compute_index_params("ivfflat", 400_000)
+    assert create_index_sql("idx_tmp", params) == (
+        "CREATE INDEX CONCURRENTLY idx_tmp ON chunks "
+        "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 400)"
+    )
+    assert recommended_probes(400) == 20
+    with pytest.raises(ValueError):
+        compute_index_params("flat", 10)
@@ -0,0 +1,158 @@
+# FICHIER: tests/ingestion/test_query_cache.py
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from ingestion.embedder import EmbeddingGenerator
+from ingestion.query_cache import QueryEmbeddingCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+def test_lru_eviction_keeps_most_recently_used():
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=0, normalizer="none")
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    assert cache.get("a") == [1.0]  # "a" devient le plus récent
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.unit
+async def test_cached_embeddings_are_returned_as_copies():
+    cache = QueryEmbeddingCache(normalizer="none")
+    original = [1.0, 2.0]
+    cache.put("q", original)
+    original[0] = 0.0
+
+    first = cache.get("q")
+    first.append(3.0)
+    second = await cache.get_or_compute("q", AsyncMock())
+
+    assert first is not second
+    assert second == [1.0, 2.0]
+
+
+@pytest.mark.unit
+def test_ttl_expiration():
+    clock = FakeClock()
+    cache = QueryEmbeddingCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.put("query", [0.5])
+    clock.now = 4.9
+    assert cache.get("query") == [0.5]
+    clock.now = 5.0
+    assert cache.get("query") is None
+    assert cache.stats()["expirations"] == 1
+
+
+@pytest.mark.unit
+def test_normalization_is_configurable():
+    cache = QueryEmbeddingCache(normalizer="casefold")
+    cache.put("  Hello   World ", [1.0])
+    assert cache.get("hello world") == [1.0]
+
+    strict = QueryEmbeddingCache(normalizer="none")
+    strict.put("Hello World", [1.0])
+    assert strict.get("hello world") is None
+
+    with pytest.raises(ValueError):
+        QueryEmbeddingCache(normalizer="unknown")
+
+
+@pytest.mark.unit
+async def test_concurrent_identical_queries_are_coalesced():
+    cache = QueryEmbeddingCache()
+    calls = []
+
+    async def compute(text: str):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        return [float(len(text))]
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("same query", compute) for _ in range(10))
+    )
+
+    assert calls == ["same query"]
+    assert all(r == [10.0] for r in results)
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] == 9
+    assert stats["coalesced"] == 9
+
+
+@pytest.mark.unit
+async def test_failed_computation_is_not_cached():
+    cache = QueryEmbeddingCache()
+
+    async def failing(text: str):
+        raise RuntimeError("provider down")
+
+    async def working(text: str):
+        return [1.0]
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("q", failing)
+    assert await cache.get_or_compute("q", working) == [1.0]
+    assert len(cache) == 1
+
+
+@pytest.mark.unit
+async def test_embed_queries_batches_only_uncached_distinct_queries():
+    generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+    generator.batch_size = 2
+    generator.query_cache = QueryEmbeddingCache(max_size=10, ttl_seconds=60)
+    generator.query_cache.put("cached", [9.0])
+    generator.provider = AsyncMock()
+    generator.provider.generate_embeddings_batch.side_effect = lambda texts: [
+        [float(len(t))] for t in texts
+    ]
+
+    result = await generator.embed_queries(["a", "cached", "bbb", "a", "cc"])
+
+    assert result == [[1.0], [9.0], [3.0], [1.0], [2.0]]
+    batches = [
+        call.args[0]
+        for call in generator.provider.generate_embeddings_batch.call_args_list
+    ]
+    assert batches == [["a", "bbb"], ["cc"]]
+    assert generator.query_cache.get("bbb") == [3.0]
+    result[0].append(0.0)
+    result[1][0] = 0.0
+    assert result[3] == [1.0]
+    assert generator.query_cache.get("a") == [1.0]
+    assert generator.query_cache.get("cached") == [9.0]
+
+
+@pytest.mark.unit
+async def test_embed_queries_embeds_the_normalized_query_like_embed_query():
+    generator = EmbeddingGenerator.__new__(EmbeddingGenerator)
+    generator.batch_size = 8
+    generator.query_cache = QueryEmbeddingCache(
+        max_size=10, ttl_seconds=60, normalizer="casefold"
+    )
+    generator.provider = AsyncMock()
+    generator.provider.generate_embeddings_batch.side_effect = lambda texts: [
+        [float(len(t))] for t in texts
+    ]
+    generator.provider.generate_embedding.side_effect = lambda text: [-1.0]
+
+    result = await generator.embed_queries(["Find  User", " find user", "FIND USER"])
+
+    assert result == [[9.0]] * 3
+    generator.provider.generate_embeddings_batch.assert_awaited_once_with(["find user"])
+    # Le chemin unitaire retrouve l'entrée calculée par le chemin groupé.
+    assert await generator.embed_query("find   USER") == [9.0]
+    generator.provider.generate_embedding.assert_not_awaited()
@@ -0,0 +1,120 @@
+# FICHIER: tests/services/test_ingestion_service.py
+# Tests unitaires de l'ingestion concurrente d'un job.
+import asyncio
+
+import pytest
+
+from ingestion.orchestration.execution_context import ExecutionContext
+from ingestion.orchestration.pipeline_director import PipelineDirector
+from services.ingestion_service import IngestionService
+
+
+class FakeDirector:
+    """Directeur simulé : mesure le parallélisme et échoue sur les fichiers `bad_*`."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.initialized = 0
+        self.concurrency = []
+
+    async def initialize_pipeline(self):
+        self.initialized += 1
+
+    async def process(self, file_path, source_code, language, job_id):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        self.concurrency.append(self.active)
+        try:
+            await asyncio.sleep(0.005)
+            if "bad_" in file_path:
+                raise RuntimeError("parse error")
+            return ExecutionContext(
+                file_path=file_path, source_code=source_code, language=language
+            )
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.unit
+async def test_files_are_processed_concurrently_with_isolated_failures(tmp_path):
+    paths = []
+    for i in range(10):
+        path = tmp_path / (f"bad_{i}.py" if i % 5 == 0 else f"mod_{i}.py")
+        path.write_text("x = 1\n")
+        paths.append(str(path))
+    paths.append(str(tmp_path / "missing.py"))
+
+    messages = []
+
+    async def callback(message):
+        messages.append(message)
+
+    service = IngestionService(callback, concurrency=4, adaptive=False)
+    service.director = FakeDirector()
+    await service.run_ingestion_for_job("job-1", paths, source_root=str(tmp_path))
+
+    progress = [m["progress"]["done"] for m in messages if "progress" in m]
+    final = messages[-1]
+    assert service.director.peak == 4
+    assert service.director.initialized == 1
+    assert sorted(progress) == list(range(1, 12)) and progress == sorted(progress)
+    assert final["status"] == "SUCCESS"
+    assert final["report"] == {
+        "created": 8,
+        "replaced": 0,
+        "unchanged": 0,
+        "failed": 3,
+    }
+
+
+@pytest.mark.unit
+async def test_adaptive_service_backs_off_when_files_fail(tmp_path):
+    paths = []
+    for i in range(24):
+        (tmp_path / f"bad_{i}.py").write_text("x = 1\n")
+        paths.append(str(tmp_path / f"bad_{i}.py"))
+
+    async def callback(message):
+        pass
+
+    service = IngestionService(callback, concurrency=4, adaptive=True)
+    service.director = FakeDirector()
+    await service.run_ingestion_for_job("job-3", paths, source_root=str(tmp_path))
+
+    assert service.director.peak == 4
+    assert max(service.director.concurrency[-8:]) == 1
+
+
+class FailingStage:
+    async def execute(self, context, job_id):
+        if "bad_" in context.file_path:
+            raise RuntimeError("embedding failed")
+        context.ingestion_status = "replaced"
+        return context
+
+
+@pytest.mark.unit
+async def test_streaming_mode_reports_every_file(tmp_path):
+    paths = []
+    for name in ("a.py", "bad_b.py", "c.py"):
+        (tmp_path / name).write_text("x = 1\n")
+        paths.append(str(tmp_path / name))
+    paths.append(str(tmp_path / "missing.py"))
+    messages = []
+
+    async def callback(message):
+        messages.append(message)
+
+    service = IngestionService(callback, streaming=True)
+    service.director = PipelineDirector()
+    service.director.pipeline = [FailingStage()]
+    await service.run_ingestion_for_job("job-2", paths, source_root=str(tmp_path))
+
+    assert messages[-1]["report"] == {
+        "created": 0,
+        "replaced": 2,
+        "unchanged": 0,
+        "failed": 2,
+    }
+    assert [m["progress"]["done"] for m in messages if "progress" in m] == [1, 2, 3, 4]
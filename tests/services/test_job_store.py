@@ -0,0 +1,124 @@
+# FICHIER: tests/services/test_job_store.py
+# Tests unitaires des points de contrôle des jobs et de la reprise après interruption.
+import asyncio
+
+import pytest
+
+from ingestion.chunker import DocumentChunk
+from ingestion.orchestration.execution_context import ExecutionContext
+from services.ingestion_service import IngestionService
+from services.job_store import SQLiteJobStore, decode_context, encode_context
+
+
+class ParseStage:
+    async def execute(self, context, job_id):
+        context.normalized_ast = object()
+        return context
+
+
+class AnalyzeStage:
+    async def execute(self, context, job_id):
+        context.normalized_ast = None
+        context.entities = [{"type": "FILE", "name": context.file_path}]
+        return context
+
+
+class EmbedStage:
+    calls = []
+
+    async def execute(self, context, job_id):
+        EmbedStage.calls.append(context.file_path)
+        chunk = DocumentChunk(context.source_code, 0, 0, 1, {}, embedding=[0.5] * 4)
+        context.chunks = [chunk]
+        return context
+
+
+class StoreStage:
+    """Bloque indéfiniment sur `hang.py` pour simuler un arrêt du service."""
+
+    async def execute(self, context, job_id):
+        if context.file_path == "hang.py":
+            await asyncio.Event().wait()
+        context.ingestion_status = "created"
+        return context
+
+
+class ResumedStoreStage:
+    stored = []
+
+    async def execute(self, context, job_id):
+        ResumedStoreStage.stored.append(context.file_path)
+        assert context.chunks[0].embedding == [0.5] * 4
+        context.ingestion_status = "created"
+        return context
+
+
+def make_service(store, streaming):
+    async def callback(message):
+        pass
+
+    service = IngestionService(
+        callback, concurrency=1, streaming=streaming, job_store=store
+    )
+    service.director.pipeline = [
+        ParseStage(),
+        AnalyzeStage(),
+        EmbedStage(),
+        StoreStage(),
+    ]
+    return service
+
+
+@pytest.mark.unit
+def test_context_round_trip_keeps_chunks_and_embeddings():
+    context = ExecutionContext("a.py", "x = 1\n", "python", content_hash="h")
+    context.entities = [{"type": "FILE", "name": "a.py"}]
+    context.chunks = [
+        DocumentChunk("x = 1", 0, 0, 5, {"k": "v"}, embedding=[0.25, -1.5]),
+        DocumentChunk("y", 1, 5, 6, {}),
+    ]
+
+    restored = decode_context(*encode_context(context))
+
+    assert restored.chunks[0].embedding == [0.25, -1.5]
+    assert restored.chunks[1].embedding is None
+    assert restored.entities == context.entities
+    assert (restored.content_hash, restored.chunks[0].metadata) == ("h", {"k": "v"})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("streaming", [False, True])
+async def test_interrupted_job_resumes_from_last_checkpoint(tmp_path, streaming):
+    EmbedStage.calls, ResumedStoreStage.stored = [], []
+    paths = []
+    for name in ("a.py", "hang.py"):
+        (tmp_path / name).write_text(f"# {name}\n")
+        paths.append(str(tmp_path / name))
+    db_path = str(tmp_path / "jobs.sqlite")
+
+    store = SQLiteJobStore(db_path)
+    service = make_service(store, streaming)
+    run = asyncio.create_task(
+        service.run_ingestion_for_job("job-1", paths, source_root=str(tmp_path))
+    )
+    while "hang.py" not in EmbedStage.calls:
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(0.01)
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+    await store.close()
+
+    # Redémarrage : nouveau stockage sur la même base, l'étape de stockage ne bloque plus.
+    store = SQLiteJobStore(db_path)
+    [job] = await store.interrupted_jobs()
+    service = make_service(store, streaming)
+    service.director.pipeline[3] = ResumedStoreStage()
+    await service.run_ingestion_for_job(
+        job["job_id"], job["paths"], source_root=job["source_root"]
+    )
+
+    assert job["documents"] == ["a.py", "hang.py"]
+    assert EmbedStage.calls == ["a.py", "hang.py"]
+    assert ResumedStoreStage.stored == ["hang.py"]
+    assert await store.interrupted_jobs() == []
+    await store.close()